@@ -0,0 +1,436 @@
+import io
+import json
+import mmap
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from . import durabilidad
+from .config import (
+    ORGANIZACION_PORTADAS,
+    SUFIJO_MINIATURA,
+    TAMANO_MAXIMO_EMPAQUETADO,
+    TAMANO_PAQUETE,
+)
+
+ORGANIZACION_PLANA = "plana"
+ORGANIZACION_PARTICIONADA = "particionada"
+ORGANIZACION_PAQUETES = "paquetes"
+# Caracteres del hash que forman el nombre de cada subcarpeta
+LARGO_PARTICION = 2
+
+
+def rutas_posibles(carpeta, nombre: str) -> List[Path]:
+    """Dónde puede estar el archivo de un nombre en cualquier organización"""
+    carpeta = Path(carpeta)
+    return [carpeta / nombre, carpeta / nombre[:LARGO_PARTICION] / nombre]
+
+
+class AlmacenPortadas:
+    """Archivos de portadas en una sola carpeta (organización plana)
+
+    Cada portada se identifica por su nombre (<sha256>.<ext>), que es lo
+    que se guarda en el inventario; las subclases deciden dónde vive el
+    contenido. Todas siguen encontrando los archivos sueltos en la carpeta
+    principal, así una portada sin migrar no se pierde.
+    """
+
+    ORGANIZACION = ORGANIZACION_PLANA
+
+    def __init__(self, carpeta):
+        self.carpeta = Path(carpeta)
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+
+    def ruta(self, nombre: str) -> Path:
+        """Archivo donde se guarda (o se guardaría) este nombre"""
+        return self.carpeta / nombre
+
+    def en_su_lugar(self, nombre: str) -> bool:
+        """El nombre ya está donde lo pondría esta organización"""
+        return self.ruta(nombre).is_file()
+
+    def ubicar(self, nombre: str) -> Optional[Path]:
+        """Archivo en disco con este nombre, o None"""
+        for ruta in dict.fromkeys((self.ruta(nombre), self.carpeta / nombre)):
+            if ruta.is_file():
+                return ruta
+        return None
+
+    def existe(self, nombre: str) -> bool:
+        return self.ubicar(nombre) is not None
+
+    def fecha(self, nombre: str) -> Optional[float]:
+        """Última modificación (o reutilización) del nombre"""
+        ruta = self.ubicar(nombre)
+        try:
+            return None if ruta is None else ruta.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def tocar(self, nombre: str):
+        """Marca el nombre como recién usado (ver recolectar_huerfanas)"""
+        ruta = self.ubicar(nombre)
+        if ruta is not None:
+            os.utime(ruta)
+
+    def abrir(self, nombre: str) -> Optional[BinaryIO]:
+        ruta = self.ubicar(nombre)
+        return None if ruta is None else open(ruta, "rb")
+
+    def leer(self, nombre: str) -> Optional[bytes]:
+        ruta = self.ubicar(nombre)
+        return None if ruta is None else ruta.read_bytes()
+
+    def instalar(self, temporal, nombre: str):
+        """Mueve a su lugar un temporal ya escrito y sincronizado"""
+        ruta = self.ruta(nombre)
+        ruta.parent.mkdir(exist_ok=True)
+        durabilidad.instalar(temporal, ruta)
+
+    def eliminar(self, nombre: str) -> int:
+        """Borra el nombre; devuelve los bytes liberados en disco"""
+        liberados = 0
+        for ruta in dict.fromkeys((self.ruta(nombre), self.carpeta / nombre)):
+            try:
+                tamano = ruta.stat().st_size
+                os.remove(ruta)
+            except (FileNotFoundError, IsADirectoryError):
+                continue
+            liberados += tamano
+        return liberados
+
+    def recorrer(self) -> Iterator[str]:
+        """Nombres guardados, empezando por los archivos de la carpeta principal
+
+        Incluye los temporales de subidas que no terminaron.
+        """
+        with os.scandir(self.carpeta) as entradas:
+            for entrada in entradas:
+                if entrada.is_file():
+                    yield entrada.name
+
+    def compactar(self) -> int:
+        """Recupera el espacio de lo eliminado; devuelve los bytes liberados"""
+        return 0
+
+
+class AlmacenParticionado(AlmacenPortadas):
+    """Portadas repartidas en subcarpetas por el prefijo del hash
+
+    ``ab/abcd….png``: con el hash bien distribuido cada subcarpeta tiene una
+    fracción 1/256 de los archivos.
+    """
+
+    ORGANIZACION = ORGANIZACION_PARTICIONADA
+
+    def ruta(self, nombre: str) -> Path:
+        return self.carpeta / nombre[:LARGO_PARTICION] / nombre
+
+    def recorrer(self) -> Iterator[str]:
+        yield from super().recorrer()
+        with os.scandir(self.carpeta) as entradas:
+            particiones = sorted(
+                entrada.path
+                for entrada in entradas
+                if entrada.is_dir() and len(entrada.name) == LARGO_PARTICION
+            )
+        for particion in particiones:
+            with os.scandir(particion) as entradas:
+                for entrada in entradas:
+                    if entrada.is_file():
+                        yield entrada.name
+
+
+class AlmacenPaquetes(AlmacenParticionado):
+    """Portadas pequeñas añadidas a archivos de paquete grandes
+
+    Cada portada de hasta ``tamano_maximo`` bytes se añade al final del
+    paquete activo (``paquetes/paquete-00000.bin``…) y su desplazamiento se
+    anota en ``paquetes/indice.log``. Los paquetes se leen con mmap. Las
+    portadas grandes y las miniaturas (que se muestran por ruta) quedan como
+    archivos particionados.
+
+    Eliminar solo quita la entrada del índice; ``compactar`` reescribe los
+    paquetes con espacio muerto y devuelve lo recuperado.
+    """
+
+    ORGANIZACION = ORGANIZACION_PAQUETES
+
+    def __init__(
+        self,
+        carpeta,
+        tamano_maximo: int = TAMANO_MAXIMO_EMPAQUETADO,
+        tamano_paquete: int = TAMANO_PAQUETE,
+    ):
+        super().__init__(carpeta)
+        self.tamano_maximo = tamano_maximo
+        self.tamano_paquete = tamano_paquete
+        self.carpeta_paquetes = self.carpeta / "paquetes"
+        self.archivo_indice = self.carpeta_paquetes / "indice.log"
+        # nombre -> [paquete, desplazamiento, largo, fecha]
+        self._entradas: Dict[str, list] = {}
+        self._mapas: Dict[int, mmap.mmap] = {}
+        self._lock = threading.RLock()
+        self._cargar_indice()
+
+    def _cargar_indice(self):
+        if not self.archivo_indice.exists():
+            return
+        with open(self.archivo_indice, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea incompleta por una escritura interrumpida
+                    continue
+                self._aplicar(registro)
+
+    def _aplicar(self, registro: dict):
+        nombre = registro["nombre"]
+        if registro["op"] == "agregar":
+            self._entradas[nombre] = [
+                registro["paquete"],
+                registro["desplazamiento"],
+                registro["largo"],
+                registro["fecha"],
+            ]
+        elif registro["op"] == "tocar" and nombre in self._entradas:
+            self._entradas[nombre][3] = registro["fecha"]
+        elif registro["op"] == "eliminar":
+            self._entradas.pop(nombre, None)
+
+    def _registrar(self, registro: dict):
+        linea = json.dumps(registro, separators=(",", ":"), ensure_ascii=False)
+        with open(self.archivo_indice, "a", encoding="utf-8") as f:
+            f.write(linea + "\n")
+            durabilidad.sincronizar(f)
+        self._aplicar(registro)
+
+    def _ruta_paquete(self, paquete: int) -> Path:
+        return self.carpeta_paquetes / f"paquete-{paquete:05d}.bin"
+
+    def _paquetes(self) -> List[int]:
+        if not self.carpeta_paquetes.exists():
+            return []
+        return sorted(
+            int(ruta.stem.split("-")[1])
+            for ruta in self.carpeta_paquetes.glob("paquete-*.bin")
+        )
+
+    def _empaquetable(self, nombre: str, tamano: int) -> bool:
+        return not nombre.endswith(SUFIJO_MINIATURA) and tamano <= self.tamano_maximo
+
+    def en_su_lugar(self, nombre: str) -> bool:
+        if nombre in self._entradas:
+            return True
+        ruta = self.ruta(nombre)
+        try:
+            return not self._empaquetable(nombre, ruta.stat().st_size)
+        except FileNotFoundError:
+            return False
+
+    def existe(self, nombre: str) -> bool:
+        return nombre in self._entradas or super().existe(nombre)
+
+    def fecha(self, nombre: str) -> Optional[float]:
+        entrada = self._entradas.get(nombre)
+        return super().fecha(nombre) if entrada is None else entrada[3]
+
+    def tocar(self, nombre: str):
+        with self._lock:
+            if nombre not in self._entradas:
+                super().tocar(nombre)
+                return
+            self._registrar({"op": "tocar", "nombre": nombre, "fecha": time.time()})
+
+    def leer(self, nombre: str) -> Optional[bytes]:
+        """Contenido de la portada; si está en un paquete se copia del mmap"""
+        with self._lock:
+            entrada = self._entradas.get(nombre)
+            if entrada is None:
+                return super().leer(nombre)
+            paquete, desplazamiento, largo, _ = entrada
+            fin = desplazamiento + largo
+            mapa = self._mapa(paquete, fin)
+            if mapa is None:
+                return None
+            return mapa[desplazamiento:fin]
+
+    def _mapa(self, paquete: int, fin: int) -> Optional[mmap.mmap]:
+        """mmap del paquete que llega al menos hasta ``fin``
+
+        El paquete activo crece: si el mapa guardado es más corto se vuelve
+        a mapear.
+        """
+        mapa = self._mapas.get(paquete)
+        if mapa is not None and len(mapa) >= fin:
+            return mapa
+        if mapa is not None:
+            mapa.close()
+            del self._mapas[paquete]
+        try:
+            with open(self._ruta_paquete(paquete), "rb") as f:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        if len(mapa) < fin:
+            # Entrada de un paquete truncado por un corte
+            mapa.close()
+            return None
+        self._mapas[paquete] = mapa
+        return mapa
+
+    def abrir(self, nombre: str) -> Optional[BinaryIO]:
+        if nombre not in self._entradas:
+            return super().abrir(nombre)
+        contenido = self.leer(nombre)
+        return None if contenido is None else io.BytesIO(contenido)
+
+    def instalar(self, temporal, nombre: str):
+        tamano = os.path.getsize(temporal)
+        if not self._empaquetable(nombre, tamano):
+            super().instalar(temporal, nombre)
+            return
+
+        with self._lock:
+            if nombre not in self._entradas:
+                with open(temporal, "rb") as origen:
+                    self._agregar(nombre, origen, tamano)
+        os.remove(temporal)
+
+    def _agregar(self, nombre: str, origen: BinaryIO, tamano: int):
+        """Añade el contenido al paquete activo (con ``self._lock`` tomado)"""
+        self.carpeta_paquetes.mkdir(exist_ok=True)
+        paquetes = self._paquetes()
+        paquete = paquetes[-1] if paquetes else 0
+        ruta = self._ruta_paquete(paquete)
+        if ruta.exists() and ruta.stat().st_size + tamano > self.tamano_paquete:
+            paquete += 1
+            ruta = self._ruta_paquete(paquete)
+
+        with open(ruta, "ab") as destino:
+            desplazamiento = destino.tell()
+            shutil.copyfileobj(origen, destino)
+            durabilidad.sincronizar(destino)
+        # El índice se escribe después: un corte entre medio solo deja bytes
+        # sin usar al final del paquete
+        self._registrar(
+            {
+                "op": "agregar",
+                "nombre": nombre,
+                "paquete": paquete,
+                "desplazamiento": desplazamiento,
+                "largo": tamano,
+                "fecha": time.time(),
+            }
+        )
+
+    def empaquetada(self, nombre: str) -> bool:
+        return nombre in self._entradas
+
+    def descartar_empaquetada(self, nombre: str):
+        """Quita el nombre del índice de paquetes (sus bytes quedan muertos)"""
+        with self._lock:
+            if nombre in self._entradas:
+                self._registrar({"op": "eliminar", "nombre": nombre})
+
+    def eliminar(self, nombre: str) -> int:
+        self.descartar_empaquetada(nombre)
+        return super().eliminar(nombre)
+
+    def recorrer(self) -> Iterator[str]:
+        yield from super().recorrer()
+        yield from list(self._entradas)
+
+    def compactar(self) -> int:
+        """Reescribe los paquetes con espacio muerto y el índice
+
+        Las entradas vivas de esos paquetes se añaden al paquete activo y
+        los paquetes viejos se borran.
+        """
+        with self._lock:
+            vivos: Dict[int, int] = {}
+            for paquete, _, largo, _ in self._entradas.values():
+                vivos[paquete] = vivos.get(paquete, 0) + largo
+            activo = max(self._paquetes(), default=0)
+
+            liberados = 0
+            for paquete in self._paquetes():
+                tamano = self._ruta_paquete(paquete).stat().st_size
+                if paquete == activo:
+                    # Recibe las entradas movidas: solo se borra si quedó vacío
+                    if any(e[0] == activo for e in self._entradas.values()):
+                        continue
+                elif vivos.get(paquete, 0) == tamano:
+                    continue
+                for nombre, entrada in list(self._entradas.items()):
+                    if entrada[0] == paquete:
+                        contenido = self.leer(nombre)
+                        self._entradas.pop(nombre)
+                        if contenido is not None:
+                            self._agregar(nombre, io.BytesIO(contenido), entrada[2])
+                mapa = self._mapas.pop(paquete, None)
+                if mapa is not None:
+                    mapa.close()
+                os.remove(self._ruta_paquete(paquete))
+                liberados += tamano - vivos.get(paquete, 0)
+
+            if self.archivo_indice.exists():
+                self._reescribir_indice()
+            return liberados
+
+    def _reescribir_indice(self):
+        def volcar(f):
+            for nombre, (paquete, desplazamiento, largo, fecha) in sorted(
+                self._entradas.items()
+            ):
+                registro = {
+                    "op": "agregar",
+                    "nombre": nombre,
+                    "paquete": paquete,
+                    "desplazamiento": desplazamiento,
+                    "largo": largo,
+                    "fecha": fecha,
+                }
+                f.write(json.dumps(registro, separators=(",", ":")) + "\n")
+
+        durabilidad.reemplazar_archivo(self.archivo_indice, volcar)
+
+    def cerrar(self):
+        with self._lock:
+            for mapa in self._mapas.values():
+                mapa.close()
+            self._mapas.clear()
+
+
+ALMACENES = {
+    ORGANIZACION_PLANA: AlmacenPortadas,
+    ORGANIZACION_PARTICIONADA: AlmacenParticionado,
+    ORGANIZACION_PAQUETES: AlmacenPaquetes,
+}
+
+
+# Un almacén por (carpeta, organización): el de paquetes guarda su índice y
+# sus mmap en memoria, y dos instancias sobre la misma carpeta no verían lo
+# que la otra añade o compacta
+_almacenes: Dict[Tuple[Path, str], AlmacenPortadas] = {}
+_lock_almacenes = threading.Lock()
+
+
+def crear_almacen(carpeta, organizacion: Optional[str] = None) -> AlmacenPortadas:
+    """Almacén de portadas con la organización indicada (o la de config)
+
+    Para la misma carpeta y organización devuelve siempre el mismo almacén.
+    """
+    organizacion = organizacion or ORGANIZACION_PORTADAS
+    if organizacion not in ALMACENES:
+        raise ValueError(f"Organización de portadas desconocida: {organizacion}")
+    clave = (Path(carpeta).resolve(), organizacion)
+    with _lock_almacenes:
+        almacen = _almacenes.get(clave)
+        if almacen is None:
+            almacen = _almacenes[clave] = ALMACENES[organizacion](carpeta)
+        return almacen
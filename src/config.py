@@ -10,3 +10,77 @@ RUTA_TABLA_HASH = BASE_DIR / "tabla_hash.json"
 
 CARPETA_PORTADAS = BASE_DIR / "imagenes" / "portadas"
 RUTA_RELATIVA_PORTADAS = "imagenes/portadas"
+# Organización de los archivos de portadas (ver almacen_portadas):
+# "plana" (todos en CARPETA_PORTADAS), "particionada" (subcarpetas por los
+# dos primeros caracteres del hash) o "paquetes" (las portadas de hasta
+# TAMANO_MAXIMO_EMPAQUETADO bytes se añaden a archivos de paquete de unos
+# TAMANO_PAQUETE bytes; las demás y las miniaturas, particionadas). En el
+# inventario la ruta es siempre RUTA_RELATIVA_PORTADAS/<sha256>.<ext>. Para
+# cambiarla con portadas ya guardadas: python -m src.migracion_portadas
+ORGANIZACION_PORTADAS = "plana"
+TAMANO_MAXIMO_EMPAQUETADO = 256 * 1024
+TAMANO_PAQUETE = 64 * 1024 * 1024
+# Bytes que se leen de cada portada subida por vez al calcular su hash
+TAMANO_BLOQUE_IMAGEN = 64 * 1024
+# Escritura de portadas en segundo plano: hilos que escriben y portadas que
+# pueden esperar en memoria; con más, la subida espera a que se libere uno
+HILOS_ESCRITURA_PORTADAS = 2
+MAXIMO_PORTADAS_PENDIENTES = 16
+# Miniaturas de las portadas para el listado: caben en este recuadro
+# (el doble de los 60 px que se muestran, para pantallas de alta densidad) y
+# se guardan junto a la original como <sha256>.min.jpg
+TAMANO_MINIATURA = (120, 120)
+SUFIJO_MINIATURA = ".min.jpg"
+# Recolección de portadas sin referencias: cada paso revisa como mucho
+# PORTADAS_POR_PASO_GC archivos y solo borra los que llevan más de
+# GRACIA_GC_PORTADAS segundos sin modificarse (una portada recién subida
+# todavía no tiene su juego guardado)
+PORTADAS_POR_PASO_GC = 500
+GRACIA_GC_PORTADAS = 24 * 60 * 60
+
+# Registro de cambios de la tabla hash: al superar este tamaño (bytes) se
+# compacta en segundo plano sobre tabla_hash.json
+UMBRAL_COMPACTACION_LOG = 256 * 1024
+
+# Redimensionamiento de la tabla hash: crece al doble por encima del factor
+# máximo y se reduce a la mitad por debajo del mínimo. Cada operación migra
+# como mucho PASOS_REHASH elementos a la tabla nueva.
+FACTOR_CARGA_MAXIMO = 0.75
+FACTOR_CARGA_MINIMO = 0.1
+PASOS_REHASH = 4
+
+# Journal del inventario: los cambios se añaden a inventario.log y
+# inventario.json solo se reescribe en cada checkpoint, al superar este
+# tamaño (bytes). Con el journal desactivado cada cambio reescribe el archivo.
+JOURNAL_INVENTARIO = True
+UMBRAL_CHECKPOINT_INVENTARIO = 1024 * 1024
+
+# Group commit: las escrituras que llegan dentro de esta ventana (segundos) se
+# confirman juntas con una sola escritura del inventario y del índice.
+VENTANA_GROUP_COMMIT = 0.002
+
+# Durabilidad de cada commit: "siempre" (fsync en cada commit), "intervalo"
+# (como mucho un fsync por archivo cada INTERVALO_FSYNC segundos) o "nunca"
+# (se deja al sistema operativo).
+POLITICA_DURABILIDAD = "intervalo"
+INTERVALO_FSYNC = 1.0
+
+# Juegos por página en el listado paginado (servicio.listar_pagina)
+TAMANO_PAGINA = 25
+# Cubetas no vacías por página de la tabla hash visual
+CUBETAS_POR_PAGINA_VISUAL = 100
+# Lecturas que main.py guarda por función en la caché de Streamlit (cada
+# versión de los datos y cada página o búsqueda ocupa una)
+LECTURAS_CACHEADAS = 64
+
+# Validación de importaciones: los juegos se validan con las reglas del modelo
+# en bloques repartidos entre PROCESOS_VALIDACION procesos (None: todos los
+# núcleos). Una importación menor que un bloque se valida sin procesos extra.
+TAMANO_BLOQUE_VALIDACION = 2000
+PROCESOS_VALIDACION = None
+# Errores de importación que se informan con detalle (el resto solo se cuenta)
+MAX_ERRORES_IMPORTACION = 100
+
+# Motor de la tabla hash de índices: "encadenado" (listas enlazadas de nodos)
+# o "abierto" (direccionamiento abierto sobre arreglos planos)
+MOTOR_TABLA_HASH = "encadenado"
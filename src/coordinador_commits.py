@@ -0,0 +1,83 @@
+import threading
+import time
+from contextlib import nullcontext
+
+from .config import VENTANA_GROUP_COMMIT
+
+
+class _Pedido:
+    """Operación encolada por un hilo, con su resultado o error"""
+
+    def __init__(self, operacion):
+        self.operacion = operacion
+        self.resultado = None
+        self.error = None
+        self.listo = threading.Event()
+
+
+class CoordinadorCommits:
+    """Agrupa escrituras concurrentes en un solo commit (group commit)
+
+    El primer hilo que llega espera ``ventana`` segundos y, como líder,
+    ejecuta todas las operaciones encoladas dentro de ``contexto_grupo``, que
+    es quien escribe a disco una sola vez al salir. Cada hilo recibe el
+    resultado de su propia operación cuando el grupo ya está confirmado.
+    """
+
+    def __init__(self, contexto_grupo=nullcontext, ventana=VENTANA_GROUP_COMMIT):
+        self.contexto_grupo = contexto_grupo
+        self.ventana = ventana
+        self.commits = 0
+        self.operaciones = 0
+        self._lock = threading.Lock()
+        # Un solo grupo se confirma a la vez; el siguiente se va formando
+        self._lock_commit = threading.Lock()
+        self._cola: list[_Pedido] = []
+        self._hay_lider = False
+        self._local = threading.local()
+
+    def ejecutar(self, operacion):
+        """Ejecuta ``operacion`` dentro del próximo grupo y devuelve su valor"""
+        # Una operación lanzada desde otra ya agrupada se ejecuta directamente
+        if getattr(self._local, "en_grupo", False):
+            return operacion()
+
+        pedido = _Pedido(operacion)
+        with self._lock:
+            self._cola.append(pedido)
+            es_lider = not self._hay_lider
+            self._hay_lider = True
+
+        if es_lider:
+            if self.ventana > 0:
+                time.sleep(self.ventana)
+            with self._lock:
+                grupo, self._cola = self._cola, []
+                self._hay_lider = False
+            self._confirmar(grupo)
+
+        pedido.listo.wait()
+        if pedido.error is not None:
+            raise pedido.error
+        return pedido.resultado
+
+    def _confirmar(self, grupo):
+        with self._lock_commit:
+            self._local.en_grupo = True
+            try:
+                with self.contexto_grupo():
+                    for pedido in grupo:
+                        try:
+                            pedido.resultado = pedido.operacion()
+                        except Exception as e:
+                            pedido.error = e
+            except Exception as e:
+                # Falló la escritura del grupo: ninguna operación es durable
+                for pedido in grupo:
+                    pedido.error = pedido.error or e
+            finally:
+                self._local.en_grupo = False
+                self.commits += 1
+                self.operaciones += len(grupo)
+                for pedido in grupo:
+                    pedido.listo.set()
@@ -0,0 +1,142 @@
+import atexit
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .config import INTERVALO_FSYNC, POLITICA_DURABILIDAD
+
+SIEMPRE = "siempre"
+INTERVALO = "intervalo"
+NUNCA = "nunca"
+
+# Se puede cambiar en tiempo de ejecución (p. ej. en pruebas)
+politica = POLITICA_DURABILIDAD
+
+_lock = threading.Lock()
+_ultimo_fsync: dict[str, float] = {}
+# Escrituras que la política "intervalo" dejó sin sincronizar: (dispositivo,
+# inodo) -> descriptor duplicado. Por inodo, así un journal apartado con
+# rename se sincroniza igual.
+_pendientes: dict[tuple, int] = {}
+_hilo_pendientes = None
+
+
+def sincronizar(archivo):
+    """Lleva a disco lo escrito en un archivo abierto según la política
+
+    Con "intervalo", dentro de la ventana el fsync se deja pendiente y un
+    hilo lo hace al cumplirse INTERVALO_FSYNC: lo último escrito nunca
+    queda sin sincronizar más que ese tiempo.
+    """
+    global _hilo_pendientes
+    if politica == NUNCA:
+        return
+
+    archivo.flush()
+    if politica == INTERVALO:
+        ahora = time.monotonic()
+        with _lock:
+            if ahora - _ultimo_fsync.get(archivo.name, 0.0) < INTERVALO_FSYNC:
+                estado = os.fstat(archivo.fileno())
+                clave = (estado.st_dev, estado.st_ino)
+                if clave not in _pendientes:
+                    _pendientes[clave] = os.dup(archivo.fileno())
+                if _hilo_pendientes is None:
+                    _hilo_pendientes = threading.Thread(
+                        target=_sincronizar_al_vencer,
+                        name="fsync-intervalo",
+                        daemon=True,
+                    )
+                    _hilo_pendientes.start()
+                return
+            _ultimo_fsync[archivo.name] = ahora
+
+    os.fsync(archivo.fileno())
+
+
+def sincronizar_pendientes():
+    """Hace ya los fsync que la política "intervalo" dejó pendientes"""
+    with _lock:
+        descriptores = list(_pendientes.values())
+        _pendientes.clear()
+    for descriptor in descriptores:
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def _sincronizar_al_vencer():
+    global _hilo_pendientes
+    while True:
+        time.sleep(INTERVALO_FSYNC)
+        with _lock:
+            if not _pendientes:
+                _hilo_pendientes = None
+                return
+        sincronizar_pendientes()
+
+
+atexit.register(sincronizar_pendientes)
+
+
+def reemplazar_archivo(ruta, escribir, binario=False):
+    """Escribe un archivo completo de forma atómica (temporal + rename)
+
+    ``escribir`` recibe el archivo temporal abierto en modo texto (o binario
+    con ``binario``). Salvo con la política "nunca", el temporal se
+    sincroniza antes del rename para que un corte nunca deje el archivo
+    vacío.
+    """
+    instalar(escribir_temporal(ruta, escribir, binario=binario), ruta)
+
+
+def escribir_temporal(ruta, escribir, sufijo=".tmp", binario=False):
+    """Escribe el contenido de ``ruta`` en un temporal junto a ella
+
+    Devuelve la ruta del temporal, ya sincronizado según la política, para
+    instalarlo después con ``instalar``. Si ``escribir`` falla se borra. El
+    nombre es único en cada llamada: dos escrituras a la vez de la misma
+    ruta no comparten el temporal.
+    """
+    ruta = Path(ruta)
+    descriptor, nombre = tempfile.mkstemp(
+        dir=ruta.parent, prefix=ruta.name + ".", suffix=sufijo
+    )
+    ruta_temporal = Path(nombre)
+    try:
+        if binario:
+            archivo = os.fdopen(descriptor, "wb")
+        else:
+            archivo = os.fdopen(descriptor, "w", encoding="utf-8")
+        with archivo as f:
+            # mkstemp lo crea solo legible por su dueño: queda como el original
+            try:
+                modo = os.stat(ruta).st_mode & 0o777
+            except FileNotFoundError:
+                modo = 0o644
+            os.chmod(f.fileno(), modo)
+            escribir(f)
+            if politica != NUNCA:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        ruta_temporal.unlink(missing_ok=True)
+        raise
+    return ruta_temporal
+
+
+def instalar(ruta_temporal, ruta):
+    """Reemplaza ``ruta`` por el temporal con un rename atómico"""
+    ruta = Path(ruta)
+    os.replace(ruta_temporal, ruta)
+
+    if politica == SIEMPRE:
+        # El rename queda registrado al sincronizar la carpeta
+        descriptor = os.open(ruta.parent, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import mmap
+import struct
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from . import durabilidad
+
+# Formato del archivo (little-endian, tamaño fijo salvo textos y metadatos):
+#
+#   cabecera (96 bytes)  firma, versión del formato, versión de la función
+#                        hash, tamaño de la tabla, elementos, ranuras, huella
+#                        del inventario y desplazamientos de las secciones
+#   ranuras (24 bytes)   hash (u64), posición (i64, -1 = libre),
+#                        desplazamiento del ID en los textos (u32), largo (u32)
+#   textos               IDs en UTF-8, uno detrás de otro
+#   metadatos            JSON (historial de redimensionamientos)
+#
+# Las ranuras forman una tabla de direccionamiento abierto con sondeo lineal
+# y ocupación <= 0.5, así una búsqueda lee pocas ranuras directamente del
+# archivo mapeado, sin parsear nada al abrirlo.
+FIRMA = b"THASHIDX"
+VERSION_FORMATO = 1
+_CABECERA = struct.Struct("<8sHH16sQQQ16sQQQ4x")
+_RANURA = struct.Struct("<QqII")
+_RANURAS_MINIMAS = 8
+# IDs que se juntan por cada actualización del resumen de la huella
+_BLOQUE_HUELLA = 10_000
+_SIN_HUELLA = bytes(16)
+
+
+class ErrorIndiceBinario(ValueError):
+    """El archivo no es un índice binario válido"""
+
+
+def huella_ids(ids: Iterable[Optional[str]]) -> bytes:
+    """Huella del inventario: BLAKE2b de los IDs en orden de posición
+
+    Si la tabla hash guarda la misma huella que el inventario, cada ID está
+    en la posición que indica el índice y no hace falta reconstruirlo.
+    """
+    resumen = hashlib.blake2b(digest_size=16)
+    ids = iter(ids)
+    while True:
+        bloque = list(islice(ids, _BLOQUE_HUELLA))
+        if not bloque:
+            return resumen.digest()
+        texto = "".join(f"{id_juego or ''}\0" for id_juego in bloque)
+        resumen.update(texto.encode("utf-8"))
+
+
+def huella_pares(pares: Iterable[Tuple[str, int]]) -> Optional[bytes]:
+    """Huella de los pares (id, posición) de la tabla hash
+
+    None si las posiciones no son exactamente 0..n-1: un índice así no
+    corresponde a ningún inventario.
+    """
+    pares = list(pares)
+    ids: list = [None] * len(pares)
+    for id_juego, posicion in pares:
+        if not 0 <= posicion < len(ids) or ids[posicion] is not None:
+            return None
+        ids[posicion] = id_juego
+    return huella_ids(ids)
+
+
+def escribir(
+    ruta,
+    pares: Iterable[Tuple[str, int]],
+    tamano: int,
+    version_hash: str,
+    valor_hash: Callable[[str], int],
+    metadatos: Optional[Dict[str, Any]] = None,
+):
+    """Escribe el índice binario de los pares (id, posición) de forma atómica"""
+    pares = list(pares)
+    ranuras = _RANURAS_MINIMAS
+    while ranuras < 2 * len(pares):
+        ranuras *= 2
+    mascara = ranuras - 1
+
+    tabla = bytearray(_RANURA.pack(0, -1, 0, 0) * ranuras)
+    ocupadas = bytearray(ranuras)
+    textos = bytearray()
+    for id_juego, posicion in pares:
+        valor = valor_hash(id_juego)
+        i = valor & mascara
+        while ocupadas[i]:
+            i = (i + 1) & mascara
+        ocupadas[i] = 1
+        clave = id_juego.encode("utf-8")
+        _RANURA.pack_into(
+            tabla, i * _RANURA.size, valor, posicion, len(textos), len(clave)
+        )
+        textos += clave
+    if len(textos) > 0xFFFFFFFF:
+        raise ErrorIndiceBinario("los IDs no caben en el índice binario")
+
+    extra = json.dumps(metadatos or {}, ensure_ascii=False).encode("utf-8")
+    inicio_textos = _CABECERA.size + len(tabla)
+    cabecera = _CABECERA.pack(
+        FIRMA,
+        VERSION_FORMATO,
+        0,
+        version_hash.encode("ascii"),
+        tamano,
+        len(pares),
+        ranuras,
+        huella_pares(pares) or _SIN_HUELLA,
+        inicio_textos,
+        inicio_textos + len(textos),
+        len(extra),
+    )
+
+    def volcar(f):
+        f.write(cabecera)
+        f.write(tabla)
+        f.write(textos)
+        f.write(extra)
+
+    durabilidad.reemplazar_archivo(ruta, volcar, binario=True)
+
+
+class IndiceBinario:
+    """Índice binario abierto con mmap y consultado en el propio archivo
+
+    Abrirlo solo lee la cabecera; cada búsqueda lee sus ranuras del mapa.
+    ``valor_hash`` debe ser la función de la versión de hash del archivo.
+    """
+
+    def __init__(self, ruta, valor_hash: Callable[[str], int]):
+        self.ruta = Path(ruta)
+        self._valor_hash = valor_hash
+        with open(self.ruta, "rb") as f:
+            try:
+                self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Archivo vacío: mmap no admite longitud cero
+                raise ErrorIndiceBinario("índice binario vacío") from None
+
+        try:
+            self._leer_cabecera()
+        except BaseException:
+            self._mapa.close()
+            raise
+
+    def _leer_cabecera(self):
+        if len(self._mapa) < _CABECERA.size:
+            raise ErrorIndiceBinario("índice binario truncado")
+        (
+            firma,
+            formato,
+            _,
+            version_hash,
+            self.tamano,
+            self.total_elementos,
+            self.ranuras,
+            huella,
+            self._inicio_textos,
+            self._inicio_metadatos,
+            largo_metadatos,
+        ) = _CABECERA.unpack_from(self._mapa, 0)
+
+        if firma != FIRMA or formato != VERSION_FORMATO:
+            raise ErrorIndiceBinario("no es un índice binario de la tabla hash")
+        if self.ranuras < 1 or self.ranuras & (self.ranuras - 1):
+            raise ErrorIndiceBinario("cantidad de ranuras inválida")
+        self._fin = self._inicio_metadatos + largo_metadatos
+        if (
+            self._inicio_textos != _CABECERA.size + self.ranuras * _RANURA.size
+            or len(self._mapa) < self._fin
+        ):
+            raise ErrorIndiceBinario("índice binario truncado")
+
+        self.version_hash = version_hash.rstrip(b"\0").decode("ascii")
+        self.huella = None if huella == _SIN_HUELLA else huella
+
+    def buscar(self, id_juego: str) -> Optional[int]:
+        """Posición del ID en el inventario, o None"""
+        valor = self._valor_hash(id_juego)
+        clave = id_juego.encode("utf-8")
+        mapa, mascara = self._mapa, self.ranuras - 1
+        i = valor & mascara
+        while True:
+            hash_ranura, posicion, desplazamiento, largo = _RANURA.unpack_from(
+                mapa, _CABECERA.size + i * _RANURA.size
+            )
+            if posicion < 0:
+                return None
+            if hash_ranura == valor and largo == len(clave):
+                inicio = self._inicio_textos + desplazamiento
+                fin = inicio + largo
+                if mapa[inicio:fin] == clave:
+                    return posicion
+            i = (i + 1) & mascara
+
+    def entradas(self) -> Iterator[Tuple[str, int]]:
+        """Pares (id, posición) en orden de ranura"""
+        inicio_ranuras = _CABECERA.size
+        inicio_textos, fin_textos = self._inicio_textos, self._inicio_metadatos
+        textos = self._mapa[inicio_textos:fin_textos]
+        ranuras = memoryview(self._mapa)[inicio_ranuras:inicio_textos]
+        try:
+            for _, posicion, desplazamiento, largo in _RANURA.iter_unpack(ranuras):
+                if posicion >= 0:
+                    fin = desplazamiento + largo
+                    yield textos[desplazamiento:fin].decode("utf-8"), posicion
+        finally:
+            ranuras.release()
+
+    def metadatos(self) -> Dict[str, Any]:
+        inicio, fin = self._inicio_metadatos, self._fin
+        return json.loads(self._mapa[inicio:fin].decode("utf-8") or "{}")
+
+    def cerrar(self):
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
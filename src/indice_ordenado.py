@@ -0,0 +1,87 @@
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Mayor que cualquier carácter: cierra el rango de un prefijo (y, como ID,
+# queda detrás de todas las entradas con la misma clave)
+_FIN_PREFIJO = "\U0010ffff"
+
+
+class IndiceOrdenado:
+    """Índice secundario ordenado por una clave derivada de cada juego
+
+    Guarda pares (clave, id) en una lista ordenada: altas y bajas por
+    búsqueda binaria y consultas en O(log n + k) para k resultados. Los
+    juegos cuya clave es ``None`` (dato ausente o inválido) no se indexan.
+    """
+
+    def __init__(self, clave: Callable[[dict], Any]):
+        self._clave = clave
+        self._entradas: List[Tuple[Any, str]] = []
+        self._claves: Dict[str, Any] = {}
+
+    def construir(self, juegos: Iterable[dict]):
+        claves = ((juego["id"], self._clave(juego)) for juego in juegos)
+        self._claves = {
+            id_juego: clave for id_juego, clave in claves if clave is not None
+        }
+        self._entradas = sorted(
+            (clave, id_juego) for id_juego, clave in self._claves.items()
+        )
+
+    def agregar(self, juego: dict):
+        self.eliminar(juego["id"])
+        clave = self._clave(juego)
+        if clave is None:
+            return
+        self._claves[juego["id"]] = clave
+        insort(self._entradas, (clave, juego["id"]))
+
+    def eliminar(self, id_juego: str):
+        if id_juego not in self._claves:
+            return
+        entrada = (self._claves.pop(id_juego), id_juego)
+        del self._entradas[bisect_left(self._entradas, entrada)]
+
+    def prefijo(self, prefijo: str) -> Iterator[str]:
+        """IDs cuya clave (texto) empieza por ``prefijo``, en orden"""
+        inicio = bisect_left(self._entradas, (prefijo,))
+        fin = bisect_left(self._entradas, (prefijo + _FIN_PREFIJO,))
+        return self._ids(inicio, fin)
+
+    def rango(
+        self,
+        desde: Any = None,
+        hasta: Any = None,
+        inicio: int = 0,
+        limite: Optional[int] = None,
+    ) -> Iterator[str]:
+        """IDs con ``desde <= clave <= hasta`` en orden (``None``: sin cota)
+
+        ``inicio`` y ``limite`` paginan dentro del rango sin recorrerlo.
+        """
+        primero = 0 if desde is None else bisect_left(self._entradas, (desde,))
+        ultimo = len(self._entradas)
+        if hasta is not None:
+            ultimo = bisect_left(self._entradas, (hasta, _FIN_PREFIJO))
+        primero += inicio
+        if limite is not None:
+            ultimo = min(ultimo, primero + limite)
+        return self._ids(primero, ultimo)
+
+    def recorrer(self, inicio: int = 0, limite: Optional[int] = None) -> Iterator[str]:
+        """IDs en orden de clave, saltando ``inicio`` y hasta ``limite``"""
+        fin = len(self._entradas)
+        if limite is not None:
+            fin = min(fin, inicio + limite)
+        return self._ids(inicio, fin)
+
+    def _ids(self, inicio: int, fin: int) -> Iterator[str]:
+        for i in range(inicio, fin):
+            entradas = self._entradas
+            if i >= len(entradas):
+                # La lista se acortó mientras se recorría
+                return
+            yield entradas[i][1]
+
+    def __len__(self):
+        return len(self._entradas)
@@ -0,0 +1,54 @@
+from typing import Dict, Iterable, Optional, Set
+
+
+def nombre_portada(portada) -> Optional[str]:
+    """Nombre del archivo de la portada (<sha256>.<ext>) dentro de su ruta"""
+    if not isinstance(portada, str) or not portada:
+        return None
+    return portada.rsplit("/", 1)[-1]
+
+
+class IndicePortadas:
+    """Conteo de referencias de cada archivo de portada
+
+    Guarda, por nombre de archivo (el hash SHA256 con su extensión), los IDs
+    de los juegos que lo usan. Una portada sin referencias es candidata a
+    borrarse (ver ``servicio_imagenes.recolectar_huerfanas``).
+    """
+
+    def __init__(self):
+        self._ids_por_portada: Dict[str, Set[str]] = {}
+        self._portadas: Dict[str, str] = {}
+
+    def construir(self, juegos: Iterable[dict]):
+        self._ids_por_portada = {}
+        self._portadas = {}
+        for juego in juegos:
+            self.agregar(juego)
+
+    def agregar(self, juego: dict):
+        self.eliminar(juego["id"])
+        nombre = nombre_portada(juego.get("portada"))
+        if nombre is None:
+            return
+        self._portadas[juego["id"]] = nombre
+        self._ids_por_portada.setdefault(nombre, set()).add(juego["id"])
+
+    def eliminar(self, id_juego: str):
+        nombre = self._portadas.pop(id_juego, None)
+        if nombre is None:
+            return
+        ids = self._ids_por_portada[nombre]
+        ids.discard(id_juego)
+        if not ids:
+            del self._ids_por_portada[nombre]
+
+    def referencias(self, nombre: str) -> int:
+        """Cantidad de juegos que usan la portada"""
+        return len(self._ids_por_portada.get(nombre, ()))
+
+    def ids_de(self, nombre: str) -> Set[str]:
+        return set(self._ids_por_portada.get(nombre, ()))
+
+    def __len__(self):
+        return len(self._ids_por_portada)
@@ -0,0 +1,104 @@
+import threading
+from typing import Dict, Iterable, List, Set
+
+LONGITUD_NGRAMA = 3
+
+
+def normalizar(texto: str) -> str:
+    return texto.strip().lower()
+
+
+def trigramas(texto: str) -> Set[str]:
+    return {
+        texto[inicio:fin]
+        for inicio, fin in enumerate(range(LONGITUD_NGRAMA, len(texto) + 1))
+    }
+
+
+class IndiceTrigramas:
+    """Índice invertido de trigramas para buscar subcadenas en los nombres
+
+    Cada trigrama apunta al conjunto de IDs cuyo nombre lo contiene. Una
+    consulta intersecta las listas de sus trigramas y solo compara el texto
+    de los candidatos, sin recorrer todo el catálogo.
+
+    Las búsquedas no toman el lock de escritura del repositorio: los
+    conjuntos se modifican y se leen con ``_lock`` del índice, que solo se
+    tiene mientras se arman los candidatos.
+    """
+
+    def __init__(self):
+        self._listas: Dict[str, Set[str]] = {}
+        self._nombres: Dict[str, str] = {}
+        # Nombres más cortos que un trigrama: no aparecen en ninguna lista
+        self._cortos: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def construir(self, juegos: Iterable[dict]):
+        # Se arma aparte: las búsquedas en curso siguen con el anterior
+        nuevo = IndiceTrigramas()
+        for juego in juegos:
+            nuevo.agregar(juego)
+        with self._lock:
+            self._listas = nuevo._listas
+            self._nombres = nuevo._nombres
+            self._cortos = nuevo._cortos
+
+    def agregar(self, juego: dict):
+        id_juego = juego["id"]
+        nombre_norm = normalizar(juego["nombre"])
+        with self._lock:
+            self._nombres[id_juego] = nombre_norm
+            if len(nombre_norm) < LONGITUD_NGRAMA:
+                self._cortos.add(id_juego)
+            for trigrama in trigramas(nombre_norm):
+                self._listas.setdefault(trigrama, set()).add(id_juego)
+
+    def eliminar(self, id_juego: str):
+        with self._lock:
+            nombre_norm = self._nombres.pop(id_juego, None)
+            if nombre_norm is None:
+                return
+            self._cortos.discard(id_juego)
+            for trigrama in trigramas(nombre_norm):
+                lista = self._listas.get(trigrama)
+                if lista is not None:
+                    lista.discard(id_juego)
+                    if not lista:
+                        del self._listas[trigrama]
+
+    def buscar(self, consulta: str) -> List[str]:
+        """IDs de todos los juegos cuyo nombre contiene ``consulta``"""
+        consulta = normalizar(consulta)
+        if not consulta:
+            return []
+
+        with self._lock:
+            candidatos = self._candidatos(consulta)
+
+        # Los trigramas no garantizan el orden: se confirma la subcadena
+        return [
+            id_juego
+            for id_juego in candidatos
+            if consulta in self._nombres.get(id_juego, "")
+        ]
+
+    def _candidatos(self, consulta: str) -> Set[str]:
+        """IDs que pueden contener ``consulta`` (con ``_lock`` tomado)"""
+        if len(consulta) >= LONGITUD_NGRAMA:
+            listas = [self._listas.get(t) for t in trigramas(consulta)]
+            if any(lista is None for lista in listas):
+                return set()
+            listas.sort(key=len)
+            return listas[0].intersection(*listas[1:])
+
+        # Consulta corta: se unen las listas de los trigramas que la
+        # contienen (acotado por el número de trigramas distintos)
+        candidatos = set(self._cortos)
+        for trigrama, lista in self._listas.items():
+            if consulta in trigrama:
+                candidatos.update(lista)
+        return candidatos
+
+    def __len__(self):
+        return len(self._nombres)
@@ -0,0 +1,212 @@
+import sys
+from array import array
+from collections.abc import MutableSequence
+from typing import Dict, Iterable, List
+
+from .modelos import CAMPOS
+
+# Límites de array('q')
+_MIN_Q = -(2**63)
+_MAX_Q = 2**63 - 1
+_CAMPOS_TEXTO = ("id", "nombre", "compania", "portada", "fecha_publicacion")
+
+
+def _es_regular(juego) -> bool:
+    """El juego cabe en las columnas: exactamente los campos del modelo y
+    cada uno con el tipo de su columna"""
+    if type(juego) is not dict or len(juego) != len(CAMPOS):
+        return False
+    try:
+        for campo in _CAMPOS_TEXTO:
+            if type(juego[campo]) is not str:
+                return False
+        cantidad = juego["cantidad"]
+        return (
+            type(juego["precio"]) in (int, float)
+            and type(cantidad) is int
+            and _MIN_Q <= cantidad <= _MAX_Q
+        )
+    except KeyError:
+        return False
+
+
+class InventarioColumnar(MutableSequence):
+    """Inventario guardado por columnas en lugar de un dict por juego
+
+    Precios y cantidades van en arrays de C ('d' y 'q'); los textos en listas
+    y los de pocos valores distintos (compañía, fecha) internados, así cada
+    valor se guarda una vez. Nombres y portadas casi nunca se repiten:
+    internarlos solo costaría tiempo al cargar. La fila i es la posición i que
+    guarda la tabla hash. Al pedir una fila se arma un dict nuevo con sus
+    valores: modificarlo no cambia el inventario, para eso está
+    ``inventario[i] = juego``.
+
+    Los juegos que no encajan en las columnas (campos de más o de menos, o
+    tipos distintos) se guardan tal cual aparte, para no perder datos. Un
+    precio entero se guarda como float.
+    """
+
+    def __init__(self, juegos: Iterable[dict] = ()):
+        self.ids: List[str] = []
+        self._nombres: List[str] = []
+        self._precios = array("d")
+        self._cantidades = array("q")
+        self._companias: List[str] = []
+        self._portadas: List[str] = []
+        self._fechas: List[str] = []
+        # Filas irregulares: posición -> dict original
+        self._irregulares: Dict[int, dict] = {}
+        self.extend(juegos)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def id_en(self, posicion: int) -> str:
+        """ID de la fila sin armar el dict completo"""
+        return self.ids[posicion]
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(len(self)))]
+        posicion = self._normalizar(posicion)
+        irregular = self._irregulares.get(posicion)
+        if irregular is not None:
+            return dict(irregular)
+        return {
+            "id": self.ids[posicion],
+            "nombre": self._nombres[posicion],
+            "precio": self._precios[posicion],
+            "cantidad": self._cantidades[posicion],
+            "compania": self._companias[posicion],
+            "portada": self._portadas[posicion],
+            "fecha_publicacion": self._fechas[posicion],
+        }
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield self[posicion]
+
+    def append(self, juego: dict):
+        if _es_regular(juego):
+            self.ids.append(juego["id"])
+            self._nombres.append(juego["nombre"])
+            self._precios.append(juego["precio"])
+            self._cantidades.append(juego["cantidad"])
+            self._companias.append(sys.intern(juego["compania"]))
+            self._portadas.append(juego["portada"])
+            self._fechas.append(sys.intern(juego["fecha_publicacion"]))
+            return
+
+        self.ids.append(None)
+        self._nombres.append(None)
+        self._precios.append(0.0)
+        self._cantidades.append(0)
+        self._companias.append(None)
+        self._portadas.append(None)
+        self._fechas.append(None)
+        self[len(self.ids) - 1] = juego
+
+    def extend(self, juegos: Iterable[dict]):
+        """append de muchos juegos, con las columnas resueltas una sola vez"""
+        if juegos is self:
+            juegos = list(juegos)
+        intern = sys.intern
+        ids = self.ids.append
+        nombres = self._nombres.append
+        precios = self._precios.append
+        cantidades = self._cantidades.append
+        companias = self._companias.append
+        portadas = self._portadas.append
+        fechas = self._fechas.append
+        for juego in juegos:
+            if not _es_regular(juego):
+                self.append(juego)
+                continue
+            ids(juego["id"])
+            nombres(juego["nombre"])
+            precios(juego["precio"])
+            cantidades(juego["cantidad"])
+            companias(intern(juego["compania"]))
+            portadas(juego["portada"])
+            fechas(intern(juego["fecha_publicacion"]))
+
+    def __setitem__(self, posicion, juego):
+        if isinstance(posicion, slice):
+            raise TypeError("InventarioColumnar no admite asignar rebanadas")
+        posicion = self._normalizar(posicion)
+        if _es_regular(juego):
+            self._irregulares.pop(posicion, None)
+            self.ids[posicion] = juego["id"]
+            self._nombres[posicion] = juego["nombre"]
+            self._precios[posicion] = juego["precio"]
+            self._cantidades[posicion] = juego["cantidad"]
+            self._companias[posicion] = sys.intern(juego["compania"])
+            self._portadas[posicion] = juego["portada"]
+            self._fechas[posicion] = sys.intern(juego["fecha_publicacion"])
+        else:
+            self._irregulares[posicion] = dict(juego)
+            self.ids[posicion] = juego.get("id")
+
+    def __delitem__(self, posicion):
+        if isinstance(posicion, slice):
+            for i in sorted(range(*posicion.indices(len(self))), reverse=True):
+                del self[i]
+            return
+        posicion = self._normalizar(posicion)
+        for columna in self._columnas():
+            del columna[posicion]
+        if self._irregulares:
+            self._irregulares.pop(posicion, None)
+            # Las filas posteriores se corren una posición
+            self._irregulares = {
+                (i - 1 if i > posicion else i): juego
+                for i, juego in self._irregulares.items()
+            }
+
+    def insert(self, posicion, juego):
+        if posicion >= len(self):
+            self.append(juego)
+            return
+        # Fuera del final las filas se desplazan: O(n), como en una lista
+        resto = [self[i] for i in range(posicion, len(self))]
+        del self[posicion:]
+        self.append(juego)
+        for fila in resto:
+            self.append(fila)
+
+    def pop(self, posicion=-1):
+        posicion = self._normalizar(posicion)
+        juego = self[posicion]
+        del self[posicion]
+        return juego
+
+    def copy(self) -> "InventarioColumnar":
+        """Copia de las columnas (sin armar los dicts de cada fila)"""
+        copia = InventarioColumnar()
+        copia.ids = list(self.ids)
+        copia._nombres = list(self._nombres)
+        copia._precios = array("d", self._precios)
+        copia._cantidades = array("q", self._cantidades)
+        copia._companias = list(self._companias)
+        copia._portadas = list(self._portadas)
+        copia._fechas = list(self._fechas)
+        copia._irregulares = {i: dict(j) for i, j in self._irregulares.items()}
+        return copia
+
+    def _columnas(self):
+        return (
+            self.ids,
+            self._nombres,
+            self._precios,
+            self._cantidades,
+            self._companias,
+            self._portadas,
+            self._fechas,
+        )
+
+    def _normalizar(self, posicion: int) -> int:
+        if posicion < 0:
+            posicion += len(self)
+        if not 0 <= posicion < len(self):
+            raise IndexError("posición fuera del inventario")
+        return posicion
@@ -0,0 +1,165 @@
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+# Caracteres leídos del archivo en cada bloque
+TAMANO_BLOQUE = 64 * 1024
+# Un elemento que no se completa con este tamaño se da por inválido: sin
+# este límite un JSON roto acabaría cargando el resto del archivo en memoria
+TAMANO_MAXIMO_ELEMENTO = 1024 * 1024
+
+_ESPACIOS = " \t\n\r"
+_NO_ESPACIO = re.compile(r"[^ \t\n\r]")
+
+
+class ErrorLecturaJSON(ValueError):
+    """El contenido no es JSON válido"""
+
+
+class NoEsArregloJSON(ErrorLecturaJSON):
+    """El contenido no empieza por un arreglo JSON"""
+
+
+def iterar_arreglo(
+    archivo: TextIO,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    tamano_maximo: int = TAMANO_MAXIMO_ELEMENTO,
+) -> Iterator[Any]:
+    """Recorre los elementos de un arreglo JSON leyendo el archivo por bloques
+
+    Solo se mantiene en memoria el bloque actual y el elemento que se está
+    decodificando, sea cual sea el tamaño del archivo.
+    """
+    decodificador = json.JSONDecoder()
+    texto = ""
+    pos = 0
+    fin_archivo = False
+
+    def leer_mas():
+        nonlocal texto, pos, fin_archivo
+        bloque = archivo.read(tamano_bloque)
+        if not bloque:
+            fin_archivo = True
+        texto = texto[pos:] + bloque
+        pos = 0
+
+    def siguiente_caracter():
+        """Salta espacios y devuelve el siguiente carácter ('' al final)"""
+        nonlocal pos
+        while True:
+            encontrado = _NO_ESPACIO.search(texto, pos)
+            if encontrado is not None:
+                pos = encontrado.start()
+                return texto[pos]
+            pos = len(texto)
+            if fin_archivo:
+                return ""
+            leer_mas()
+
+    if siguiente_caracter() != "[":
+        raise NoEsArregloJSON("se esperaba una lista de juegos")
+    pos += 1
+
+    if siguiente_caracter() == "]":
+        pos += 1
+    else:
+        while True:
+            while True:
+                try:
+                    elemento, fin = decodificador.raw_decode(texto, pos)
+                except json.JSONDecodeError as e:
+                    if fin_archivo:
+                        raise ErrorLecturaJSON(str(e)) from None
+                    if len(texto) - pos > tamano_maximo:
+                        raise ErrorLecturaJSON("elemento demasiado grande") from None
+                    leer_mas()
+                    continue
+                if fin == len(texto) and not fin_archivo:
+                    # Un número podría seguir en el próximo bloque
+                    leer_mas()
+                    continue
+                break
+            pos = fin
+            yield elemento
+
+            separador = siguiente_caracter()
+            pos += 1
+            if separador == "]":
+                break
+            if separador != ",":
+                raise ErrorLecturaJSON("se esperaba ',' o ']' entre elementos")
+            siguiente_caracter()
+
+    if siguiente_caracter() != "":
+        raise ErrorLecturaJSON("contenido extra después de la lista")
+
+
+def leer_bloques_arreglo(
+    archivo: TextIO, tamano_bloque: int = TAMANO_BLOQUE
+) -> Iterator[list]:
+    """Lee un arreglo JSON de objetos por bloques grandes, cada uno con json.loads
+
+    Para archivos que escribe la propia aplicación (el checkpoint del
+    inventario); las importaciones usan iterar_arreglo. Cada bloque se corta
+    tras su último "}" y se decodifica de una vez, sin pasar elemento a
+    elemento por raw_decode. Si el corte no cae entre dos elementos (una
+    llave dentro de un texto o de un objeto anidado) el bloque no decodifica
+    y se junta con el siguiente. Devuelve la lista de elementos de cada
+    bloque; la memoria depende del tamaño del bloque, no del archivo.
+    """
+    texto = archivo.read(tamano_bloque)
+    inicio = _NO_ESPACIO.search(texto)
+    while inicio is None:
+        texto = archivo.read(tamano_bloque)
+        if not texto:
+            raise NoEsArregloJSON("se esperaba una lista de juegos")
+        inicio = _NO_ESPACIO.search(texto)
+    if texto[inicio.start()] != "[":
+        raise NoEsArregloJSON("se esperaba una lista de juegos")
+    despues = inicio.start() + 1
+    texto = texto[despues:]
+    # Tras un bloque decodificado sigue la ',' (o el ']' final)
+    separador = False
+    tras_coma = False
+
+    while True:
+        if separador:
+            texto = texto.lstrip(_ESPACIOS)
+            if texto.startswith(","):
+                texto = texto[1:]
+                separador = False
+                tras_coma = True
+            elif texto and texto[0] != "]":
+                raise ErrorLecturaJSON("se esperaba ',' o ']' entre elementos")
+        if not separador:
+            corte = texto.rfind("}") + 1
+            if corte:
+                try:
+                    elementos = json.loads("[" + texto[:corte] + "]")
+                except json.JSONDecodeError:
+                    elementos = None
+                if elementos is not None:
+                    yield elementos
+                    texto = texto[corte:]
+                    separador = True
+                    tras_coma = False
+        bloque = archivo.read(tamano_bloque)
+        if not bloque:
+            break
+        texto += bloque
+
+    resto = texto.strip(_ESPACIOS)
+    if separador:
+        if resto != "]":
+            raise ErrorLecturaJSON("contenido extra después de la lista")
+        return
+    if not resto.endswith("]"):
+        raise ErrorLecturaJSON("se esperaba ']' al final de la lista")
+    try:
+        elementos = json.loads("[" + resto[:-1] + "]")
+    except json.JSONDecodeError as e:
+        raise ErrorLecturaJSON(str(e)) from None
+    if tras_coma and not elementos:
+        raise ErrorLecturaJSON("se esperaba un elemento después de ','")
+    if elementos:
+        yield elementos
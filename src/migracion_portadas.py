@@ -0,0 +1,118 @@
+# Migra las portadas guardadas a otra organización (ver almacen_portadas)
+# uso: python -m src.migracion_portadas [plana|particionada|paquetes]
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict
+
+from . import durabilidad
+from .almacen_portadas import (
+    ORGANIZACION_PAQUETES,
+    AlmacenPaquetes,
+    crear_almacen,
+    rutas_posibles,
+)
+from .config import CARPETA_PORTADAS
+from .indice_portadas import nombre_portada
+
+
+def migrar_portadas(organizacion=None, carpeta=None, portadas=None) -> Dict[str, Any]:
+    """Mueve todas las portadas guardadas a la organización indicada
+
+    Se recorren los archivos de todas las organizaciones (sueltos,
+    particionados y empaquetados) y cada uno queda solo donde lo pone la
+    nueva. El inventario no cambia: sus rutas solo llevan el nombre del
+    archivo y se resuelven en cualquier organización. Al final se comprueba
+    que se encuentran todas las ``portadas`` (por defecto, las del
+    inventario). Debe ejecutarse con la aplicación detenida.
+    """
+    destino = crear_almacen(carpeta or CARPETA_PORTADAS, organizacion)
+    # El almacén de paquetes también ve los archivos sueltos y particionados
+    if isinstance(destino, AlmacenPaquetes):
+        origen = destino
+    else:
+        origen = crear_almacen(destino.carpeta, ORGANIZACION_PAQUETES)
+
+    movidas = 0
+    for nombre in list(dict.fromkeys(origen.recorrer())):
+        if nombre.startswith("."):
+            # Temporales: los borra el recolector
+            continue
+        if not destino.en_su_lugar(nombre):
+            _copiar(origen, destino, nombre)
+            movidas += 1
+        _quitar_copias(origen, destino, nombre)
+
+    liberados = origen.compactar()
+    if origen is not destino and origen.carpeta_paquetes.exists():
+        origen.cerrar()
+        shutil.rmtree(origen.carpeta_paquetes)
+    for entrada in os.scandir(destino.carpeta):
+        if entrada.is_dir() and entrada.name != "paquetes":
+            try:
+                # Subcarpetas de partición que quedaron vacías
+                os.rmdir(entrada.path)
+            except OSError:
+                pass
+
+    if portadas is None:
+        from .repositorio import iterar_juegos
+
+        portadas = [juego.get("portada") for juego in iterar_juegos()]
+    faltantes = sorted(
+        {
+            portada
+            for portada in portadas
+            if not destino.existe(nombre_portada(portada) or "")
+        }
+    )
+    return {
+        "ok": not faltantes,
+        "organizacion": destino.ORGANIZACION,
+        "movidas": movidas,
+        "bytes_liberados": liberados,
+        "faltantes": faltantes,
+    }
+
+
+def _copiar(origen, destino, nombre):
+    descriptor, temporal = tempfile.mkstemp(
+        dir=destino.carpeta, prefix=".migracion-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as f, origen.abrir(nombre) as contenido:
+            shutil.copyfileobj(contenido, f)
+            if durabilidad.politica != durabilidad.NUNCA:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(temporal, 0o644)
+        destino.instalar(temporal, nombre)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def _quitar_copias(origen, destino, nombre):
+    """Borra las copias del nombre que no son la que usa ``destino``"""
+    empaquetada = isinstance(destino, AlmacenPaquetes) and destino.empaquetada(nombre)
+    conservar = None if empaquetada else destino.ruta(nombre)
+    for ruta in rutas_posibles(destino.carpeta, nombre):
+        if ruta != conservar and ruta.is_file():
+            os.remove(ruta)
+    if origen is not destino:
+        origen.descartar_empaquetada(nombre)
+
+
+if __name__ == "__main__":
+    resultado = migrar_portadas(*sys.argv[1:2])
+    print(f"Organización: {resultado['organizacion']}")
+    print(f"Portadas movidas: {resultado['movidas']}")
+    print(f"Espacio liberado en paquetes: {resultado['bytes_liberados']} bytes")
+    if resultado["faltantes"]:
+        print("⚠️ Portadas del inventario que no se encuentran:")
+        for portada in resultado["faltantes"]:
+            print(f"   - {portada}")
+    else:
+        print("✓ Todas las portadas del inventario se encuentran")
@@ -8,9 +8,9 @@ def migrar_a_tabla_hash():
 
     print("Iniciando migración a tabla hash...")
 
-    for juego in juegos:
+    for posicion, juego in enumerate(juegos):
         try:
-            tabla_hash.agregar(juego["id"], juego)
+            tabla_hash.agregar(juego["id"], posicion)
             contador += 1
             print(f"✓ Migrado: {juego['nombre']} -> ID: {juego['id']}")
         except Exception as e:
@@ -22,7 +22,7 @@ def migrar_a_tabla_hash():
     print(f"Factor de carga: {stats['factor_carga']:.2f}")
     print(f"Colisiones: {stats['colisiones']}")
     print(f"Longitud máxima de lista: {stats['longitud_maxima']}")
-    print(f"Posiciones ocupadas: {stats['posiciones_ocupadas']}/100")
+    print(f"Posiciones ocupadas: {stats['posiciones_ocupadas']}/{stats['tamano']}")
     print("¡Migración completada!")
 
 
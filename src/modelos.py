@@ -2,11 +2,33 @@
 # la portada se guarda como una ruta hacia carpeta que contiene las imagenes
 # la fecha aunque se ingresa en el formato date se guarda como un string
 import uuid
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 
+CAMPOS = (
+    "id",
+    "nombre",
+    "precio",
+    "cantidad",
+    "compania",
+    "portada",
+    "fecha_publicacion",
+)
 
-@dataclass
+
+@lru_cache(maxsize=65536)
+def _fecha_valida(fecha):
+    # Un catálogo repite muchas fechas: cada texto se parsea una sola vez
+    try:
+        datetime.strptime(fecha, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+# slots: sin __dict__ por instancia, menos memoria en cargas masivas
+@dataclass(slots=True)
 class Videojuego:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     nombre: str = ""
@@ -18,9 +40,7 @@ class Videojuego:
 
     def __post_init__(self):
         # Validar formatos
-        try:
-            datetime.strptime(self.fecha_publicacion, "%Y-%m-%d")
-        except ValueError:
+        if not _fecha_valida(self.fecha_publicacion):
             raise ValueError("La fecha debe tener el formato YYYY-MM-DD")
         if isinstance(self.cantidad, float):
             raise ValueError("La cantidad no puede ser decimal")
@@ -48,4 +68,14 @@ class Videojuego:
             raise ValueError("La cantidad no puede ser menor o igual a 0")
 
     def to_dict(self):
-        return asdict(self)
+        # Todos los campos son escalares: no hace falta la copia profunda
+        # de asdict
+        return {
+            "id": self.id,
+            "nombre": self.nombre,
+            "precio": self.precio,
+            "cantidad": self.cantidad,
+            "compania": self.compania,
+            "portada": self.portada,
+            "fecha_publicacion": self.fecha_publicacion,
+        }
@@ -27,8 +27,15 @@ def limpiar_inventario():
     """Limpia el inventario y la tabla hash para pruebas limpias"""
     try:
         for ruta in [RUTA_INVENTARIO, RUTA_TABLA_HASH]:
-            if ruta.exists():
-                os.remove(ruta)
+            # También los registros de cambios (.log) que acompañan a cada uno
+            for archivo in [ruta, ruta.with_suffix(".log"), ruta.with_suffix(".log.1")]:
+                if archivo.exists():
+                    os.remove(archivo)
+        # Índice binario de la tabla hash: sin borrarlo la prueba arrancaría
+        # consultando la tabla de una corrida anterior
+        indice_binario = RUTA_TABLA_HASH.with_suffix(".idx")
+        if indice_binario.exists():
+            os.remove(indice_binario)
         print("✅ Inventario y tabla hash limpiados")
     except Exception as e:
         print(f"⚠️  Advertencia al limpiar: {e}")
@@ -221,7 +228,7 @@ def test_estadisticas_tabla_hash():
     print(f"   • Colisiones: {stats['colisiones']}")
     print(f"   • Factor de carga: {stats['factor_carga']:.2f}")
     print(f"   • Longitud máxima: {stats['longitud_maxima']}")
-    print(f"   • Posiciones ocupadas: {stats['posiciones_ocupadas']}/100")
+    print(f"   • Posiciones ocupadas: {stats['posiciones_ocupadas']}/{stats['tamano']}")
 
     # Verificar que tenemos estadísticas válidas
     assert stats["total_elementos"] >= 0
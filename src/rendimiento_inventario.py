@@ -0,0 +1,63 @@
+# Memoria del inventario en memoria: lista de dicts frente a columnas
+# uso: python -m src.rendimiento_inventario [filas]
+import resource
+import subprocess
+import sys
+
+from .inventario_columnar import InventarioColumnar
+
+FILAS_POR_DEFECTO = 1_000_000
+
+
+def generar_juegos(filas):
+    """Juegos como los que devuelve json.load: objetos nuevos por fila"""
+    for i in range(filas):
+        yield {
+            "id": f"{i:08x}-4b2e-4f6a-9c1d-{i:012x}",
+            "nombre": f"Juego {i % 50_000}",
+            "precio": float(10 + i % 50),
+            "cantidad": 1 + i % 20,
+            "compania": f"Compañía {i % 300}",
+            "portada": f"imagenes/portadas/{i % 5_000:040x}.png",
+            "fecha_publicacion": f"20{i % 25:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        }
+
+
+def rss_mb():
+    # ru_maxrss está en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir(modo, filas):
+    antes = rss_mb()
+    if modo == "dicts":
+        inventario = list(generar_juegos(filas))
+    else:
+        inventario = InventarioColumnar(generar_juegos(filas))
+    assert len(inventario) == filas
+    return rss_mb() - antes
+
+
+def ejecutar(filas):
+    print(f"🚀 MEMORIA DEL INVENTARIO: {filas:,} FILAS")
+    print("=" * 44)
+    resultados = {}
+    for modo in ("dicts", "columnas"):
+        # Cada medición en su propio proceso para que el RSS no se mezcle
+        salida = subprocess.run(
+            [sys.executable, "-m", __spec__.name, str(filas), modo],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        resultados[modo] = float(salida.stdout)
+        print(f"{modo:<12}{resultados[modo]:>12.0f} MB RSS")
+    print(f"{'reducción':<12}{1 - resultados['columnas'] / resultados['dicts']:>15.0%}")
+
+
+if __name__ == "__main__":
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else FILAS_POR_DEFECTO
+    if len(sys.argv) > 2:
+        print(medir(sys.argv[2], filas))
+    else:
+        ejecutar(filas)
@@ -0,0 +1,99 @@
+# Benchmark de construcción y conversión de Videojuego
+# uso: python -m src.rendimiento_modelos [cantidad]
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from .modelos import Videojuego
+
+CANTIDAD_POR_DEFECTO = 1_000_000
+
+
+@dataclass
+class VideojuegoOriginal:
+    """Modelo anterior como referencia: sin slots, strptime y asdict"""
+
+    id: str = ""
+    nombre: str = ""
+    precio: float = 0.0
+    cantidad: int = 0
+    compania: str = ""
+    portada: str = ""
+    fecha_publicacion: str = ""
+
+    def __post_init__(self):
+        datetime.strptime(self.fecha_publicacion, "%Y-%m-%d")
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def generar_datos(cantidad):
+    # Unas 9.000 fechas distintas, repetidas como en un catálogo real
+    return [
+        {
+            "id": f"id-{i}",
+            "nombre": f"Juego {i}",
+            "precio": 10.0 + i % 50,
+            "cantidad": 1 + i % 20,
+            "compania": "Nintendo",
+            "portada": "imagenes/portadas/portada.png",
+            "fecha_publicacion": f"20{i % 25:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        }
+        for i in range(cantidad)
+    ]
+
+
+def medir(nombre, cantidad, funcion):
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<34}{segundos:>9.2f}{cantidad / segundos:>14,.0f}")
+
+
+def bytes_por_objeto(crear, datos):
+    """Memoria retenida por objeto al mantener vivos todos los creados"""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [crear(d) for d in datos]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Se descuenta la lista que los contiene
+    return (despues - antes) / len(objetos) - 8
+
+
+def medir_conversion(nombre, juegos):
+    medir(nombre, len(juegos), lambda: [j.to_dict() for j in juegos])
+
+
+def ejecutar(cantidad):
+    datos = generar_datos(cantidad)
+
+    print(f"🚀 MODELO VIDEOJUEGO: {cantidad:,} OBJETOS")
+    print("=" * 57)
+    print(f"{'operación':<34}{'segundos':>9}{'objetos/s':>14}")
+    medir(
+        "construir (original)",
+        cantidad,
+        lambda: [VideojuegoOriginal(**d) for d in datos],
+    )
+    medir(
+        "construir (slots, validado)",
+        cantidad,
+        lambda: [Videojuego(**d) for d in datos],
+    )
+    medir_conversion("to_dict (asdict)", [VideojuegoOriginal(**d) for d in datos])
+    medir_conversion("to_dict (directo)", [Videojuego(**d) for d in datos])
+
+    muestra = datos[: min(cantidad, 100_000)]
+    original = bytes_por_objeto(lambda d: VideojuegoOriginal(**d), muestra)
+    slots = bytes_por_objeto(lambda d: Videojuego(**d), muestra)
+    print()
+    print(f"bytes por objeto (original): {original:>6.0f}")
+    print(f"bytes por objeto (slots):    {slots:>6.0f}")
+
+
+if __name__ == "__main__":
+    ejecutar(int(sys.argv[1]) if len(sys.argv) > 1 else CANTIDAD_POR_DEFECTO)
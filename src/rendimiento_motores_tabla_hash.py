@@ -0,0 +1,84 @@
+# Benchmark de los motores de la tabla hash: encadenado frente a abierto
+# uso: python -m src.rendimiento_motores_tabla_hash [cantidades...]
+# Mide solo las operaciones en memoria (_insertar/_quitar), sin el log
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from .rendimiento_tabla_hash import MUESTRA_BUSQUEDAS, generar_uuids
+from .tabla_hash import MOTOR_ABIERTO, MOTOR_ENCADENADO, crear_tabla_hash
+
+CANTIDADES_POR_DEFECTO = [100_000, 1_000_000]
+MUESTRA_MEMORIA = 100_000
+
+
+def ns_por_operacion(funcion, elementos):
+    inicio = time.perf_counter_ns()
+    for elemento in elementos:
+        funcion(elemento)
+    return (time.perf_counter_ns() - inicio) / len(elementos)
+
+
+def construir(motor, ids, carpeta):
+    tabla = crear_tabla_hash(
+        archivo_indice=Path(carpeta) / f"{motor}.json", motor=motor
+    )
+    for posicion, id_juego in enumerate(ids):
+        tabla._insertar(id_juego, posicion)
+    tabla._paso_rehash(limite=None)
+    return tabla
+
+
+def bytes_por_id(motor, ids, carpeta):
+    """Memoria de la tabla por ID (los IDs ya existían y no cuentan)
+
+    tracemalloc hace lenta la inserción: se mide sobre una muestra.
+    """
+    ids = ids[:MUESTRA_MEMORIA]
+    tracemalloc.start()
+    tabla = construir(motor, ids, carpeta)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tabla
+    return memoria / len(ids)
+
+
+def medir_motor(motor, ids, carpeta):
+    muestra = random.Random(len(ids)).sample(ids, min(MUESTRA_BUSQUEDAS, len(ids)))
+    memoria = bytes_por_id(motor, ids, carpeta)
+
+    inicio = time.perf_counter_ns()
+    tabla = construir(motor, ids, carpeta)
+    ns_insercion = (time.perf_counter_ns() - inicio) / len(ids)
+
+    ns_busqueda = ns_por_operacion(tabla.buscar_posicion, muestra)
+    ns_fallida = ns_por_operacion(tabla.buscar_posicion, [f"x{i}" for i in muestra])
+    ns_borrado = ns_por_operacion(tabla._quitar, muestra)
+    return ns_insercion, ns_busqueda, ns_fallida, ns_borrado, memoria
+
+
+def ejecutar(cantidades):
+    print("🚀 MOTORES DE LA TABLA HASH")
+    print("=" * 78)
+    print(
+        f"{'motor':<12}{'elementos':>11}{'ns/inserción':>14}{'ns/búsq.':>10}"
+        f"{'ns/fallida':>12}{'ns/borrado':>12}{'bytes/ID':>10}"
+    )
+    with tempfile.TemporaryDirectory() as carpeta:
+        for cantidad in cantidades:
+            ids = generar_uuids(cantidad)
+            for motor in (MOTOR_ENCADENADO, MOTOR_ABIERTO):
+                resultado = medir_motor(motor, ids, carpeta)
+                print(
+                    f"{motor:<12}{cantidad:>11,}{resultado[0]:>14.0f}"
+                    f"{resultado[1]:>10.0f}{resultado[2]:>12.0f}"
+                    f"{resultado[3]:>12.0f}{resultado[4]:>10.0f}"
+                )
+
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:]]
+    ejecutar(argumentos or CANTIDADES_POR_DEFECTO)
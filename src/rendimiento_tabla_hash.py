@@ -0,0 +1,93 @@
+# Benchmark de distribución de las funciones hash de la tabla de índices
+# uso: python -m src.rendimiento_tabla_hash [cantidades...]
+import random
+import sys
+import time
+import uuid
+
+from .config import FACTOR_CARGA_MAXIMO
+from .tabla_hash import FUNCIONES_HASH, NodoHash
+
+CANTIDADES_POR_DEFECTO = [1_000, 100_000, 1_000_000]
+# Búsquedas cronometradas por caso (se toman de los IDs insertados)
+MUESTRA_BUSQUEDAS = 100_000
+
+
+def generar_uuids(cantidad, semilla=1234):
+    """Genera UUID4 sintéticos reproducibles"""
+    generador = random.Random(semilla)
+    return [
+        str(uuid.UUID(int=generador.getrandbits(128), version=4))
+        for _ in range(cantidad)
+    ]
+
+
+def tamano_para(cantidad, tamano_inicial=100):
+    """Tamaño al que llegaría TablaHash creciendo por factor de carga"""
+    tamano = tamano_inicial
+    while cantidad / tamano > FACTOR_CARGA_MAXIMO:
+        tamano *= 2
+    return tamano
+
+
+def construir_cubetas(funcion, ids, tamano):
+    """Arma las listas enlazadas igual que TablaHash, sin tocar disco"""
+    tabla = [None] * tamano
+    for posicion, id_juego in enumerate(ids):
+        indice = funcion(id_juego) % tamano
+        nodo = NodoHash(id_juego, posicion)
+        nodo.siguiente = tabla[indice]
+        tabla[indice] = nodo
+    return tabla
+
+
+def longitudes(tabla):
+    resultado = []
+    for nodo in tabla:
+        longitud = 0
+        while nodo is not None:
+            longitud += 1
+            nodo = nodo.siguiente
+        resultado.append(longitud)
+    return resultado
+
+
+def medir_busquedas(funcion, tabla, ids):
+    """ns por búsqueda, recorriendo la lista como buscar_posicion"""
+    tamano = len(tabla)
+    inicio = time.perf_counter_ns()
+    for id_juego in ids:
+        actual = tabla[funcion(id_juego) % tamano]
+        while actual is not None and actual.id_juego != id_juego:
+            actual = actual.siguiente
+    return (time.perf_counter_ns() - inicio) / len(ids)
+
+
+def ejecutar(cantidades):
+    print("🚀 DISTRIBUCIÓN DE FUNCIONES HASH")
+    print("=" * 78)
+    print(
+        f"{'función':<16}{'elementos':>11}{'tamaño':>10}{'ocupadas':>11}"
+        f"{'máx. lista':>12}{'prom. lista':>12}{'ns/búsq.':>10}"
+    )
+
+    for cantidad in cantidades:
+        ids = generar_uuids(cantidad)
+        tamano = tamano_para(cantidad)
+        muestra = random.Random(cantidad).sample(ids, min(MUESTRA_BUSQUEDAS, cantidad))
+
+        for version, funcion in FUNCIONES_HASH.items():
+            tabla = construir_cubetas(funcion, ids, tamano)
+            ocupadas = [n for n in longitudes(tabla) if n]
+            ns_por_busqueda = medir_busquedas(funcion, tabla, muestra)
+
+            print(
+                f"{version:<16}{cantidad:>11,}{tamano:>10,}"
+                f"{len(ocupadas) / tamano:>10.1%} {max(ocupadas):>11}"
+                f"{sum(ocupadas) / len(ocupadas):>12.2f}{ns_por_busqueda:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:]]
+    ejecutar(argumentos or CANTIDADES_POR_DEFECTO)
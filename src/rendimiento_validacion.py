@@ -0,0 +1,62 @@
+# Benchmark de la validación de importaciones según el número de procesos
+# uso: python -m src.rendimiento_validacion [cantidad] [procesos...]
+import os
+import sys
+import time
+import uuid
+
+from .validacion_importacion import validar_juegos
+
+CANTIDAD_POR_DEFECTO = 200_000
+
+
+def generar_juegos(cantidad):
+    """Juegos sintéticos válidos, como los de un volcado de distribuidor"""
+    return [
+        {
+            "id": str(uuid.UUID(int=i, version=4)),
+            "nombre": f"Juego {i}",
+            "precio": 10.0 + i % 50,
+            "cantidad": 1 + i % 20,
+            "compania": f"Compañía {i % 300}",
+            "portada": "imagenes/portadas/portada.png",
+            "fecha_publicacion": f"20{i % 25:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        }
+        for i in range(cantidad)
+    ]
+
+
+def procesos_por_defecto():
+    """1, 2, 4, ... hasta el número de núcleos"""
+    nucleos = os.cpu_count() or 1
+    procesos = [1]
+    while procesos[-1] * 2 <= nucleos:
+        procesos.append(procesos[-1] * 2)
+    if procesos[-1] != nucleos:
+        procesos.append(nucleos)
+    return procesos
+
+
+def ejecutar(cantidad, lista_procesos):
+    juegos = generar_juegos(cantidad)
+    print(f"🚀 VALIDACIÓN DE {cantidad:,} JUEGOS ({os.cpu_count()} núcleos)")
+    print("=" * 52)
+    print(f"{'procesos':>10}{'segundos':>12}{'juegos/s':>14}{'aceleración':>14}")
+
+    base = None
+    for procesos in lista_procesos:
+        inicio = time.perf_counter()
+        errores = validar_juegos(juegos, procesos=procesos)
+        segundos = time.perf_counter() - inicio
+        assert not errores, errores[:3]
+        base = base or segundos
+        print(
+            f"{procesos:>10}{segundos:>12.2f}{cantidad / segundos:>14,.0f}"
+            f"{base / segundos:>13.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else CANTIDAD_POR_DEFECTO
+    procesos = [int(p) for p in sys.argv[2:]] or procesos_por_defecto()
+    ejecutar(cantidad, procesos)
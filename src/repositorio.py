@@ -1,14 +1,176 @@
+import io
 import json
 import os
 import shutil
-from datetime import datetime
+import textwrap
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
 from typing import Any, Dict
 
-from .config import RUTA_INVENTARIO, BASE_DIR
-from .tabla_hash import TablaHash
+from . import durabilidad, lector_json
+from .config import (
+    BASE_DIR,
+    JOURNAL_INVENTARIO,
+    RUTA_INVENTARIO,
+    UMBRAL_CHECKPOINT_INVENTARIO,
+)
+from .coordinador_commits import CoordinadorCommits
+from .indice_binario import huella_ids
+from .indice_ordenado import IndiceOrdenado
+from .indice_portadas import IndicePortadas
+from .inventario_columnar import InventarioColumnar
+from .indice_trigramas import IndiceTrigramas, normalizar
+from .tabla_hash import crear_tabla_hash
+from .validacion_importacion import ValidadorImportacion
 
 ruta_archivo = RUTA_INVENTARIO
-tabla_hash = TablaHash(tamano=100)
+tabla_hash = crear_tabla_hash(tamano=100)
+
+# Caché del inventario ya parseado. Es válida mientras el archivo y su
+# journal conserven la misma firma (ruta, mtime, tamaño) y nadie haya escrito
+# desde este proceso (contador de generación). La generación también es la
+# versión de los datos que ven las cachés de la interfaz (ver version_datos).
+# Mientras un checkpoint propio escribe el archivo su firma cambia sin que
+# cambien los datos: entonces la caché vale sin comparar la firma.
+_lock_cache = threading.Lock()
+_cache_inventario = None
+_generacion = 0
+_checkpoint_en_curso = False
+
+# Índices secundarios en memoria. Se construyen sobre una lista concreta del
+# inventario y se mantienen al aplicar cada cambio; si la caché pasa a otra
+# lista (recarga desde disco o importación) se reconstruyen.
+_indice_nombres = IndiceTrigramas()
+_indice_companias = IndiceOrdenado(lambda juego: normalizar(juego["compania"]))
+# Vista del catálogo ordenada por nombre, mantenida con cada alta y baja
+_orden_por_nombre = IndiceOrdenado(lambda juego: juego["nombre"].lower())
+
+
+def ordinal_fecha(fecha):
+    """Fecha (date o texto YYYY-MM-DD) como número de día comparable"""
+    if isinstance(fecha, str):
+        fecha = date.fromisoformat(fecha)
+    return fecha.toordinal()
+
+
+def _clave_precio(juego):
+    precio = juego.get("precio")
+    if isinstance(precio, bool) or not isinstance(precio, (int, float)):
+        return None
+    return float(precio)
+
+
+def _clave_fecha(juego):
+    try:
+        return ordinal_fecha(juego.get("fecha_publicacion"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+# Índices de rango: precio y fecha de publicación (como ordinal)
+_indice_precios = IndiceOrdenado(_clave_precio)
+_indice_fechas = IndiceOrdenado(_clave_fecha)
+# Referencias de cada archivo de portada (nombre -> IDs de juegos)
+_indice_portadas = IndicePortadas()
+_indices_secundarios = [
+    _indice_nombres,
+    _indice_companias,
+    _orden_por_nombre,
+    _indice_precios,
+    _indice_fechas,
+    _indice_portadas,
+]
+_inventario_indexado = None
+
+# Tabla hash cuya huella ya se comparó con el inventario leído de disco
+_tabla_verificada = None
+
+# Escrituras al journal y checkpoints del inventario. Orden de los locks:
+# _lock_escritura y luego _lock_checkpoint; quien tiene _lock_checkpoint ya no
+# necesita _lock_escritura mientras escribe el checkpoint.
+_lock_escritura = threading.RLock()
+_lock_checkpoint = threading.RLock()
+_hilo_checkpoint = None
+
+# Escrituras acumuladas por el group commit en curso (None fuera de un grupo)
+_journal_pendiente = None
+_inventario_pendiente = None
+
+
+def _ruta_journal():
+    return Path(ruta_archivo).with_suffix(".log")
+
+
+def _ruta_journal_anterior():
+    """Journal apartado por un checkpoint que todavía no termina"""
+    return Path(ruta_archivo).with_suffix(".log.1")
+
+
+def _firma_archivo():
+    firma = [str(ruta_archivo)]
+    for ruta in (ruta_archivo, _ruta_journal_anterior(), _ruta_journal()):
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            if ruta == ruta_archivo:
+                raise
+            firma.append(None)
+        else:
+            firma.append((estado.st_mtime_ns, estado.st_size))
+    return tuple(firma)
+
+
+def _actualizar_cache(inventario):
+    """Deja ``inventario`` como caché vigente tras una escritura propia"""
+    global _cache_inventario, _generacion
+    with _lock_cache:
+        _generacion += 1
+        _cache_inventario = (_firma_archivo(), _generacion, inventario)
+
+
+def _refrescar_firma(inventario):
+    """Anota la firma actual de los archivos si ``inventario`` es la caché
+
+    Para cambios de archivos propios que no cambian los datos (el
+    checkpoint): no suben la generación ni se toman por un cambio externo.
+    """
+    global _cache_inventario
+    with _lock_cache:
+        if _cache_inventario is not None and _cache_inventario[2] is inventario:
+            _cache_inventario = (_firma_archivo(), _cache_inventario[1], inventario)
+
+
+def _invalidar_cache():
+    """Descarta la caché para releer el inventario instalado en disco"""
+    global _cache_inventario, _generacion
+    with _lock_cache:
+        _generacion += 1
+        _cache_inventario = None
+
+
+def version_datos():
+    """Versión de los datos: cambia con cada cambio del inventario o su índice
+
+    La suben las escrituras de este proceso y también un cambio del archivo
+    hecho desde fuera, que se detecta por su firma (solo os.stat, sin leer
+    nada). Sirve de clave para cachear lecturas.
+    """
+    global _cache_inventario, _generacion
+    try:
+        firma = _firma_archivo()
+    except FileNotFoundError:
+        firma = None
+    with _lock_cache:
+        if (
+            _cache_inventario is not None
+            and not _checkpoint_en_curso
+            and _cache_inventario[0] != firma
+        ):
+            _generacion += 1
+            _cache_inventario = None
+        return _generacion
 
 
 def inicializar_inventario():
@@ -20,29 +182,374 @@ def inicializar_inventario():
 
 
 def obtener_inventario():
-    inicializar_inventario()
-    with open(ruta_archivo, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Devuelve el inventario; solo se relee si el archivo cambió en disco
+
+    Al releer se parte del último checkpoint (inventario.json) y se
+    reproducen encima los cambios del journal. El checkpoint lo escribe la
+    aplicación: se decodifica por bloques enteros (leer_bloques_arreglo, no
+    el lector elemento a elemento de las importaciones) directamente a un
+    InventarioColumnar; solo los dicts de un bloque están en memoria a la vez.
+    """
+    global _cache_inventario
+    try:
+        firma = _firma_archivo()
+    except FileNotFoundError:
+        inicializar_inventario()
+        firma = _firma_archivo()
+
+    vigente = _cache_vigente(firma)
+    if vigente is not None:
+        return vigente
+
+    # Con _lock_checkpoint ningún checkpoint borra el journal apartado ni
+    # instala el archivo mientras se lee
+    with _lock_escritura, _lock_checkpoint:
+        # Otro hilo pudo releer (o empezar un checkpoint) mientras se esperaba
+        firma = _firma_archivo()
+        vigente = _cache_vigente(firma)
+        if vigente is not None:
+            return vigente
+        generacion = _generacion
+        inventario = InventarioColumnar()
+        with open(ruta_archivo, "r", encoding="utf-8") as f:
+            for juegos in lector_json.leer_bloques_arreglo(f):
+                inventario.extend(juegos)
+
+        ids = None
+        for ruta in (_ruta_journal_anterior(), _ruta_journal()):
+            try:
+                journal = open(ruta, "r", encoding="utf-8")
+            except FileNotFoundError:
+                # Sin cambios pendientes en ese journal
+                continue
+            with journal:
+                if ids is None:
+                    ids = set(inventario.ids)
+                _reproducir_journal(inventario, journal, ids)
+        _verificar_tabla_hash(inventario)
+
+    with _lock_cache:
+        _cache_inventario = (firma, generacion, inventario)
+    return inventario
+
+
+def _cache_vigente(firma):
+    """Inventario de la caché si sigue valiendo para ``firma``, o None"""
+    with _lock_cache:
+        cache = _cache_inventario
+        if cache is None or cache[1] != _generacion:
+            return None
+        if _checkpoint_en_curso or cache[0] == firma:
+            return cache[2]
+    return None
+
+
+def _verificar_tabla_hash(inventario):
+    """Reconstruye la tabla hash si su huella no es la del inventario
+
+    Se comprueba una vez por tabla, la primera vez que se lee el inventario:
+    con el índice binario al día la huella sale de su cabecera.
+    """
+    global _tabla_verificada
+    if _tabla_verificada is tabla_hash:
+        return
+    _tabla_verificada = tabla_hash
+    if tabla_hash.huella() != huella_ids(inventario.ids):
+        print("⚠️ La tabla hash no corresponde al inventario: se reconstruye")
+        tabla_hash.reconstruir(
+            (id_juego, i)
+            for i, id_juego in enumerate(inventario.ids)
+            if id_juego is not None
+        )
+
+
+def _inventario_con_indices():
+    """Inventario vigente con los índices secundarios al día"""
+    global _inventario_indexado
+    inventario = obtener_inventario()
+    if inventario is not _inventario_indexado:
+        with _lock_escritura:
+            for indice in _indices_secundarios:
+                indice.construir(inventario)
+            _inventario_indexado = inventario
+    return inventario
+
+
+def _aplicar_cambio(inventario, registro, ids=None):
+    """Aplica un registro del journal sobre la lista del inventario
+
+    Con ``ids`` (al reproducir) los registros ya incluidos en el checkpoint
+    se ignoran, así reproducir dos veces el mismo journal no duplica juegos.
+    """
+    if registro["op"] == "agregar":
+        juego = registro["juego"]
+        if ids is not None:
+            if juego["id"] in ids:
+                return
+            ids.add(juego["id"])
+        inventario.append(juego)
+        if inventario is _inventario_indexado:
+            for indice in _indices_secundarios:
+                indice.agregar(juego)
+
+    elif registro["op"] == "eliminar":
+        id_juego = registro["id"]
+        if ids is not None:
+            if id_juego not in ids:
+                return
+            ids.discard(id_juego)
+
+        posicion = registro["pos"]
+        if posicion >= len(inventario) or inventario.id_en(posicion) != id_juego:
+            posicion = inventario.ids.index(id_juego)
+        # El último elemento ocupa el hueco del eliminado
+        inventario[posicion] = inventario[-1]
+        inventario.pop()
+        if inventario is _inventario_indexado:
+            for indice in _indices_secundarios:
+                indice.eliminar(id_juego)
+
+
+def _reproducir_journal(inventario, journal, ids):
+    """Aplica las líneas del journal abierto ``journal``"""
+    for linea in journal:
+        try:
+            registro = json.loads(linea)
+        except json.JSONDecodeError:
+            # Línea incompleta por una escritura interrumpida
+            continue
+        _aplicar_cambio(inventario, registro, ids)
+
+
+def _registrar_cambio(inventario, registro):
+    """Aplica un cambio al inventario y lo persiste
+
+    Con el journal activo solo se añade el registro (coste O(tamaño del
+    registro)); sin él se reescribe el inventario completo.
+    """
+    _registrar_cambios(inventario, [registro])
+
+
+def _registrar_cambios(inventario, registros):
+    """Igual que _registrar_cambio para varios registros, en una escritura
+
+    Dentro de un group commit solo se aplica en memoria; la escritura la hace
+    ``_grupo_escrituras`` al cerrar el grupo.
+    """
+    global _inventario_pendiente
+    lineas = [
+        json.dumps(registro, separators=(",", ":"), ensure_ascii=False) + "\n"
+        for registro in registros
+    ]
+
+    with _lock_escritura:
+        if _journal_pendiente is not None:
+            _journal_pendiente.extend(lineas)
+            for registro in registros:
+                _aplicar_cambio(inventario, registro)
+            _inventario_pendiente = inventario
+            return
+
+    if not JOURNAL_INVENTARIO:
+        for registro in registros:
+            _aplicar_cambio(inventario, registro)
+        guardar_inventario(inventario)
+        return
+
+    with _lock_escritura:
+        # Primero el journal y después la memoria (write-ahead)
+        tamano_journal = _escribir_journal("".join(lineas))
+        for registro in registros:
+            _aplicar_cambio(inventario, registro)
+        _actualizar_cache(inventario)
+
+    if tamano_journal >= UMBRAL_CHECKPOINT_INVENTARIO:
+        checkpoint_inventario()
+
+
+def _escribir_journal(lineas):
+    """Añade líneas al journal y devuelve su tamaño resultante"""
+    with open(_ruta_journal(), "a", encoding="utf-8") as f:
+        f.write(lineas)
+        durabilidad.sincronizar(f)
+        return f.tell()
+
+
+@contextmanager
+def _grupo_escrituras():
+    """Contexto de cada group commit
+
+    Las operaciones del grupo se aplican en memoria y al salir se escribe
+    una sola vez el journal (o el inventario completo si no hay journal) y el
+    log de la tabla hash.
+    """
+    global _journal_pendiente, _inventario_pendiente
+    tamano_journal = 0
+    with _lock_escritura, tabla_hash.lote():
+        _journal_pendiente = []
+        _inventario_pendiente = None
+        try:
+            yield
+        finally:
+            lineas, inventario = _journal_pendiente, _inventario_pendiente
+            _journal_pendiente = None
+            _inventario_pendiente = None
+
+            if inventario is not None and not JOURNAL_INVENTARIO:
+                guardar_inventario(inventario)
+            elif inventario is not None:
+                if lineas:
+                    tamano_journal = _escribir_journal("".join(lineas))
+                _actualizar_cache(inventario)
+
+    if tamano_journal >= UMBRAL_CHECKPOINT_INVENTARIO:
+        checkpoint_inventario()
+
+
+coordinador_commits = CoordinadorCommits(_grupo_escrituras)
+
+
+def _escribir_checkpoint(inventario):
+    durabilidad.reemplazar_archivo(
+        ruta_archivo, lambda f: _volcar_juegos(f, inventario)
+    )
+
+
+def _volcar_juegos(destino, juegos):
+    """Escribe los juegos como json.dump(juegos, indent=4), de a uno
+
+    Solo se arma el dict del juego que se está escribiendo.
+    """
+    destino.write("[")
+    vacio = True
+    for juego in juegos:
+        destino.write("\n" if vacio else ",\n")
+        texto = json.dumps(juego, indent=4, ensure_ascii=False)
+        destino.write(textwrap.indent(texto, "    "))
+        vacio = False
+    destino.write("]" if vacio else "\n]")
 
 
 def guardar_inventario(inventario):
-    with open(ruta_archivo, "w", encoding="utf-8") as f:
-        json.dump(inventario, f, indent=4, ensure_ascii=False)
+    """Escribe el inventario completo y vacía el journal"""
+    if not isinstance(inventario, InventarioColumnar):
+        inventario = InventarioColumnar(inventario)
+    with _lock_escritura, _lock_checkpoint:
+        _escribir_checkpoint(inventario)
+        _descartar_journal()
+
+        # Lo recién escrito pasa a ser la caché, sin volver a leer el archivo
+        _actualizar_cache(inventario)
+
+
+def _descartar_journal():
+    """Borra el journal tras instalar un inventario completo"""
+    for ruta in (_ruta_journal_anterior(), _ruta_journal()):
+        if ruta.exists():
+            os.remove(ruta)
+    if _journal_pendiente is not None:
+        # Lo acumulado en el grupo en curso ya queda en el archivo
+        _journal_pendiente.clear()
+
+
+def _hacer_checkpoint():
+    global _checkpoint_en_curso
+    with _lock_escritura:
+        _lock_checkpoint.acquire()
+        try:
+            inventario = obtener_inventario()
+            # Se aparta el journal: lo nuevo va a uno vacío mientras se escribe
+            journal, anterior = _ruta_journal(), _ruta_journal_anterior()
+            if journal.exists():
+                if anterior.exists():
+                    with open(journal, "r", encoding="utf-8") as origen:
+                        with open(anterior, "a", encoding="utf-8") as destino:
+                            destino.write(origen.read())
+                    os.remove(journal)
+                else:
+                    os.replace(journal, anterior)
+            copia = inventario.copy()
+            # Las escrituras siguientes van sobre ``inventario`` (la caché) y
+            # el journal nuevo; los lectores no releen hasta terminar
+            with _lock_cache:
+                _checkpoint_en_curso = True
+            _refrescar_firma(inventario)
+        except BaseException:
+            _lock_checkpoint.release()
+            raise
+
+    try:
+        _escribir_checkpoint(copia)
+
+        # El checkpoint ya incluye lo que había en el journal apartado
+        if anterior.exists():
+            os.remove(anterior)
+    finally:
+        # Si la caché pasó a otra lista (importación) no se toca
+        _refrescar_firma(inventario)
+        with _lock_cache:
+            _checkpoint_en_curso = False
+        _lock_checkpoint.release()
+
+
+def checkpoint_inventario(esperar=False):
+    """Vuelca el journal sobre inventario.json en un hilo en segundo plano
+
+    Con ``esperar`` se hace en el hilo actual y al volver el archivo ya
+    incluye todos los cambios registrados hasta ese momento.
+    """
+    global _hilo_checkpoint
+    if esperar:
+        _hacer_checkpoint()
+        return
+
+    hilo = _hilo_checkpoint
+    if hilo is None or not hilo.is_alive():
+        hilo = threading.Thread(
+            target=_hacer_checkpoint, name="checkpoint-inventario", daemon=True
+        )
+        _hilo_checkpoint = hilo
+        hilo.start()
 
 
-# se modifico el codigo de agregar
 def agregar_juego(juego):
+    """Agrega un juego; vuelve cuando su group commit está confirmado"""
+    coordinador_commits.ejecutar(lambda: _agregar_juego(juego))
+
+
+def agregar_juegos_lote(juegos):
+    """Agrega varios juegos con una sola escritura del inventario y del índice"""
+    coordinador_commits.ejecutar(lambda: _agregar_juegos_lote(juegos))
+
+
+def eliminar_juego_por_id(id):
+    """Elimina un juego; vuelve cuando su group commit está confirmado"""
+    return coordinador_commits.ejecutar(lambda: _eliminar_juego_por_id(id))
+
+
+# se modifico el codigo de agregar
+def _agregar_juego(juego):
     inventario = obtener_inventario()
 
     # Agregar al final de la lista
     posicion = len(inventario)  # Posición donde se insertará
-    inventario.append(juego)
-    guardar_inventario(inventario)
+    _registrar_cambio(inventario, {"op": "agregar", "juego": juego})
 
     # Agregar a la tabla hash con la posición
     tabla_hash.agregar(juego["id"], posicion)
 
 
+def _agregar_juegos_lote(juegos):
+    inventario = obtener_inventario()
+
+    posicion_inicial = len(inventario)
+    _registrar_cambios(inventario, [{"op": "agregar", "juego": j} for j in juegos])
+
+    tabla_hash.agregar_lote(
+        (juego["id"], posicion_inicial + i) for i, juego in enumerate(juegos)
+    )
+
+
 # se modifico
 def buscar_por_id(id):
     # Buscar posición en la tabla hash O(1)
@@ -54,7 +561,7 @@ def buscar_por_id(id):
     # Acceso directo al inventario O(1)
     inventario = obtener_inventario()
 
-    if posicion < len(inventario) and inventario[posicion]["id"] == id:
+    if posicion < len(inventario) and inventario.id_en(posicion) == id:
         return inventario[posicion]
 
     # Si hay inconsistencia, buscar linealmente y reconstruir índice
@@ -62,7 +569,7 @@ def buscar_por_id(id):
 
 
 # se modifico
-def eliminar_juego_por_id(id):
+def _eliminar_juego_por_id(id):
     """Elimina un juego usando la tabla hash como índice"""
     # Buscar posición usando tabla hash O(1)
     posicion = tabla_hash.buscar_posicion(id)
@@ -73,27 +580,19 @@ def eliminar_juego_por_id(id):
     inventario = obtener_inventario()
 
     # Verificar consistencia
-    if posicion >= len(inventario) or inventario[posicion]["id"] != id:
+    if posicion >= len(inventario) or inventario.id_en(posicion) != id:
         return buscar_lineal_y_eliminar(id)
 
-    # ELIMINACIÓN OPTIMIZADA con actualización de índices
+    # ELIMINACIÓN OPTIMIZADA con actualización de índices: el último
+    # elemento pasa a ocupar la posición del eliminado
     ultima_posicion = len(inventario) - 1
+    _registrar_cambio(inventario, {"op": "eliminar", "id": id, "pos": posicion})
 
     if posicion != ultima_posicion:
-        # Intercambiar con el último elemento
-        inventario[posicion], inventario[ultima_posicion] = (
-            inventario[ultima_posicion],
-            inventario[posicion],
-        )
-
         # Actualizar la posición del elemento movido en la tabla hash
-        id_movido = inventario[posicion]["id"]
+        id_movido = inventario.id_en(posicion)
         tabla_hash.actualizar_posicion(id_movido, posicion)
 
-    # Eliminar el último elemento
-    inventario.pop()
-    guardar_inventario(inventario)
-
     # Eliminar el ID de la tabla hash
     tabla_hash.eliminar(id)
 
@@ -106,24 +605,26 @@ def buscar_lineal_y_reconstruir(id):
     """Búsqueda lineal y reconstrucción del índice en caso de inconsistencia"""
     inventario = obtener_inventario()
 
-    for i, juego in enumerate(inventario):
-        if juego["id"] == id:
+    for i, id_juego in enumerate(inventario.ids):
+        if id_juego == id:
             # Reconstruir la posición en la tabla hash
             tabla_hash.agregar(id, i)
-            return juego
+            return inventario[i]
 
     return None
 
 
 def buscar_lineal_y_eliminar(id):
     """Eliminación lineal y reconstrucción del índice"""
+    global _inventario_indexado
     inventario = obtener_inventario()
 
     for i in range(len(inventario)):
-        if inventario[i]["id"] == id:
+        if inventario.id_en(i) == id:
             # Eliminar y actualizar índices para elementos posteriores
             inventario.pop(i)
             guardar_inventario(inventario)
+            _inventario_indexado = None
 
             # Reconstruir tabla hash completa
             reconstruir_tabla_hash_completa()
@@ -137,48 +638,173 @@ def buscar_lineal_y_eliminar(id):
 
 def reconstruir_tabla_hash_completa():
     """Reconstruye toda la tabla hash desde el inventario"""
-    global tabla_hash
-    tabla_hash = TablaHash(tamano=100)
-
     inventario = obtener_inventario()
-    for i, juego in enumerate(inventario):
-        tabla_hash.agregar(juego["id"], i)
+    tabla_hash.reconstruir((id_juego, i) for i, id_juego in enumerate(inventario.ids))
+    # Los datos son los mismos, pero las estadísticas del índice no
+    _actualizar_cache(inventario)
 
 
 def listar_juegos():
     if not os.path.exists(ruta_archivo):
         return []
     try:
-        data = obtener_inventario()
-        if not isinstance(data, list):
-            raise ValueError(
-                "El archivo JSON no tiene el formato correcto "
-                "(se esperaba una lista)."
-            )
-        return data
-    except json.JSONDecodeError:
+        return obtener_inventario()
+    except lector_json.NoEsArregloJSON:
+        raise ValueError(
+            "El archivo JSON no tiene el formato correcto (se esperaba una lista)."
+        )
+    except lector_json.ErrorLecturaJSON:
         raise ValueError("El archivo JSON está dañado o mal formado.")
 
 
 # el nombre debera ser unico
 def buscar_por_nombre(nombre):
+    """Primer juego (en orden de inventario) cuyo nombre contiene el texto"""
+    encontrados = buscar_todos_por_nombre(nombre)
+    return encontrados[0] if encontrados else None
+
+
+def buscar_todos_por_nombre(nombre):
+    """Todos los juegos cuyo nombre contiene el texto, en orden de inventario
+
+    Usa el índice de trigramas: solo se revisan los candidatos que comparten
+    todos los trigramas de la consulta.
+    """
+    inventario = _inventario_con_indices()
+    posiciones = _posiciones_de(inventario, _indice_nombres.buscar(nombre))
+    return [inventario[posicion] for posicion in sorted(posiciones)]
+
+
+def buscar_por_compania(prefijo):
+    """Juegos cuya compañía empieza por el texto (sin distinguir mayúsculas)
+
+    Recorre solo las entradas del índice de compañías que coinciden.
+    """
+    inventario = _inventario_con_indices()
+    ids = _indice_companias.prefijo(normalizar(prefijo))
+    return [inventario[posicion] for posicion in _posiciones_de(inventario, ids)]
+
+
+def listar_juegos_por_nombre(inicio=0, limite=None):
+    """Página de juegos en orden alfabético, sin ordenar el inventario
+
+    Recorre la vista ordenada por nombre: O(k) para una página de k juegos.
+    """
+    return list(iterar_juegos(inicio, limite, ordenar_por_nombre=True))
+
+
+def iterar_juegos(inicio=0, limite=None, ordenar_por_nombre=False):
+    """Generador de juegos desde la posición ``inicio``, como mucho ``limite``
+
+    Sin ordenar sigue el orden del inventario; ordenado, la vista por
+    nombre. En ambos casos solo se visitan los juegos que se consumen.
+    """
+    if ordenar_por_nombre:
+        inventario = _inventario_con_indices()
+        ids = _orden_por_nombre.recorrer(inicio, limite)
+        for posicion in _posiciones_de(inventario, ids):
+            yield inventario[posicion]
+        return
+
     inventario = obtener_inventario()
-    nombre_norm = nombre.strip().lower()
-    for j in inventario:
-        if nombre_norm in j["nombre"].strip().lower():
-            return j
-    return None
+    fin = len(inventario) if limite is None else inicio + limite
+    for posicion in range(inicio, fin):
+        if posicion >= len(inventario):
+            return
+        yield inventario[posicion]
+
+
+def contar_juegos():
+    """Número de juegos del inventario (desde la caché)"""
+    return len(obtener_inventario())
+
+
+def buscar_por_rango_precio(minimo=None, maximo=None, inicio=0, limite=None):
+    """Juegos con ``minimo <= precio <= maximo``, de menor a mayor precio
+
+    Devuelve un generador: los juegos se leen a medida que se consumen.
+    ``inicio`` y ``limite`` paginan dentro del rango.
+    """
+    inventario = _inventario_con_indices()
+    ids = _indice_precios.rango(minimo, maximo, inicio, limite)
+    return (inventario[posicion] for posicion in _posiciones_de(inventario, ids))
+
+
+def buscar_por_rango_fecha(desde=None, hasta=None, inicio=0, limite=None):
+    """Juegos publicados entre ``desde`` y ``hasta`` (incluidas), en orden
+
+    Las fechas pueden ser ``date`` o texto YYYY-MM-DD. Devuelve un generador
+    igual que buscar_por_rango_precio.
+    """
+    inventario = _inventario_con_indices()
+    ids = _indice_fechas.rango(
+        None if desde is None else ordinal_fecha(desde),
+        None if hasta is None else ordinal_fecha(hasta),
+        inicio,
+        limite,
+    )
+    return (inventario[posicion] for posicion in _posiciones_de(inventario, ids))
+
+
+def _posiciones_de(inventario, ids):
+    """Posiciones en el inventario de los IDs dados, vía la tabla hash
+
+    Es un generador: solo resuelve los IDs que se van consumiendo.
+    """
+    for id_juego in ids:
+        posicion = tabla_hash.buscar_posicion(id_juego)
+        if (
+            posicion is None
+            or posicion >= len(inventario)
+            or inventario.id_en(posicion) != id_juego
+        ):
+            # Índice inconsistente: se repara con la búsqueda lineal
+            if buscar_lineal_y_reconstruir(id_juego) is None:
+                continue
+            posicion = tabla_hash.buscar_posicion(id_juego)
+        yield posicion
+
+
+def referencias_portada(nombre):
+    """Cantidad de juegos del inventario que usan el archivo de portada"""
+    _inventario_con_indices()
+    return _indice_portadas.referencias(nombre)
+
+
+def portada_referenciada(nombre):
+    return referencias_portada(nombre) > 0
+
+
+def portada_indexada(nombre):
+    """Si algún juego usa la portada según el índice de referencias en memoria
+
+    El índice se arma la primera vez; después no se valida el inventario en
+    disco: es el atajo de guardar_imagen, que ante un "no" igual mira si el
+    archivo existe. Para decidir qué borrar está verificador_portadas.
+    """
+    if _inventario_indexado is None:
+        _inventario_con_indices()
+    return _indice_portadas.referencias(nombre) > 0
+
+
+def verificador_portadas():
+    """Función nombre -> bool para revisar muchas portadas seguidas
+
+    Valida el inventario una sola vez: cada consulta después es solo una
+    búsqueda en el índice de referencias en memoria, sin volver a mirar el
+    archivo en disco.
+    """
+    _inventario_con_indices()
+    return lambda nombre: _indice_portadas.referencias(nombre) > 0
 
 
 def juegos_existen():
     if not os.path.exists(ruta_archivo):
         return False
-    with open(ruta_archivo, "r", encoding="utf-8") as f:
-        try:
-            inventario = json.load(f)
-            return len(inventario) > 0
-        except json.JSONDecodeError:
-            raise ValueError("el archivo JSON esta dañado o mal formado")
+    try:
+        return len(obtener_inventario()) > 0
+    except lector_json.ErrorLecturaJSON:
+        raise ValueError("el archivo JSON esta dañado o mal formado")
 
 
 def id_existe(id):
@@ -200,7 +826,8 @@ def descargar_inventario(ruta_destino: str = None) -> Dict[str, Any]:
             return {"ok": False, "error": "No existe el archivo de inventario"}
 
         if ruta_destino:
-            # Copiar el archivo a la ruta destino
+            # Volcar el journal para que el archivo esté al día y copiarlo
+            checkpoint_inventario(esperar=True)
             shutil.copy2(ruta_archivo, ruta_destino)
             return {
                 "ok": True,
@@ -209,8 +836,7 @@ def descargar_inventario(ruta_destino: str = None) -> Dict[str, Any]:
             }
         else:
             # Devolver los datos para descargar
-            with open(ruta_archivo, "r", encoding="utf-8") as f:
-                datos = json.load(f)
+            datos = list(obtener_inventario())
 
             # Crear nombre de archivo con timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -236,61 +862,15 @@ def cargar_inventario_desde_archivo(ruta_archivo_cargado: str) -> Dict[str, Any]
         if not os.path.exists(ruta_archivo_cargado):
             return {"ok": False, "error": "El archivo no existe"}
 
-        # Leer y validar el archivo cargado
         with open(ruta_archivo_cargado, "r", encoding="utf-8") as f:
-            datos_cargados = json.load(f)
-
-        # Validar formato básico
-        if not isinstance(datos_cargados, list):
-            return {
-                "ok": False,
-                "error": "Formato inválido: se esperaba una lista de juegos",
-            }
-
-        # Validar estructura de cada juego
-        for i, juego in enumerate(datos_cargados):
-            if not isinstance(juego, dict):
-                return {"ok": False, "error": f"Elemento {i} no es un objeto válido"}
-
-            campos_requeridos = [
-                "id",
-                "nombre",
-                "precio",
-                "cantidad",
-                "compania",
-                "portada",
-                "fecha_publicacion",
-            ]
-            for campo in campos_requeridos:
-                if campo not in juego:
-                    return {"ok": False, "error": f"Juego {i} falta el campo: {campo}"}
-
-        # Hacer backup del archivo actual antes de reemplazar
-        if os.path.exists(ruta_archivo):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = BASE_DIR / f"inventario_backup_{timestamp}.json"
-            shutil.copy2(ruta_archivo, backup_path)
-
-        # Reemplazar el inventario actual
-        guardar_inventario(datos_cargados)
-
-        # Reconstruir la tabla hash con los nuevos datos
-        global tabla_hash
-        tabla_hash = TablaHash(tamano=100)  # Reiniciar tabla
-
-        for juego in datos_cargados:
-            tabla_hash.agregar(juego["id"], juego)
+            return _importar_inventario(f)
 
+    except lector_json.NoEsArregloJSON:
         return {
-            "ok": True,
-            "mensaje": (
-                "Inventario cargado exitosamente. "
-                f"{len(datos_cargados)} juegos importados."
-            ),
-            "total_juegos": len(datos_cargados),
+            "ok": False,
+            "error": "Formato inválido: se esperaba una lista de juegos",
         }
-
-    except json.JSONDecodeError:
+    except lector_json.ErrorLecturaJSON:
         return {"ok": False, "error": "El archivo no es un JSON válido"}
     except Exception as e:
         return {"ok": False, "error": f"Error al cargar el inventario: {str(e)}"}
@@ -301,62 +881,88 @@ def cargar_inventario_desde_datos(datos_json: str) -> Dict[str, Any]:
     Carga inventario desde datos JSON string (para cuando se sube el archivo)
     """
     try:
-        # Parsear el JSON string
-        datos_cargados = json.loads(datos_json)
+        return _importar_inventario(io.StringIO(datos_json))
 
-        # Validaciones (igual que la función anterior)
-        if not isinstance(datos_cargados, list):
-            return {
-                "ok": False,
-                "error": "Formato inválido: se esperaba una lista de juegos",
-            }
-
-        for i, juego in enumerate(datos_cargados):
-            if not isinstance(juego, dict):
-                return {"ok": False, "error": f"Elemento {i} no es un objeto válido"}
-
-            campos_requeridos = [
-                "id",
-                "nombre",
-                "precio",
-                "cantidad",
-                "compania",
-                "portada",
-                "fecha_publicacion",
-            ]
-            for campo in campos_requeridos:
-                if campo not in juego:
-                    return {"ok": False, "error": f"Juego {i} falta el campo: {campo}"}
-
-        # Backup del archivo actual
-        if os.path.exists(ruta_archivo):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = BASE_DIR / f"inventario_backup_{timestamp}.json"
-            shutil.copy2(ruta_archivo, backup_path)
+    except lector_json.NoEsArregloJSON:
+        return {
+            "ok": False,
+            "error": "Formato inválido: se esperaba una lista de juegos",
+        }
+    except lector_json.ErrorLecturaJSON:
+        return {"ok": False, "error": "El JSON no es válido"}
+    except Exception as e:
+        return {"ok": False, "error": f"Error al cargar el inventario: {str(e)}"}
 
-        # Reemplazar inventario
-        guardar_inventario(datos_cargados)
 
-        # Reconstruir tabla hash
-        global tabla_hash
-        tabla_hash = TablaHash(tamano=100)
+def _importar_inventario(archivo) -> Dict[str, Any]:
+    """Reemplaza el inventario por el arreglo de juegos de ``archivo``
 
-        for juego in datos_cargados:
-            tabla_hash.agregar(juego["id"], juego)
+    El arreglo se lee por bloques y cada juego se copia a un archivo de
+    preparación, así la memoria no depende del tamaño de la importación.
+    Mientras tanto los juegos se validan con las reglas del modelo en varios
+    procesos. Solo si todos son válidos se instala con un rename atómico; si
+    no, el inventario actual queda intacto y se informan los errores de cada
+    juego por su índice.
+    """
+    ids = []
+    validador = ValidadorImportacion()
+
+    def juegos_leidos():
+        for juego in lector_json.iterar_arreglo(archivo):
+            validador.agregar(juego)
+            ids.append(juego.get("id") if isinstance(juego, dict) else None)
+            yield juego
+
+    def copiar(destino):
+        _volcar_juegos(destino, juegos_leidos())
+        validador.terminar()
+
+    with validador:
+        preparacion = durabilidad.escribir_temporal(
+            ruta_archivo, copiar, sufijo=".importacion"
+        )
 
+    if validador.total_errores:
+        preparacion.unlink(missing_ok=True)
+        primero = validador.errores[0][1]
+        otros = validador.total_errores - 1
         return {
-            "ok": True,
-            "mensaje": (
-                "Inventario cargado exitosamente. "
-                f"{len(datos_cargados)} juegos importados."
-            ),
-            "total_juegos": len(datos_cargados),
+            "ok": False,
+            "error": primero + (f" (y {otros} errores más)" if otros else ""),
+            "errores": [
+                {"indice": indice, "error": error}
+                for indice, error in validador.errores
+            ],
+            "total_errores": validador.total_errores,
         }
 
-    except json.JSONDecodeError:
-        return {"ok": False, "error": "El JSON no es válido"}
-    except Exception as e:
-        return {"ok": False, "error": f"Error al cargar el inventario: {str(e)}"}
+    try:
+        with _lock_escritura, _lock_checkpoint:
+            # Hacer backup del archivo actual antes de reemplazar
+            if os.path.exists(ruta_archivo):
+                checkpoint_inventario(esperar=True)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                backup_path = BASE_DIR / f"inventario_backup_{timestamp}.json"
+                shutil.copy2(ruta_archivo, backup_path)
+
+            durabilidad.instalar(preparacion, ruta_archivo)
+            _descartar_journal()
+
+            # Reconstruir la tabla hash con los nuevos datos
+            tabla_hash.reconstruir((id_juego, i) for i, id_juego in enumerate(ids))
+            # El inventario nuevo se lee del archivo cuando se pida; la
+            # versión cambia con el índice ya reconstruido
+            _invalidar_cache()
+    finally:
+        preparacion.unlink(missing_ok=True)
+
+    return {
+        "ok": True,
+        "mensaje": (
+            "Inventario cargado exitosamente. " f"{len(ids)} juegos importados."
+        ),
+        "total_juegos": len(ids),
+    }
 
 
 def descargar_tabla_indices(ruta_destino: str = None) -> Dict[str, Any]:
@@ -365,7 +971,9 @@ def descargar_tabla_indices(ruta_destino: str = None) -> Dict[str, Any]:
     en la ruta especificada o devuelve los datos para descargar
     """
     try:
-        archivo_indice = BASE_DIR / "tabla_hash.json"
+        # Compactar el log de cambios para que el archivo esté al día
+        tabla_hash.guardar_tabla()
+        archivo_indice = tabla_hash.archivo_indice
 
         if not os.path.exists(archivo_indice):
             return {"ok": False, "error": "No existe el archivo de índices"}
@@ -400,6 +1008,6 @@ def descargar_tabla_indices(ruta_destino: str = None) -> Dict[str, Any]:
 
 
 # funcion para ver la tabla hash en consola
-def obtener_tabla_hash_visual():
+def obtener_tabla_hash_visual(inicio=0, limite=None):
     """Obtiene la tabla hash en formato visual (solo posiciones e IDs)"""
-    return tabla_hash.obtener_tabla_visual()
+    return tabla_hash.obtener_tabla_visual(inicio, limite)
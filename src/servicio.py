@@ -1,21 +1,34 @@
-from typing import Any, Dict
+import threading
+from concurrent.futures import Future, wait
+from typing import Any, Dict, Optional
 
 from . import repositorio
-
+from .config import CUBETAS_POR_PAGINA_VISUAL, PORTADAS_POR_PASO_GC, TAMANO_PAGINA
 from .modelos import Videojuego
 from .servicio_imagenes import servicio_imagenes
 
-servicio_img = servicio_imagenes()
+servicio_img = servicio_imagenes(
+    referenciada=repositorio.portada_indexada,
+    referencias=repositorio.verificador_portadas,
+)
+
+# Las portadas se escriben en segundo plano (ver _vigilar_portada): revisiones
+# pendientes y juegos quitados porque su portada no se pudo escribir
+_revisiones_portadas = set()
+_portadas_fallidas = []
+_lock_portadas = threading.Lock()
 
 
 def agregar_videojuego(nombre, precio, cantidad, compania, portada, fecha_publicacion):
     """Agrega un nuevo videojuego al inventario
     antes de que se agregue se verifica"""
     try:
-        # se agrega la imagen primero
+        # se agrega la imagen primero (su escritura sigue en segundo plano)
         if not portada:
             return {"ok": False, "error": "La portada es obligatoria"}
-        ruta_portada = servicio_img.guardar_imagen(portada, portada.name)
+        ruta_portada, escritura = servicio_img.guardar_imagen_en_segundo_plano(
+            portada, portada.name
+        )
         # luego se crea el juego
         juego = Videojuego(
             nombre=nombre,
@@ -30,7 +43,13 @@ def agregar_videojuego(nombre, precio, cantidad, compania, portada, fecha_public
             "ok": False,
             "error": str(e),  # mensaje de error del modelo (ej: fecha inválida
         }
+    if escritura.done() and escritura.exception() is not None:
+        return {
+            "ok": False,
+            "error": f"No se pudo guardar la portada: {escritura.exception()}",
+        }
     repositorio.agregar_juego(juego.to_dict())
+    _vigilar_portada(escritura, juego.id, juego.nombre)
     return {
         "ok": True,
         "id": juego.id,
@@ -38,6 +57,123 @@ def agregar_videojuego(nombre, precio, cantidad, compania, portada, fecha_public
     }
 
 
+def agregar_videojuegos_lote(juegos):
+    """Agrega varios videojuegos de una sola vez
+
+    Cada elemento es un diccionario con los mismos campos que recibe
+    agregar_videojuego. Los válidos se guardan con una única escritura del
+    inventario y del índice; se informa el resultado de cada elemento. Las
+    miniaturas de sus portadas se generan cuando se muestran por primera vez.
+    """
+    resultados = []
+    validos = []
+    escrituras = []
+
+    for indice, datos in enumerate(juegos):
+        try:
+            if not isinstance(datos, dict):
+                raise ValueError(f"Elemento {indice} no es un objeto válido")
+            portada = datos.get("portada")
+            if not portada:
+                raise ValueError("La portada es obligatoria")
+            if not hasattr(portada, "read") or not isinstance(
+                getattr(portada, "name", None), str
+            ):
+                raise ValueError("La portada debe ser un archivo con nombre")
+            ruta_portada, escritura = servicio_img.guardar_imagen_en_segundo_plano(
+                portada, portada.name, miniatura=False
+            )
+            juego = Videojuego(
+                nombre=datos.get("nombre", ""),
+                precio=datos.get("precio", 0.0),
+                cantidad=datos.get("cantidad", 0),
+                compania=datos.get("compania", ""),
+                portada=ruta_portada,
+                fecha_publicacion=datos.get("fecha_publicacion", ""),
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            resultados.append({"indice": indice, "ok": False, "error": str(e)})
+            continue
+        except OSError as e:
+            resultados.append(
+                {
+                    "indice": indice,
+                    "ok": False,
+                    "error": f"No se pudo guardar la portada: {e}",
+                }
+            )
+            continue
+
+        validos.append(juego.to_dict())
+        escrituras.append((escritura, juego.id, juego.nombre))
+        resultados.append({"indice": indice, "ok": True, "id": juego.id})
+
+    if validos:
+        repositorio.agregar_juegos_lote(validos)
+        for escritura, id_juego, nombre in escrituras:
+            _vigilar_portada(escritura, id_juego, nombre)
+
+    return {
+        "ok": True,
+        "agregados": len(validos),
+        "errores": len(juegos) - len(validos),
+        "resultados": resultados,
+        "mensaje": f"{len(validos)} de {len(juegos)} videojuegos agregados",
+    }
+
+
+def _vigilar_portada(escritura: Future, id_juego: str, nombre: str):
+    """Si la escritura de la portada falla, el juego se quita del inventario
+
+    El juego ya se guardó con la ruta de la portada; sin el archivo quedaría
+    apuntando a nada. Los juegos quitados se informan en
+    obtener_portadas_fallidas.
+    """
+    revisada = Future()
+    with _lock_portadas:
+        _revisiones_portadas.add(revisada)
+
+    def terminada(escritura):
+        try:
+            error = escritura.exception()
+            if error is not None:
+                repositorio.eliminar_juego_por_id(id_juego)
+                with _lock_portadas:
+                    _portadas_fallidas.append(
+                        {"id": id_juego, "nombre": nombre, "error": str(error)}
+                    )
+        finally:
+            with _lock_portadas:
+                _revisiones_portadas.discard(revisada)
+            revisada.set_result(None)
+
+    escritura.add_done_callback(terminada)
+
+
+def esperar_portadas(timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Espera a que terminen las portadas que se escriben en segundo plano
+
+    Al volver con ok, los juegos cuya portada falló ya se quitaron.
+    """
+    with _lock_portadas:
+        revisiones = list(_revisiones_portadas)
+    _, en_curso = wait(revisiones, timeout=timeout)
+    if en_curso:
+        return {
+            "ok": False,
+            "error": f"{len(en_curso)} portadas se siguen escribiendo",
+        }
+    return {"ok": True, "mensaje": "Todas las portadas están guardadas"}
+
+
+def obtener_portadas_fallidas() -> Dict[str, Any]:
+    """Juegos quitados porque su portada no se pudo escribir (una sola vez)"""
+    with _lock_portadas:
+        fallidas = list(_portadas_fallidas)
+        _portadas_fallidas.clear()
+    return {"ok": True, "resultado": fallidas}
+
+
 def buscar_por_Id(id):
     """Busca un videojuego por su id"""
     try:
@@ -56,7 +192,10 @@ def buscar_por_Id(id):
 
 
 def buscar_por_nombre(nombre):
-    """Busca un videojuego por su nombre exacto"""
+    """Busca los videojuegos cuyo nombre contiene el texto dado
+
+    "resultado" es la primera coincidencia y "resultados" todas ellas.
+    """
     try:
         if not repositorio.juegos_existen():
             return {"ok": False, "error": "No hay videojuegos registrados"}
@@ -66,9 +205,9 @@ def buscar_por_nombre(nombre):
     if not nombre:
         return {"ok": False, "error": "El nombre es obligatorio"}
 
-    juego = repositorio.buscar_por_nombre(nombre)
-    if juego:
-        return {"ok": True, "resultado": juego}
+    juegos = repositorio.buscar_todos_por_nombre(nombre)
+    if juegos:
+        return {"ok": True, "resultado": juegos[0], "resultados": juegos}
     else:
         return {
             "ok": False,
@@ -76,18 +215,117 @@ def buscar_por_nombre(nombre):
         }
 
 
+def buscar_por_compania(compania):
+    """Busca los videojuegos cuya compañía empieza por el texto dado"""
+    try:
+        if not repositorio.juegos_existen():
+            return {"ok": False, "error": "No hay videojuegos registrados"}
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+
+    if not compania:
+        return {"ok": False, "error": "La compañía es obligatoria"}
+
+    juegos = repositorio.buscar_por_compania(compania)
+    if juegos:
+        return {"ok": True, "resultado": juegos}
+    else:
+        return {
+            "ok": False,
+            "error": f"No hay videojuegos de la compañía '{compania}'",
+        }
+
+
+def buscar_por_rango_precio(minimo=None, maximo=None, inicio=0, limite=None):
+    """Busca los videojuegos con precio entre ``minimo`` y ``maximo``
+
+    "resultado" es un iterador en orden de precio que lee los juegos a
+    medida que se consume; ``inicio`` y ``limite`` paginan el rango.
+    """
+    try:
+        if minimo is not None:
+            minimo = float(minimo)
+        if maximo is not None:
+            maximo = float(maximo)
+    except (TypeError, ValueError):
+        return {"ok": False, "error": "El rango de precios debe ser numérico"}
+    if minimo is not None and maximo is not None and minimo > maximo:
+        return {"ok": False, "error": "El precio mínimo supera al máximo"}
+
+    try:
+        juegos = repositorio.buscar_por_rango_precio(minimo, maximo, inicio, limite)
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "resultado": juegos}
+
+
+def buscar_por_rango_fecha(desde=None, hasta=None, inicio=0, limite=None):
+    """Busca los videojuegos publicados entre ``desde`` y ``hasta``
+
+    Las fechas son ``date`` o texto YYYY-MM-DD; "resultado" es un iterador
+    en orden de publicación, como en buscar_por_rango_precio.
+    """
+    try:
+        ordinal_desde = None if desde is None else repositorio.ordinal_fecha(desde)
+        ordinal_hasta = None if hasta is None else repositorio.ordinal_fecha(hasta)
+    except (AttributeError, TypeError, ValueError):
+        return {"ok": False, "error": "La fecha debe tener el formato YYYY-MM-DD"}
+    if (
+        ordinal_desde is not None
+        and ordinal_hasta is not None
+        and ordinal_desde > ordinal_hasta
+    ):
+        return {"ok": False, "error": "La fecha inicial es posterior a la final"}
+
+    try:
+        juegos = repositorio.buscar_por_rango_fecha(desde, hasta, inicio, limite)
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "resultado": juegos}
+
+
 def listar_juegos(ordenar_por_nombre=False):
     try:
-        juegos = repositorio.listar_juegos()
+        if ordenar_por_nombre:
+            juegos = repositorio.listar_juegos_por_nombre()
+        else:
+            juegos = repositorio.listar_juegos()
     except ValueError as e:
         return {"ok": False, "error": str(e)}
     if not juegos:
         return {"ok": True, "resultado": []}
-    if ordenar_por_nombre:
-        juegos = sorted(juegos, key=lambda j: j["nombre"].lower())
     return {"ok": True, "resultado": juegos}
 
 
+def listar_pagina(pagina=1, tamano_pagina=TAMANO_PAGINA, ordenar_por_nombre=False):
+    """Devuelve una página del catálogo sin cargar el resto
+
+    Las páginas empiezan en 1; si ``pagina`` se sale del rango se devuelve
+    la última. Además de los juegos ("resultado") informa "pagina",
+    "total_paginas" y "total" para dibujar el paginador.
+    """
+    if tamano_pagina <= 0:
+        return {"ok": False, "error": "El tamaño de página debe ser positivo"}
+    try:
+        total = repositorio.contar_juegos()
+        total_paginas = max(1, -(-total // tamano_pagina))
+        pagina = min(max(1, pagina), total_paginas)
+        juegos = list(
+            repositorio.iterar_juegos(
+                (pagina - 1) * tamano_pagina, tamano_pagina, ordenar_por_nombre
+            )
+        )
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+    return {
+        "ok": True,
+        "resultado": juegos,
+        "pagina": pagina,
+        "total_paginas": total_paginas,
+        "total": total,
+    }
+
+
 def eliminar_juego(id):
     """Elimina un videojuego por ID"""
     try:
@@ -196,6 +434,23 @@ def descargar_tabla_indices_como_json() -> Dict[str, Any]:
         }
 
 
+def recolectar_portadas(limite=PORTADAS_POR_PASO_GC) -> Dict[str, Any]:
+    """Borra portadas que ya no usa ningún juego (un paso incremental)"""
+    try:
+        resultado = servicio_img.recolectar_huerfanas(limite=limite)
+        liberados = resultado["bytes_liberados"] / (1024 * 1024)
+        return {
+            "ok": True,
+            "resultado": resultado,
+            "mensaje": (
+                f"{resultado['eliminadas']} portadas sin uso eliminadas "
+                f"({liberados:.2f} MB liberados)"
+            ),
+        }
+    except Exception as e:
+        return {"ok": False, "error": f"Error al limpiar portadas: {str(e)}"}
+
+
 def obtener_estadisticas_indice() -> Dict[str, Any]:
     """Obtiene estadísticas del índice hash"""
     try:
@@ -205,13 +460,21 @@ def obtener_estadisticas_indice() -> Dict[str, Any]:
         return {"ok": False, "error": str(e)}
 
 
-def obtener_tabla_hash_visual() -> Dict[str, Any]:
-    """Obtiene la tabla hash en formato visual (posiciones e IDs)"""
+def obtener_tabla_hash_visual(
+    inicio=0, limite=CUBETAS_POR_PAGINA_VISUAL
+) -> Dict[str, Any]:
+    """Obtiene una página de la tabla hash en formato visual (posiciones e IDs)
+
+    ``siguiente`` es la cubeta donde empieza la página siguiente, o None si
+    no quedan más.
+    """
     try:
-        tabla_visual = repositorio.obtener_tabla_hash_visual()
+        tabla_visual = repositorio.obtener_tabla_hash_visual(inicio, limite)
+        completa = limite is None or len(tabla_visual) < limite
         return {
             "ok": True,
             "tabla_hash": tabla_visual,
+            "siguiente": None if completa else max(tabla_visual) + 1,
             "mensaje": "Tabla hash obtenida (posiciones y IDs)",
         }
     except Exception as e:
@@ -1,42 +1,372 @@
 import hashlib
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
 
-from .config import CARPETA_PORTADAS, RUTA_RELATIVA_PORTADAS
+from . import durabilidad
+from .almacen_portadas import crear_almacen
+from .indice_portadas import nombre_portada
+from .config import (
+    CARPETA_PORTADAS,
+    GRACIA_GC_PORTADAS,
+    HILOS_ESCRITURA_PORTADAS,
+    MAXIMO_PORTADAS_PENDIENTES,
+    PORTADAS_POR_PASO_GC,
+    RUTA_RELATIVA_PORTADAS,
+    SUFIJO_MINIATURA,
+    TAMANO_BLOQUE_IMAGEN,
+    TAMANO_MINIATURA,
+)
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Sin Pillow el listado muestra las portadas originales
+    Image = None
 
 
 class servicio_imagenes:
     """
     Servicio para guardar imágenes en disco y evitar duplicados usando hash.
+
+    ``referenciada`` (nombre de archivo -> bool, p. ej.
+    repositorio.portada_indexada) dice si algún juego usa una portada: así
+    guardar_imagen no consulta el disco para portadas conocidas.
+    ``referencias`` (p. ej. repositorio.verificador_portadas) devuelve esa
+    misma función sobre una única validación del inventario: el recolector
+    la pide una vez por paso para saber cuáles puede borrar (sin ella usa
+    ``referenciada``).
+
+    Dónde queda cada archivo lo decide el almacén de la ``organizacion``
+    (por defecto ORGANIZACION_PORTADAS, ver almacen_portadas); la ruta que
+    se guarda en el JSON es la misma en todas.
+
+    guardar_imagen_en_segundo_plano deja la escritura en disco a un grupo
+    de hilos acotado; esperar_escrituras espera a que terminen.
     """
 
-    def __init__(self):
-        CARPETA_PORTADAS.mkdir(parents=True, exist_ok=True)
-        self.carpeta_portadas = CARPETA_PORTADAS
+    def __init__(
+        self,
+        referenciada: Optional[Callable[[str], bool]] = None,
+        carpeta=None,
+        organizacion: Optional[str] = None,
+        referencias: Optional[Callable[[], Callable[[str], bool]]] = None,
+    ):
+        self.almacen = crear_almacen(carpeta or CARPETA_PORTADAS, organizacion)
+        self.carpeta_portadas = self.almacen.carpeta
+        self.referenciada = referenciada
+        self.referencias = referencias
+        # Recorrido de la carpeta que continúa en cada paso del recolector
+        self._recorrido_gc = None
+        self._lock_gc = threading.Lock()
+        # Escrituras en segundo plano: nombre -> Future de su escritura
+        self._escritor: Optional[ThreadPoolExecutor] = None
+        self._pendientes: Dict[str, Future] = {}
+        self._lock_pendientes = threading.Lock()
+        self._cupos = threading.BoundedSemaphore(MAXIMO_PORTADAS_PENDIENTES)
 
     def guardar_imagen(self, archivo_imagen, nombre_original):
         """
         Guarda una imagen en disco usando SHA256 como nombre único.
         Si la imagen ya existe (mismo contenido), no la duplica.
         Retorna la ruta relativa que se debe guardar en el JSON.
+
+        El archivo se copia por bloques a un temporal de la carpeta mientras
+        se calcula el hash, y el temporal se renombra al nombre final: la
+        memoria no depende del tamaño de la imagen y dos subidas de la misma
+        portada a la vez no se pisan a medio escribir.
         """
-        # Leer contenido en bytes
-        if hasattr(archivo_imagen, "getvalue"):
-            contenido = archivo_imagen.getvalue()
+        if hasattr(archivo_imagen, "seek"):
+            archivo_imagen.seek(0)
+
+        resumen = hashlib.sha256()
+        temporal = self._volcar(_bloques(archivo_imagen, resumen))
+        nombre_unico = _nombre_unico(resumen, nombre_original)
+        try:
+            if self._ya_guardada(nombre_unico):
+                os.remove(temporal)
+            else:
+                self._instalar(temporal, nombre_unico)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+        # Retornar ruta relativa homogénea (la definida en config)
+        return f"{RUTA_RELATIVA_PORTADAS}/{nombre_unico}"
+
+    def guardar_imagen_en_segundo_plano(
+        self, archivo_imagen, nombre_original, miniatura: bool = True
+    ) -> Tuple[str, Future]:
+        """Como guardar_imagen, pero la escritura en disco sigue en otro hilo
+
+        Antes de volver el archivo se copia por bloques a un temporal de la
+        carpeta mientras se calcula el hash, que es lo que decide la ruta; el
+        hilo solo sincroniza e instala ese temporal. Devuelve la ruta y un
+        Future que termina cuando la portada (y su miniatura) están
+        instaladas, o con la excepción de la escritura. Dos subidas iguales
+        comparten la misma escritura. Como mucho MAXIMO_PORTADAS_PENDIENTES
+        temporales esperan su instalación; con más, la llamada espera a que
+        se libere un lugar antes de leer el archivo.
+
+        Con ``miniatura`` en False no se genera la miniatura: la crea
+        ruta_miniatura la primera vez que se muestra la portada. Así una carga
+        por lote no espera a que Pillow reduzca cada imagen.
+        """
+        if hasattr(archivo_imagen, "seek"):
+            archivo_imagen.seek(0)
+
+        self._cupos.acquire()
+        try:
+            resumen = hashlib.sha256()
+            temporal = self._volcar(_bloques(archivo_imagen, resumen))
+        except BaseException:
+            self._cupos.release()
+            raise
+        nombre_unico = _nombre_unico(resumen, nombre_original)
+        ruta = f"{RUTA_RELATIVA_PORTADAS}/{nombre_unico}"
+
+        with self._lock_pendientes:
+            escritura = self._pendientes.get(nombre_unico)
+        if escritura is None and self._ya_guardada(nombre_unico, miniatura):
+            escritura = Future()
+            escritura.set_result(ruta)
+        nueva = None
+        if escritura is None:
+            with self._lock_pendientes:
+                escritura = self._pendientes.get(nombre_unico)
+                if escritura is None:
+                    if self._escritor is None:
+                        self._escritor = ThreadPoolExecutor(
+                            HILOS_ESCRITURA_PORTADAS, thread_name_prefix="portadas"
+                        )
+                    escritura = nueva = self._escritor.submit(
+                        self._escribir, temporal, nombre_unico, ruta, miniatura
+                    )
+                    self._pendientes[nombre_unico] = nueva
+        if nueva is not None:
+            # Fuera del lock: si ya terminó, la llamada se hace aquí mismo
+            nueva.add_done_callback(
+                lambda _, nombre=nombre_unico: self._escritura_terminada(nombre)
+            )
         else:
-            contenido = archivo_imagen.read()
+            os.remove(temporal)
+            self._cupos.release()
+        return ruta, escritura
 
-        # Calcular hash SHA256
-        hash_archivo = hashlib.sha256(contenido).hexdigest()
-        # Mantener extensión original
-        extension = os.path.splitext(nombre_original)[1].lower()
-        nombre_unico = f"{hash_archivo}{extension}"
+    def esperar_escrituras(self, timeout: Optional[float] = None) -> bool:
+        """Espera las escrituras en segundo plano pendientes
 
-        ruta_guardado = self.carpeta_portadas / nombre_unico
+        Devuelve False si alguna sigue en curso al vencer ``timeout``. Los
+        errores de cada escritura quedan en su Future.
+        """
+        with self._lock_pendientes:
+            pendientes = list(self._pendientes.values())
+        _, en_curso = wait(pendientes, timeout=timeout)
+        return not en_curso
 
-        # Guardar solo si no existe ya
-        if not ruta_guardado.exists():
-            with open(ruta_guardado, "wb") as f:
-                f.write(contenido)
+    def cerrar(self):
+        """Termina las escrituras pendientes y libera los hilos"""
+        if self._escritor is not None:
+            self._escritor.shutdown(wait=True)
+            self._escritor = None
 
-        # Retornar ruta relativa homogénea (la definida en config)
-        return f"{RUTA_RELATIVA_PORTADAS}/{nombre_unico}"
+    def _escribir(self, temporal: str, nombre: str, ruta: str, miniatura: bool) -> str:
+        try:
+            self._instalar(temporal, nombre, miniatura)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        return ruta
+
+    def _escritura_terminada(self, nombre: str):
+        with self._lock_pendientes:
+            self._pendientes.pop(nombre, None)
+        self._cupos.release()
+
+    def _volcar(self, bloques: Iterable[bytes]) -> str:
+        """Escribe los bloques en un temporal de la carpeta y devuelve su ruta
+
+        Sin sincronizar: lo hace _instalar, solo si el temporal se usa.
+        """
+        descriptor, temporal = tempfile.mkstemp(
+            dir=self.carpeta_portadas, prefix=".subida-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                for bloque in bloques:
+                    f.write(bloque)
+        except BaseException:
+            os.remove(temporal)
+            raise
+        return temporal
+
+    def _ya_guardada(self, nombre: str, miniatura: bool = True) -> bool:
+        """Con el mismo nombre el contenido es el mismo: basta uno"""
+        if self.referenciada is not None and self.referenciada(nombre):
+            return True
+        if not self.almacen.existe(nombre):
+            return False
+        # Reutilizada: el recolector la respeta durante la gracia
+        self.almacen.tocar(nombre)
+        if miniatura and not self.almacen.ruta(_nombre_miniatura(nombre)).exists():
+            self.crear_miniatura(nombre)
+        return True
+
+    def _instalar(self, temporal: str, nombre: str, miniatura: bool = True):
+        if durabilidad.politica != durabilidad.NUNCA:
+            with open(temporal, "rb") as f:
+                os.fsync(f.fileno())
+        # mkstemp crea el temporal solo legible por su dueño
+        os.chmod(temporal, 0o644)
+        self.almacen.instalar(temporal, nombre)
+        if miniatura and not self.almacen.ruta(_nombre_miniatura(nombre)).exists():
+            self.crear_miniatura(nombre)
+
+    def crear_miniatura(self, nombre: str) -> Optional[Path]:
+        """Genera la miniatura de una portada guardada
+
+        Devuelve su ruta, o None si no hay Pillow o la imagen no se puede
+        leer (la portada sigue guardada igual).
+        """
+        if Image is None:
+            return None
+        original = self.almacen.abrir(nombre)
+        if original is None:
+            return None
+
+        miniatura = _nombre_miniatura(nombre)
+        descriptor, temporal = tempfile.mkstemp(
+            dir=self.carpeta_portadas, prefix=".miniatura-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as f, original, Image.open(
+                original
+            ) as imagen:
+                # draft deja que un JPEG se decodifique ya reducido
+                imagen.draft("RGB", TAMANO_MINIATURA)
+                imagen = ImageOps.exif_transpose(imagen)
+                imagen.thumbnail(TAMANO_MINIATURA)
+                if imagen.mode != "RGB":
+                    # JPEG no tiene transparencia: se apoya sobre fondo blanco
+                    fondo = Image.new("RGB", imagen.size, "white")
+                    imagen = imagen.convert("RGBA")
+                    fondo.paste(imagen, mask=imagen.getchannel("A"))
+                    imagen = fondo
+                imagen.save(f, format="JPEG", quality=85)
+            os.chmod(temporal, 0o644)
+            self.almacen.instalar(temporal, miniatura)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # Archivo que no es una imagen que Pillow entienda
+            os.remove(temporal)
+            return None
+        except BaseException:
+            os.remove(temporal)
+            raise
+        return self.almacen.ruta(miniatura)
+
+    def ruta_miniatura(self, portada: str) -> Optional[Path]:
+        """Ruta a mostrar para la portada guardada en el JSON
+
+        La miniatura si existe; si no, se genera en ese momento (portadas
+        guardadas antes de que hubiera miniaturas) y, si no se puede, se
+        devuelve la original si es un archivo. None si la portada no está
+        guardada.
+        """
+        nombre = nombre_portada(portada)
+        if nombre is None:
+            return None
+        ruta_miniatura = self.almacen.ruta(_nombre_miniatura(nombre))
+        if ruta_miniatura.exists():
+            return ruta_miniatura
+        if not self.almacen.existe(nombre):
+            return None
+        return self.crear_miniatura(nombre) or self.almacen.ubicar(nombre)
+
+    def leer_portada(self, portada: str) -> Optional[bytes]:
+        """Contenido de la portada guardada en el JSON, esté donde esté"""
+        nombre = nombre_portada(portada)
+        return None if nombre is None else self.almacen.leer(nombre)
+
+    def recolectar_huerfanas(
+        self,
+        limite: Optional[int] = PORTADAS_POR_PASO_GC,
+        gracia: float = GRACIA_GC_PORTADAS,
+    ) -> Dict[str, Any]:
+        """Un paso del recolector de portadas que ningún juego usa
+
+        Revisa como mucho ``limite`` archivos (None: todos), siguiendo el
+        recorrido del almacén desde donde lo dejó el paso anterior. Borra
+        las portadas sin referencias, con su miniatura, y los temporales de
+        subidas interrumpidas, si llevan más de ``gracia`` segundos sin
+        modificarse. ``completa`` indica que el recorrido llegó al final;
+        entonces también se compacta el almacén (paquetes).
+        """
+        if self.referencias is not None:
+            referenciada = self.referencias()
+        elif self.referenciada is not None:
+            referenciada = self.referenciada
+        else:
+            raise ValueError("El recolector necesita el índice de referencias")
+
+        antes_de = time.time() - gracia
+        revisadas = eliminadas = bytes_liberados = 0
+        completa = False
+        with self._lock_gc:
+            while limite is None or revisadas < limite:
+                if self._recorrido_gc is None:
+                    self._recorrido_gc = self.almacen.recorrer()
+                nombre = next(self._recorrido_gc, None)
+                if nombre is None:
+                    self._recorrido_gc = None
+                    completa = True
+                    bytes_liberados += self.almacen.compactar()
+                    break
+
+                revisadas += 1
+                if nombre.endswith(SUFIJO_MINIATURA):
+                    # Las miniaturas se borran junto con su original
+                    continue
+                temporal = nombre.startswith(".") and nombre.endswith(".tmp")
+                if not temporal and referenciada(nombre):
+                    continue
+                fecha = self.almacen.fecha(nombre)
+                if fecha is None or fecha > antes_de:
+                    continue
+
+                bytes_liberados += self.almacen.eliminar(nombre)
+                if not temporal:
+                    bytes_liberados += self.almacen.eliminar(_nombre_miniatura(nombre))
+                eliminadas += 1
+
+        return {
+            "revisadas": revisadas,
+            "eliminadas": eliminadas,
+            "bytes_liberados": bytes_liberados,
+            "completa": completa,
+        }
+
+
+def _bloques(archivo, resumen) -> Iterator[bytes]:
+    """Lee el archivo por bloques actualizando el hash de su contenido"""
+    while True:
+        bloque = archivo.read(TAMANO_BLOQUE_IMAGEN)
+        if not bloque:
+            return
+        resumen.update(bloque)
+        yield bloque
+
+
+def _nombre_unico(resumen, nombre_original: str) -> str:
+    """SHA256 del contenido con la extensión original"""
+    extension = os.path.splitext(nombre_original)[1].lower()
+    return f"{resumen.hexdigest()}{extension}"
+
+
+def _nombre_miniatura(nombre: str) -> str:
+    """La miniatura lleva el nombre SHA256 de la original"""
+    return nombre.split(".", 1)[0] + SUFIJO_MINIATURA
@@ -1,8 +1,61 @@
+import hashlib
 import json
 import os
-from typing import Any, Dict, Optional
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from . import durabilidad, indice_binario
+from .config import (
+    FACTOR_CARGA_MAXIMO,
+    FACTOR_CARGA_MINIMO,
+    MOTOR_TABLA_HASH,
+    PASOS_REHASH,
+    RUTA_TABLA_HASH,
+    UMBRAL_COMPACTACION_LOG,
+)
+
+# Cantidad de redimensionamientos recientes que se conservan en el índice
+MAX_HISTORIAL_REDIMENSIONAMIENTOS = 20
+
+
+def hash_digitos(id_juego: str) -> int:
+    """Hash original: suma ponderada de los dígitos del ID
+
+    Cae en una banda estrecha de valores; se conserva para leer índices
+    antiguos y para compararla en el benchmark.
+    """
+    numeros = "".join(filter(str.isdigit, id_juego))
+    if not numeros:
+        numeros = "0"
+
+    return sum(int(digit) * (i + 1) for i, digit in enumerate(numeros))
+
+
+def hash_blake2b(id_juego: str) -> int:
+    """Primeros 8 bytes de BLAKE2b del ID
+
+    Bien distribuido y, a diferencia de ``hash()``, estable entre procesos.
+    """
+    resumen = hashlib.blake2b(id_juego.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(resumen, "little")
 
-from .config import RUTA_TABLA_HASH
+
+# Versión de la función hash guardada en el índice. Los archivos sin
+# "version_hash" se escribieron con la función original.
+VERSION_HASH_ORIGINAL = "digitos-v1"
+VERSION_HASH_ACTUAL = "blake2b-64-v2"
+FUNCIONES_HASH = {
+    VERSION_HASH_ORIGINAL: hash_digitos,
+    VERSION_HASH_ACTUAL: hash_blake2b,
+}
+
+# Motores de almacenamiento de la tabla (ver crear_tabla_hash)
+MOTOR_ENCADENADO = "encadenado"
+MOTOR_ABIERTO = "abierto"
 
 
 class NodoHash:
@@ -18,52 +71,167 @@ class NodoHash:
         self.siguiente: Optional["NodoHash"] = None
 
 
+class Largos:
+    """Histograma de largos de una tabla, al día con cada cambio
+
+    En el motor encadenado cuenta el largo de cada lista no vacía; en el
+    abierto, las ranuras sondeadas hasta cada entrada. ``cuenta[l]`` es
+    cuántas tienen largo l (``cuenta[0]`` no se usa). Cada cambio cuesta
+    O(1) y el resumen O(largo máximo), sin recorrer la tabla.
+    """
+
+    __slots__ = ("cuenta", "maxima")
+
+    def __init__(self):
+        self.cuenta = [0] * 8
+        self.maxima = 0
+
+    def cambiar(self, antes: int, despues: int):
+        """Una cubeta pasa de largo ``antes`` a ``despues`` (0 = ninguna)"""
+        cuenta = self.cuenta
+        if despues >= len(cuenta):
+            cuenta.extend(repeat(0, despues + 1 - len(cuenta)))
+        cuenta[antes] -= 1
+        cuenta[despues] += 1
+        if despues > self.maxima:
+            self.maxima = despues
+        elif antes == self.maxima:
+            # Al restar, el máximo baja hasta el siguiente largo con cuenta
+            while self.maxima and not cuenta[self.maxima]:
+                self.maxima -= 1
+
+    def resumen(self) -> Dict[str, int]:
+        ocupadas = suma = 0
+        for largo in range(1, self.maxima + 1):
+            ocupadas += self.cuenta[largo]
+            suma += largo * self.cuenta[largo]
+        return {
+            "colisiones": ocupadas - self.cuenta[1] if self.maxima else 0,
+            "longitud_maxima": self.maxima,
+            "posiciones_ocupadas": ocupadas,
+            "suma": suma,
+        }
+
+
+class Cubetas(list):
+    """Cubetas del motor encadenado, con el histograma de sus largos"""
+
+    __slots__ = ("largos",)
+
+    def __init__(self, tamano: int):
+        super().__init__(repeat(None, tamano))
+        self.largos = Largos()
+
+
+def _largo(nodo: Optional[NodoHash]) -> int:
+    """Elementos de la lista que empieza en ``nodo``"""
+    largo = 0
+    while nodo is not None:
+        largo += 1
+        nodo = nodo.siguiente
+    return largo
+
+
 class TablaHash:
-    """Tabla hash que funciona como índice principal (id -> posición)"""
+    """Tabla hash que funciona como índice principal (id -> posición)
+
+    Los cambios se añaden como una línea al registro ``tabla_hash.log``;
+    ``tabla_hash.json`` solo se reescribe al compactar el registro.
+
+    El tamaño crece o se reduce según el factor de carga. Mientras dura un
+    redimensionamiento conviven la tabla actual y ``_tabla_nueva``, y cada
+    operación migra unos pocos elementos (rehash incremental).
+
+    Este es el motor encadenado: cada cubeta es una lista enlazada de
+    NodoHash. Las subclases pueden cambiar cómo se guardan las entradas
+    redefiniendo las operaciones en memoria (``_tabla_vacia``,
+    ``_posicion``, ``_insertar``, ``_quitar``, ``_mover``, ``_paso_rehash``,
+    ``_cargar_cubeta`` y ``_cubetas``). Cada tabla de ``_tabla_vacia`` lleva
+    en ``largos`` su histograma (ver Largos), que esas operaciones mantienen
+    al día: las estadísticas no recorren la tabla.
+
+    Cada instantánea se escribe también como índice binario
+    (``tabla_hash.idx``, ver indice_binario). Al arrancar sin cambios
+    pendientes en el log se consulta ese archivo mapeado en memoria, sin
+    cargar nada; la primera escritura lo pasa a la tabla en memoria.
+    """
 
-    def __init__(self, tamano: int = 100):
-        self.archivo_indice = RUTA_TABLA_HASH
+    MOTOR = MOTOR_ENCADENADO
+
+    def __init__(self, tamano: int = 100, archivo_indice=None):
+        self.archivo_indice = Path(archivo_indice or RUTA_TABLA_HASH)
+        # Registro activo y registro en proceso de compactación
+        self.archivo_log = self.archivo_indice.with_suffix(".log")
+        self.archivo_log_anterior = self.archivo_indice.with_suffix(".log.1")
+        self.archivo_binario = self.archivo_indice.with_suffix(".idx")
+        self.umbral_compactacion = UMBRAL_COMPACTACION_LOG
+        self.version_hash = VERSION_HASH_ACTUAL
+        self._valor_hash = FUNCIONES_HASH[self.version_hash]
         self.tamano = tamano
-        self.tabla: list[Optional[NodoHash]] = [None] * tamano
+        self.tamano_minimo = tamano
+        self.tabla = self._tabla_vacia(tamano)
+        self.total_elementos = 0
+        self.redimensionamientos: list[Dict[str, Any]] = []
+        # Rehash incremental: tabla destino y siguiente cubeta por migrar
+        self._tabla_nueva = None
+        self._cursor_rehash = 0
+        self._redimensionar_automatico = True
+        self._lock = threading.RLock()
+        self._lock_compactacion = threading.Lock()
+        self._hilo_compactacion: Optional[threading.Thread] = None
+        self._bytes_log = 0
+        self._registros_pendientes: Optional[list[str]] = None
+        # Índice binario consultado en disco hasta la primera escritura, y
+        # el resumen de largos guardado con él
+        self._base: Optional[indice_binario.IndiceBinario] = None
+        self._largos_base: Optional[Dict[str, int]] = None
         self.cargar_tabla()
 
     def funcion_hash(self, id_juego: str) -> int:
-        """Función hash personalizada que usa los números del ID"""
-        numeros = "".join(filter(str.isdigit, id_juego))
-        if not numeros:
-            numeros = "0"
-
-        numero_hash = sum(int(digit) * (i + 1) for i, digit in enumerate(numeros))
-        return numero_hash % self.tamano
+        """Índice de la cubeta del ID en la tabla actual"""
+        return self._valor_hash(id_juego) % self.tamano
 
     def agregar(self, id_juego: str, posicion_inventario: int):
         """Agrega un ID con su posición en el inventario"""
-        indice = self.funcion_hash(id_juego)
-        nuevo_nodo = NodoHash(id_juego, posicion_inventario)
-
-        if self.tabla[indice] is None:
-            self.tabla[indice] = nuevo_nodo
-        else:
-            actual = self.tabla[indice]
-            while actual.siguiente is not None:
-                actual = actual.siguiente
-            actual.siguiente = nuevo_nodo
-
-        self.guardar_tabla()
+        with self._lock:
+            self._materializar()
+            self._insertar(id_juego, posicion_inventario)
+            self._registrar("agregar", id=id_juego, pos=posicion_inventario)
+
+    def agregar_lote(self, pares: Iterable[Tuple[str, int]]):
+        """Agrega varios pares (id, posición) con una sola escritura del log"""
+        with self.lote():
+            self._materializar()
+            for id_juego, posicion in pares:
+                self._insertar(id_juego, posicion)
+                self._registrar("agregar", id=id_juego, pos=posicion)
+
+    @contextmanager
+    def lote(self):
+        """Acumula los registros del log y los escribe juntos al salir
+
+        Se puede anidar: solo el lote más externo escribe.
+        """
+        with self._lock:
+            if self._registros_pendientes is not None:
+                yield
+                return
+
+            self._registros_pendientes = []
+            try:
+                yield
+            finally:
+                pendientes = self._registros_pendientes
+                self._registros_pendientes = None
+                if pendientes:
+                    self._escribir_log("".join(pendientes))
 
     def buscar_posicion(self, id_juego: str) -> Optional[int]:
         """Busca la posición en el inventario para un ID"""
-        indice = self.funcion_hash(id_juego)
-        actual = self.tabla[indice]
-
-        while actual is not None:
-            if actual.id_juego == id_juego:
-                return (
-                    actual.posicion_inventario
-                )  # ← Devuelve la posición en inventario
-            actual = actual.siguiente
-
-        return None
+        with self._lock:
+            if self._base is not None:
+                return self._base.buscar(id_juego)
+            return self._posicion(id_juego)
 
     def existe(self, id_juego: str) -> bool:
         """Verifica si un ID existe en la tabla hash"""
@@ -71,149 +239,624 @@ class TablaHash:
 
     def eliminar(self, id_juego: str) -> bool:
         """Elimina un ID de la tabla hash"""
-        indice = self.funcion_hash(id_juego)
-        actual = self.tabla[indice]
-        anterior = None
-
-        while actual is not None:
-            if actual.id_juego == id_juego:
-                if anterior is None:
-                    self.tabla[indice] = actual.siguiente
-                else:
-                    anterior.siguiente = actual.siguiente
+        with self._lock:
+            self._materializar()
+            if not self._quitar(id_juego):
+                return False
+            self._registrar("eliminar", id=id_juego)
+            return True
 
-                self.guardar_tabla()
-                return True
+    def actualizar_posicion(self, id_juego: str, nueva_posicion: int):
+        """Actualiza la posición de un ID en el inventario"""
+        with self._lock:
+            self._materializar()
+            if not self._mover(id_juego, nueva_posicion):
+                return False
+            self._registrar("mover", id=id_juego, pos=nueva_posicion)
+            return True
+
+    def reconstruir(self, pares: Iterable[Tuple[str, int]]):
+        """Vacía la tabla y la llena con los pares (id, posición) dados
+
+        Se guarda de una sola vez en lugar de registrar cada entrada, con un
+        tamaño que ya respeta el factor de carga máximo.
+        """
+        pares = list(pares)
+        with self._lock:
+            tamano = self.tamano_minimo
+            while len(pares) / tamano > FACTOR_CARGA_MAXIMO:
+                tamano *= 2
+            if tamano != self.tamano:
+                self._anotar_redimensionamiento(self.tamano, tamano)
+            self._descartar_base()
+
+            self.tamano = tamano
+            self.tabla = self._tabla_vacia(tamano)
+            self.total_elementos = 0
+            self._tabla_nueva = None
+            self._cursor_rehash = 0
+            # El tamaño ya es el final: sin esto las primeras inserciones
+            # achicarían la tabla (carga mínima) y luego volvería a crecer
+            automatico = self._redimensionar_automatico
+            self._redimensionar_automatico = False
+            try:
+                for id_juego, posicion in pares:
+                    self._insertar(id_juego, posicion)
+            finally:
+                self._redimensionar_automatico = automatico
+            if self._registros_pendientes is not None:
+                # Lo acumulado en el lote ya queda en la instantánea
+                self._registros_pendientes.clear()
+            self.guardar_tabla()
+
+    def huella(self) -> Optional[bytes]:
+        """Huella de los IDs por posición que indexa la tabla
+
+        Se compara con ``indice_binario.huella_ids`` del inventario para
+        saber si el índice le corresponde sin reconstruirlo.
+        """
+        with self._lock:
+            if self._base is not None:
+                return self._base.huella
+            self._paso_rehash(limite=None)
+            pares = [par for _, entradas in self._cubetas() for par in entradas]
+        return indice_binario.huella_pares(pares)
+
+    # --- operaciones en memoria (no tocan disco) ---
+
+    def _tabla_vacia(self, tamano: int) -> Cubetas:
+        return Cubetas(tamano)
+
+    def _tablas(self):
+        if self._tabla_nueva is None:
+            return (self.tabla,)
+        return (self._tabla_nueva, self.tabla)
+
+    def _posicion(self, id_juego: str) -> Optional[int]:
+        nodo = self._buscar_nodo(id_juego)
+        if nodo is None:
+            return None
+        return nodo.posicion_inventario  # ← Devuelve la posición en inventario
+
+    def _buscar_nodo(self, id_juego: str) -> Optional[NodoHash]:
+        """Busca el nodo del ID en la tabla nueva y en la actual"""
+        valor = self._valor_hash(id_juego)
+        tablas = [self.tabla]
+        if self._tabla_nueva is not None:
+            tablas.insert(0, self._tabla_nueva)
+
+        for tabla in tablas:
+            actual = tabla[valor % len(tabla)]
+            while actual is not None:
+                if actual.id_juego == id_juego:
+                    return actual
+                actual = actual.siguiente
 
-            anterior = actual
-            actual = actual.siguiente
+        return None
 
-        return False
+    def _insertar(self, id_juego: str, posicion_inventario: int):
+        """Inserta al inicio de la lista o actualiza si el ID ya existe"""
+        nodo = self._buscar_nodo(id_juego)
+        if nodo is not None:
+            nodo.posicion_inventario = posicion_inventario
+            return
 
-    def actualizar_posicion(self, id_juego: str, nueva_posicion: int):
-        """Actualiza la posición de un ID en el inventario"""
-        indice = self.funcion_hash(id_juego)
-        actual = self.tabla[indice]
+        # Durante un rehash los elementos nuevos van directo a la tabla nueva
+        tabla = self.tabla if self._tabla_nueva is None else self._tabla_nueva
+        indice = self._valor_hash(id_juego) % len(tabla)
+        nuevo_nodo = NodoHash(id_juego, posicion_inventario)
+        nuevo_nodo.siguiente = tabla[indice]
+        tabla[indice] = nuevo_nodo
+        largo = _largo(nuevo_nodo)
+        tabla.largos.cambiar(largo - 1, largo)
+
+        self.total_elementos += 1
+        self._paso_rehash()
+        self._revisar_factor_carga()
+
+    def _quitar(self, id_juego: str) -> bool:
+        valor = self._valor_hash(id_juego)
+        tablas = [self.tabla]
+        if self._tabla_nueva is not None:
+            tablas.append(self._tabla_nueva)
+
+        for tabla in tablas:
+            indice = valor % len(tabla)
+            actual = tabla[indice]
+            anterior = None
 
-        while actual is not None:
-            if actual.id_juego == id_juego:
-                actual.posicion_inventario = nueva_posicion
-                self.guardar_tabla()
-                return True
-            actual = actual.siguiente
+            while actual is not None:
+                if actual.id_juego == id_juego:
+                    largo = _largo(tabla[indice])
+                    tabla.largos.cambiar(largo, largo - 1)
+                    if anterior is None:
+                        tabla[indice] = actual.siguiente
+                    else:
+                        anterior.siguiente = actual.siguiente
+
+                    self.total_elementos -= 1
+                    self._paso_rehash()
+                    self._revisar_factor_carga()
+                    return True
+
+                anterior = actual
+                actual = actual.siguiente
 
         return False
 
-    def guardar_tabla(self):
-        """Guarda la tabla hash con IDs y posiciones"""
-        datos_serializables = []
+    def _mover(self, id_juego: str, nueva_posicion: int) -> bool:
+        nodo = self._buscar_nodo(id_juego)
+        if nodo is None:
+            return False
 
-        for i, nodo in enumerate(self.tabla):
-            lista_posicion = []
-            actual = nodo
+        nodo.posicion_inventario = nueva_posicion
+        self._paso_rehash()
+        return True
 
-            while actual is not None:
-                lista_posicion.append(
-                    {
-                        "id_juego": actual.id_juego,
-                        # Guarda la posición en el inventario
-                        "posicion_inventario": actual.posicion_inventario,
-                    }
-                )
-                actual = actual.siguiente
+    # --- redimensionamiento ---
 
-            if lista_posicion:
-                datos_serializables.append({"indice": i, "elementos": lista_posicion})
+    def _revisar_factor_carga(self):
+        """Inicia un redimensionamiento si el factor de carga se sale del rango"""
+        if not self._redimensionar_automatico or self._tabla_nueva is not None:
+            return
 
-        with open(self.archivo_indice, "w", encoding="utf-8") as f:
-            json.dump(
-                {"tamano": self.tamano, "datos": datos_serializables},
-                f,
-                indent=4,
-                ensure_ascii=False,
-            )
+        factor_carga = self.total_elementos / self.tamano
+        if factor_carga > FACTOR_CARGA_MAXIMO:
+            self._iniciar_redimensionamiento(self.tamano * 2)
+        elif factor_carga < FACTOR_CARGA_MINIMO and self.tamano > self.tamano_minimo:
+            self._iniciar_redimensionamiento(max(self.tamano_minimo, self.tamano // 2))
+
+    def _iniciar_redimensionamiento(self, nuevo_tamano: int, registrar: bool = True):
+        """Crea la tabla destino; la migración ocurre en las operaciones siguientes"""
+        self._tabla_nueva = self._tabla_vacia(nuevo_tamano)
+        self._cursor_rehash = 0
+        fecha = self._anotar_redimensionamiento(self.tamano, nuevo_tamano)
+        if registrar:
+            self._registrar("redimensionar", tamano=nuevo_tamano, fecha=fecha)
+
+    def _anotar_redimensionamiento(
+        self, de: int, a: int, fecha: Optional[str] = None
+    ) -> str:
+        fecha = fecha or datetime.now().isoformat(timespec="seconds")
+        self.redimensionamientos.append(
+            {"de": de, "a": a, "elementos": self.total_elementos, "fecha": fecha}
+        )
+        del self.redimensionamientos[:-MAX_HISTORIAL_REDIMENSIONAMIENTOS]
+        return fecha
+
+    def _paso_rehash(self, limite: Optional[int] = PASOS_REHASH):
+        """Migra a la tabla nueva hasta ``limite`` elementos (None = todos)
+
+        También se limita el número de cubetas vacías visitadas para que un
+        paso sobre una tabla dispersa siga siendo barato.
+        """
+        if self._tabla_nueva is None:
+            return
 
-    def cargar_tabla(self):
-        """Carga la tabla hash desde disco"""
-        if not os.path.exists(self.archivo_indice):
+        tabla_nueva = self._tabla_nueva
+        movidos = 0
+        visitadas = 0
+        while self._cursor_rehash < self.tamano:
+            if limite is not None and (movidos >= limite or visitadas >= limite * 10):
+                return
+
+            actual = self.tabla[self._cursor_rehash]
+            if actual is not None:
+                self.tabla[self._cursor_rehash] = None
+                self.tabla.largos.cambiar(_largo(actual), 0)
+            while actual is not None:
+                siguiente = actual.siguiente
+                indice = self._valor_hash(actual.id_juego) % len(tabla_nueva)
+                actual.siguiente = tabla_nueva[indice]
+                tabla_nueva[indice] = actual
+                largo = _largo(actual)
+                tabla_nueva.largos.cambiar(largo - 1, largo)
+                actual = siguiente
+                movidos += 1
+
+            self._cursor_rehash += 1
+            visitadas += 1
+
+        # Migración terminada: la tabla nueva pasa a ser la actual
+        self.tabla = tabla_nueva
+        self.tamano = len(tabla_nueva)
+        self._tabla_nueva = None
+        self._cursor_rehash = 0
+
+    # --- persistencia ---
+
+    def _registrar(self, operacion: str, **campos):
+        """Añade un registro compacto al log (coste O(1) en bytes)
+
+        Dentro de ``agregar_lote`` los registros se acumulan y se escriben
+        juntos al final.
+        """
+        registro = {"op": operacion, **campos}
+        linea = json.dumps(registro, separators=(",", ":"), ensure_ascii=False)
+        linea += "\n"
+
+        if self._registros_pendientes is not None:
+            self._registros_pendientes.append(linea)
             return
+        self._escribir_log(linea)
+
+    def _escribir_log(self, texto: str):
+        with open(self.archivo_log, "a", encoding="utf-8") as f:
+            f.write(texto)
+            durabilidad.sincronizar(f)
+
+        self._bytes_log += len(texto.encode("utf-8"))
+        if self._bytes_log >= self.umbral_compactacion:
+            self.compactar()
+
+    def _rotar_log(self):
+        """Aparta el log activo para que la compactación lo absorba
+
+        Debe llamarse con ``self._lock`` tomado.
+        """
+        if self.archivo_log.exists():
+            if self.archivo_log_anterior.exists():
+                # Una compactación anterior no terminó: se conservan ambos
+                with open(self.archivo_log, "r", encoding="utf-8") as origen:
+                    with open(
+                        self.archivo_log_anterior, "a", encoding="utf-8"
+                    ) as destino:
+                        destino.write(origen.read())
+                os.remove(self.archivo_log)
+            else:
+                os.replace(self.archivo_log, self.archivo_log_anterior)
+        self._bytes_log = 0
+
+    def _serializar(self) -> Dict[str, Any]:
+        # La instantánea siempre se escribe con el tamaño final
+        self._materializar()
+        self._paso_rehash(limite=None)
+        datos_serializables = []
 
-        try:
-            with open(self.archivo_indice, "r", encoding="utf-8") as f:
-                datos = json.load(f)
-
-            for posicion in datos["datos"]:
-                indice = posicion["indice"]
-                elementos = posicion["elementos"]
-
-                if elementos:
-                    primer_elemento = elementos[0]
-                    self.tabla[indice] = NodoHash(
-                        primer_elemento["id_juego"],
-                        primer_elemento["posicion_inventario"],
-                    )
+        for i, entradas in self._cubetas():
+            lista_posicion = [
+                {
+                    "id_juego": id_juego,
+                    # Guarda la posición en el inventario
+                    "posicion_inventario": posicion,
+                }
+                for id_juego, posicion in entradas
+            ]
+            datos_serializables.append({"indice": i, "elementos": lista_posicion})
 
-                    actual = self.tabla[indice]
-                    for elemento in elementos[1:]:
-                        actual.siguiente = NodoHash(
-                            elemento["id_juego"],
-                            elemento["posicion_inventario"],
-                        )
-                        actual = actual.siguiente
+        return {
+            "tamano": self.tamano,
+            "version_hash": self.version_hash,
+            "motor": self.MOTOR,
+            "redimensionamientos": self.redimensionamientos,
+            "datos": datos_serializables,
+        }
 
-            print("✓ Tabla hash de índices cargada correctamente")
+    def guardar_tabla(self):
+        """Guarda la tabla hash con IDs y posiciones y vacía el log
+
+        Orden de los locks: ``_lock`` y luego ``_lock_compactacion``. Quien
+        tiene ``_lock_compactacion`` ya no necesita ``_lock`` mientras
+        escribe, así que un hilo dentro de un lote puede esperarlo sin
+        bloquearse mutuamente.
+        """
+        with self._lock:
+            self._lock_compactacion.acquire()
+            try:
+                self._rotar_log()
+                datos = self._serializar()
+                largos = self._resumen_largos()
+            except BaseException:
+                self._lock_compactacion.release()
+                raise
 
-        except (json.JSONDecodeError, KeyError, IndexError) as e:
-            print(f"Error cargando tabla hash: {e}")
-            self.tabla = [None] * self.tamano
+        try:
+            durabilidad.reemplazar_archivo(
+                self.archivo_indice,
+                lambda f: json.dump(datos, f, indent=4, ensure_ascii=False),
+            )
+            # Después del JSON: un binario más antiguo que el JSON no se usa
+            indice_binario.escribir(
+                self.archivo_binario,
+                (
+                    (elemento["id_juego"], elemento["posicion_inventario"])
+                    for cubeta in datos["datos"]
+                    for elemento in cubeta["elementos"]
+                ),
+                tamano=datos["tamano"],
+                version_hash=datos["version_hash"],
+                valor_hash=self._valor_hash,
+                metadatos={
+                    "redimensionamientos": datos["redimensionamientos"],
+                    "motor": self.MOTOR,
+                    "largos": largos,
+                },
+            )
 
-    def obtener_tabla_visual(self) -> Dict[int, list]:
-        """Obtiene la tabla hash en formato visual"""
-        tabla_visual = {}
+            # La instantánea ya incluye los cambios del log apartado
+            if self.archivo_log_anterior.exists():
+                os.remove(self.archivo_log_anterior)
+        finally:
+            self._lock_compactacion.release()
 
-        for i in range(self.tamano):
-            elementos = []
-            actual = self.tabla[i]
+    def compactar(self, esperar: bool = False):
+        """Compacta el log sobre tabla_hash.json en un hilo en segundo plano
 
-            while actual is not None:
-                elementos.append(f"{actual.id_juego}->pos{actual.posicion_inventario}")
-                actual = actual.siguiente
+        Con ``esperar`` se compacta en el hilo actual, incluyendo todo lo
+        registrado hasta el momento de la llamada.
+        """
+        if esperar:
+            self.guardar_tabla()
+            return
 
-            if elementos:
-                tabla_visual[i] = elementos
+        hilo = self._hilo_compactacion
+        if hilo is None or not hilo.is_alive():
+            hilo = threading.Thread(
+                target=self.guardar_tabla, name="compactacion-tabla-hash", daemon=True
+            )
+            self._hilo_compactacion = hilo
+            hilo.start()
+
+    def _reproducir_log(self, ruta: Path):
+        """Aplica sobre la tabla los registros de un log"""
+        with open(ruta, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea incompleta por una escritura interrumpida
+                    continue
+
+                operacion = registro.get("op")
+                if operacion == "agregar":
+                    self._insertar(registro["id"], registro["pos"])
+                elif operacion == "eliminar":
+                    self._quitar(registro["id"])
+                elif operacion == "mover":
+                    self._mover(registro["id"], registro["pos"])
+                elif operacion == "redimensionar":
+                    self._paso_rehash(limite=None)
+                    self._tabla_nueva = self._tabla_vacia(registro["tamano"])
+                    self._cursor_rehash = 0
+                    self._anotar_redimensionamiento(
+                        self.tamano, registro["tamano"], registro.get("fecha")
+                    )
+                    self._paso_rehash(limite=None)
 
-        return tabla_visual
+    def cargar_tabla(self):
+        """Carga la tabla hash desde disco y reproduce el log de cambios
+
+        Si el índice binario está al día y el log está vacío, la tabla queda
+        consultando el binario y no se carga nada más.
+        """
+        self._redimensionar_automatico = False
+        migrar_version = False
+        logs = [
+            ruta
+            for ruta in (self.archivo_log_anterior, self.archivo_log)
+            if ruta.exists()
+        ]
+
+        if self._abrir_binario():
+            if not logs:
+                self._redimensionar_automatico = True
+                print("✓ Tabla hash de índices abierta desde el índice binario")
+                return
+            self._materializar()
+
+        elif self.archivo_indice.exists():
+            try:
+                with open(self.archivo_indice, "r", encoding="utf-8") as f:
+                    datos = json.load(f)
+
+                # El tamaño guardado manda sobre el tamaño inicial
+                self.tamano = datos.get("tamano", self.tamano)
+                self.tabla = self._tabla_vacia(self.tamano)
+                self.redimensionamientos = datos.get("redimensionamientos", [])
+                version = datos.get("version_hash", VERSION_HASH_ORIGINAL)
+                migrar_version = version != self.version_hash
+                # Con la misma función hash y el mismo motor cada cubeta se
+                # copia tal cual; si no, se reinsertan sus elementos
+                directo = (
+                    not migrar_version
+                    and datos.get("motor", MOTOR_ENCADENADO) == self.MOTOR
+                )
 
-    def estadisticas(self) -> Dict[str, Any]:
-        """Muestra estadísticas de la tabla hash"""
-        total_elementos = 0
-        colisiones = 0
-        lista_longitudes = []
+                for posicion in datos["datos"]:
+                    elementos = [
+                        (elemento["id_juego"], elemento["posicion_inventario"])
+                        for elemento in posicion["elementos"]
+                    ]
+                    if elementos:
+                        self._cargar_cubeta(posicion["indice"], elementos, directo)
+
+                print("✓ Tabla hash de índices cargada correctamente")
+
+            except (json.JSONDecodeError, KeyError, IndexError) as e:
+                print(f"Error cargando tabla hash: {e}")
+                self.tabla = self._tabla_vacia(self.tamano)
+                self.total_elementos = 0
+
+        # Los registros se aplican en orden: primero el log apartado por una
+        # compactación que no terminó y luego el log activo. Los
+        # redimensionamientos se toman del log, no se recalculan.
+        for ruta in logs:
+            self._reproducir_log(ruta)
+        self._paso_rehash(limite=None)
+        self._redimensionar_automatico = True
+
+        if self.archivo_log.exists():
+            self._bytes_log = self.archivo_log.stat().st_size
+
+        self._revisar_factor_carga()
+        if migrar_version:
+            # Reescribe el índice con la versión actual sin bloquear el arranque
+            self.compactar()
+
+    def _abrir_binario(self) -> bool:
+        """Abre el índice binario si sirve para esta tabla
+
+        Tiene que ser al menos tan reciente como tabla_hash.json y estar
+        escrito con la función hash actual; si no, se carga el JSON.
+        """
+        try:
+            estado = self.archivo_binario.stat()
+            if (
+                self.archivo_indice.exists()
+                and self.archivo_indice.stat().st_mtime_ns > estado.st_mtime_ns
+            ):
+                return False
+            base = indice_binario.IndiceBinario(self.archivo_binario, self._valor_hash)
+        except FileNotFoundError:
+            return False
+        except (OSError, indice_binario.ErrorIndiceBinario) as e:
+            print(f"Error abriendo el índice binario: {e}")
+            return False
+
+        if base.version_hash != self.version_hash:
+            base.cerrar()
+            return False
+
+        metadatos = base.metadatos()
+        self._base = base
+        self.tamano = base.tamano
+        self.tabla = self._tabla_vacia(self.tamano)
+        self.total_elementos = base.total_elementos
+        self.redimensionamientos = metadatos.get("redimensionamientos", [])
+        # Los largos dependen del motor que escribió el índice
+        if metadatos.get("motor") == self.MOTOR:
+            self._largos_base = metadatos.get("largos")
+        return True
+
+    def _materializar(self):
+        """Pasa a la tabla en memoria el índice binario que se consultaba
+
+        Debe llamarse con ``self._lock`` tomado antes de modificar o recorrer
+        la tabla.
+        """
+        base = self._base
+        if base is None:
+            return
 
-        for i in range(self.tamano):
-            longitud = 0
-            actual = self.tabla[i]
+        automatico = self._redimensionar_automatico
+        self._redimensionar_automatico = False
+        try:
+            self.tabla = self._tabla_vacia(self.tamano)
+            self.total_elementos = 0
+            for id_juego, posicion in base.entradas():
+                self._insertar(id_juego, posicion)
+        finally:
+            self._redimensionar_automatico = automatico
+        self._descartar_base()
+
+    def _descartar_base(self):
+        if self._base is not None:
+            self._base.cerrar()
+            self._base = None
+        self._largos_base = None
+
+    def _cargar_cubeta(self, indice: int, elementos: list, directo: bool):
+        """Restaura una cubeta de la instantánea (pares id, posición)"""
+        if not directo:
+            # Índice de otra versión o de otro motor: se recalcula la cubeta
+            for id_juego, posicion in elementos:
+                self._insertar(id_juego, posicion)
+            return
 
+        anterior = None
+        for id_juego, posicion in reversed(elementos):
+            nodo = NodoHash(id_juego, posicion)
+            nodo.siguiente = anterior
+            anterior = nodo
+        self.tabla[indice] = anterior
+        self.tabla.largos.cambiar(0, len(elementos))
+        self.total_elementos += len(elementos)
+
+    def _cubetas(self, inicio: int = 0):
+        """Cubetas no vacías de la tabla actual: (índice, [(id, posición)])"""
+        for i in range(inicio, len(self.tabla)):
+            actual = self.tabla[i]
+            entradas = []
             while actual is not None:
-                longitud += 1
-                total_elementos += 1
+                entradas.append((actual.id_juego, actual.posicion_inventario))
                 actual = actual.siguiente
+            if entradas:
+                yield i, entradas
+
+    def obtener_tabla_visual(
+        self, inicio: int = 0, limite: Optional[int] = None
+    ) -> Dict[int, list]:
+        """Obtiene la tabla hash en formato visual, por páginas
+
+        Devuelve como mucho ``limite`` cubetas no vacías (None: todas) desde
+        la cubeta ``inicio``; la página siguiente empieza en la última
+        cubeta devuelta más uno.
+        """
+        with self._lock:
+            # Los índices de cubeta son los de la tabla con el rehash terminado
+            self._materializar()
+            self._paso_rehash(limite=None)
+            return {
+                i: [f"{id_juego}->pos{posicion}" for id_juego, posicion in entradas]
+                for i, entradas in islice(self._cubetas(inicio), limite)
+            }
 
-            if longitud > 0:
-                lista_longitudes.append(longitud)
-                if longitud > 1:
-                    colisiones += 1
-
-        factor_carga = total_elementos / self.tamano if self.tamano > 0 else 0
-
+    def estadisticas(self) -> Dict[str, Any]:
+        """Muestra estadísticas de la tabla hash sin recorrerla (O(1))
+
+        Durante un rehash cuentan las entradas de las dos tablas y el tamaño
+        es el de la tabla nueva. El contenido se pide aparte, por páginas,
+        con obtener_tabla_visual.
+        """
+        with self._lock:
+            largos = self._resumen_largos()
+            total_elementos = self.total_elementos
+            rehash_en_curso = self._tabla_nueva is not None
+            tamano = len(self._tabla_nueva) if rehash_en_curso else self.tamano
+            redimensionamientos = list(self.redimensionamientos)
+
+        ocupadas = largos["posiciones_ocupadas"]
         return {
+            "tamano": tamano,
             "total_elementos": total_elementos,
-            "colisiones": colisiones,
-            "factor_carga": factor_carga,
-            "longitud_maxima": (max(lista_longitudes) if lista_longitudes else 0),
-            "longitud_promedio": (
-                sum(lista_longitudes) / len(lista_longitudes) if lista_longitudes else 0
-            ),
-            "posiciones_ocupadas": len(lista_longitudes),
-            "tabla_visual": self.obtener_tabla_visual(),
+            "colisiones": largos["colisiones"],
+            "factor_carga": total_elementos / tamano if tamano > 0 else 0,
+            "longitud_maxima": largos["longitud_maxima"],
+            "longitud_promedio": largos["suma"] / ocupadas if ocupadas else 0,
+            "posiciones_ocupadas": ocupadas,
+            "rehash_en_curso": rehash_en_curso,
+            "redimensionamientos": redimensionamientos,
         }
+
+    def _resumen_largos(self) -> Dict[str, int]:
+        """Suma de los histogramas de las tablas (o el guardado en el binario)"""
+        if self._base is not None:
+            if self._largos_base is not None:
+                return dict(self._largos_base)
+            # Binario de otro motor: sus largos no sirven para este
+            self._materializar()
+        resumen = None
+        for tabla in self._tablas():
+            parcial = tabla.largos.resumen()
+            if resumen is None:
+                resumen = parcial
+                continue
+            for clave, valor in parcial.items():
+                if clave == "longitud_maxima":
+                    resumen[clave] = max(resumen[clave], valor)
+                else:
+                    resumen[clave] += valor
+        return resumen
+
+
+def crear_tabla_hash(tamano: int = 100, archivo_indice=None, motor=None) -> TablaHash:
+    """Crea la tabla hash con el motor indicado (por defecto MOTOR_TABLA_HASH)"""
+    motor = motor or MOTOR_TABLA_HASH
+    if motor == MOTOR_ENCADENADO:
+        return TablaHash(tamano=tamano, archivo_indice=archivo_indice)
+    if motor == MOTOR_ABIERTO:
+        # Import diferido: el motor abierto extiende esta clase
+        from .tabla_hash_abierta import TablaHashAbierta
+
+        return TablaHashAbierta(tamano=tamano, archivo_indice=archivo_indice)
+    raise ValueError(f"Motor de tabla hash desconocido: {motor}")
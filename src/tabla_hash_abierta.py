@@ -0,0 +1,229 @@
+from array import array
+from typing import Optional
+
+from .config import PASOS_REHASH
+from .tabla_hash import MOTOR_ABIERTO, Largos, TablaHash
+
+# Ocupación a partir de la cual se crece de inmediato aunque el
+# redimensionamiento automático esté apagado (al reproducir el log): con
+# direccionamiento abierto la tabla no puede llenarse
+OCUPACION_MAXIMA = 0.9
+
+
+class Ranuras:
+    """Arreglos paralelos de una tabla con direccionamiento abierto
+
+    La ranura i guarda el hash del ID en ``hashes[i]``, el ID en ``ids[i]``
+    (None si está libre) y la posición en el inventario en
+    ``posiciones[i]``. No hay un objeto por entrada. ``largos`` lleva las
+    ranuras sondeadas hasta cada entrada.
+    """
+
+    __slots__ = ("hashes", "ids", "posiciones", "largos")
+
+    def __init__(self, tamano: int):
+        self.hashes = array("Q", bytes(8 * tamano))
+        self.ids: list[Optional[str]] = [None] * tamano
+        self.posiciones = array("q", bytes(8 * tamano))
+        self.largos = Largos()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def largo(self, i: int) -> int:
+        """Ranuras sondeadas para llegar a la entrada i (1 = en su origen)"""
+        tamano = len(self.ids)
+        return (i - self.hashes[i] % tamano) % tamano + 1
+
+    def buscar(self, valor: int, id_juego: str) -> int:
+        """Ranura del ID o -1; el sondeo para en la primera ranura libre"""
+        tamano = len(self.ids)
+        i = valor % tamano
+        ids, hashes = self.ids, self.hashes
+        while True:
+            actual = ids[i]
+            if actual is None:
+                return -1
+            if hashes[i] == valor and actual == id_juego:
+                return i
+            i += 1
+            if i == tamano:
+                i = 0
+
+    def colocar(self, valor: int, id_juego: str, posicion: int):
+        """Ocupa la primera ranura libre desde la ranura de origen"""
+        tamano = len(self.ids)
+        i = valor % tamano
+        ids = self.ids
+        largo = 1
+        while ids[i] is not None:
+            i += 1
+            largo += 1
+            if i == tamano:
+                i = 0
+        self.hashes[i] = valor
+        ids[i] = id_juego
+        self.posiciones[i] = posicion
+        self.largos.cambiar(0, largo)
+
+    def vaciar(self, i: int):
+        """Libera la ranura i sin lápidas (borrado con corrimiento hacia atrás)
+
+        Las entradas siguientes del mismo grupo que quedarían detrás del
+        hueco se corren hacia su ranura de origen, así las búsquedas pueden
+        seguir parando en la primera ranura libre.
+        """
+        tamano = len(self.ids)
+        ids, hashes, posiciones = self.ids, self.hashes, self.posiciones
+        largos = self.largos
+        largos.cambiar(self.largo(i), 0)
+        j = i
+        while True:
+            j += 1
+            if j == tamano:
+                j = 0
+            if ids[j] is None:
+                break
+            origen = hashes[j] % tamano
+            # La entrada j puede quedarse si su origen está entre i y j
+            if (i < origen <= j) if i <= j else (origen > i or origen <= j):
+                continue
+            antes = self.largo(j)
+            hashes[i], ids[i], posiciones[i] = hashes[j], ids[j], posiciones[j]
+            largos.cambiar(antes, self.largo(i))
+            i = j
+        ids[i] = None
+
+
+class TablaHashAbierta(TablaHash):
+    """TablaHash con direccionamiento abierto (sondeo lineal)
+
+    Misma API y mismo formato en disco que el motor encadenado, pero las
+    entradas viven en tres arreglos planos (hashes, IDs y posiciones) en
+    lugar de un NodoHash por ID: menos memoria y búsquedas sin saltar de
+    nodo en nodo. El hash guardado permite comparar antes que el ID y
+    redimensionar sin volver a calcular BLAKE2b.
+
+    El rehash también es incremental: cada paso migra grupos completos de
+    ranuras ocupadas (limitados por ranuras libres), de modo que las
+    búsquedas en la tabla vieja siguen siendo correctas mientras tanto.
+    """
+
+    MOTOR = MOTOR_ABIERTO
+
+    def _tabla_vacia(self, tamano: int) -> Ranuras:
+        return Ranuras(tamano)
+
+    def _ubicar(self, valor: int, id_juego: str):
+        """(tabla, ranura) del ID o (None, -1)"""
+        for tabla in self._tablas():
+            i = tabla.buscar(valor, id_juego)
+            if i >= 0:
+                return tabla, i
+        return None, -1
+
+    def _posicion(self, id_juego: str) -> Optional[int]:
+        tabla, i = self._ubicar(self._valor_hash(id_juego), id_juego)
+        if tabla is None:
+            return None
+        return tabla.posiciones[i]
+
+    def _insertar(self, id_juego: str, posicion_inventario: int):
+        valor = self._valor_hash(id_juego)
+        tabla, i = self._ubicar(valor, id_juego)
+        if tabla is not None:
+            tabla.posiciones[i] = posicion_inventario
+            return
+
+        destino = self.tabla if self._tabla_nueva is None else self._tabla_nueva
+        if self.total_elementos + 1 > len(destino) * OCUPACION_MAXIMA:
+            self._paso_rehash(limite=None)
+            self._iniciar_redimensionamiento(self.tamano * 2, registrar=False)
+            self._paso_rehash(limite=None)
+            destino = self.tabla
+
+        destino.colocar(valor, id_juego, posicion_inventario)
+        self.total_elementos += 1
+        self._paso_rehash()
+        self._revisar_factor_carga()
+
+    def _quitar(self, id_juego: str) -> bool:
+        tabla, i = self._ubicar(self._valor_hash(id_juego), id_juego)
+        if tabla is None:
+            return False
+
+        tabla.vaciar(i)
+        self.total_elementos -= 1
+        self._paso_rehash()
+        self._revisar_factor_carga()
+        return True
+
+    def _mover(self, id_juego: str, nueva_posicion: int) -> bool:
+        tabla, i = self._ubicar(self._valor_hash(id_juego), id_juego)
+        if tabla is None:
+            return False
+
+        tabla.posiciones[i] = nueva_posicion
+        self._paso_rehash()
+        return True
+
+    def _paso_rehash(self, limite: Optional[int] = PASOS_REHASH):
+        """Migra a la tabla nueva grupos de ranuras hasta ``limite`` elementos
+
+        El recorrido empieza en una ranura libre de la tabla vieja y avanza
+        por ``_cursor_rehash``. Un grupo (ranuras ocupadas seguidas) se mueve
+        entero, así ninguna búsqueda en la tabla vieja encuentra un hueco
+        antes de llegar a su ID.
+        """
+        if self._tabla_nueva is None:
+            return
+
+        vieja, nueva = self.tabla, self._tabla_nueva
+        tamano = len(vieja)
+        if self._cursor_rehash == 0:
+            # En la tabla vieja ya no se inserta: esta ranura seguirá libre
+            self._inicio_rehash = vieja.ids.index(None)
+
+        movidos = 0
+        visitadas = 0
+        while self._cursor_rehash < tamano:
+            if limite is not None and (movidos >= limite or visitadas >= limite * 10):
+                return
+
+            i = (self._inicio_rehash + self._cursor_rehash) % tamano
+            while vieja.ids[i] is not None:
+                nueva.colocar(vieja.hashes[i], vieja.ids[i], vieja.posiciones[i])
+                vieja.largos.cambiar(vieja.largo(i), 0)
+                vieja.ids[i] = None
+                movidos += 1
+                self._cursor_rehash += 1
+                i = (i + 1) % tamano
+            self._cursor_rehash += 1
+            visitadas += 1
+
+        # Migración terminada: la tabla nueva pasa a ser la actual
+        self.tabla = nueva
+        self.tamano = len(nueva)
+        self._tabla_nueva = None
+        self._cursor_rehash = 0
+
+    def _cargar_cubeta(self, indice: int, elementos: list, directo: bool):
+        if not directo:
+            for id_juego, posicion in elementos:
+                self._insertar(id_juego, posicion)
+            return
+
+        # La instantánea guarda cada entrada en la ranura que ocupaba
+        id_juego, posicion = elementos[0]
+        self.tabla.hashes[indice] = self._valor_hash(id_juego)
+        self.tabla.ids[indice] = id_juego
+        self.tabla.posiciones[indice] = posicion
+        self.tabla.largos.cambiar(0, self.tabla.largo(indice))
+        self.total_elementos += 1
+
+    def _cubetas(self, inicio: int = 0):
+        tabla = self.tabla
+        for i in range(inicio, len(tabla)):
+            id_juego = tabla.ids[i]
+            if id_juego is not None:
+                yield i, [(id_juego, tabla.posiciones[i])]
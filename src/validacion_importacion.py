@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .config import (
+    MAX_ERRORES_IMPORTACION,
+    PROCESOS_VALIDACION,
+    TAMANO_BLOQUE_VALIDACION,
+)
+from .modelos import CAMPOS, Videojuego
+
+
+def validar_juego(indice: int, juego) -> Optional[str]:
+    """Mensaje de error del juego importado, o None si es válido
+
+    Además de la estructura aplica las reglas del modelo (Videojuego).
+    """
+    if not isinstance(juego, dict):
+        return f"Elemento {indice} no es un objeto válido"
+    for campo in CAMPOS:
+        if campo not in juego:
+            return f"Juego {indice} falta el campo: {campo}"
+    try:
+        Videojuego(**{campo: juego[campo] for campo in CAMPOS})
+    except (TypeError, ValueError) as e:
+        return f"Juego {indice}: {e}"
+    return None
+
+
+def validar_bloque(inicio: int, juegos: list) -> List[Tuple[int, str]]:
+    """Errores (índice, mensaje) de un bloque que empieza en ``inicio``"""
+    errores = []
+    for indice, juego in enumerate(juegos, start=inicio):
+        error = validar_juego(indice, juego)
+        if error is not None:
+            errores.append((indice, error))
+    return errores
+
+
+class ValidadorImportacion:
+    """Valida los juegos de una importación en varios procesos
+
+    Los juegos se agregan a medida que se leen y se envían por bloques a un
+    ProcessPoolExecutor. Solo hay unos pocos bloques en vuelo a la vez, así
+    la memoria sigue acotada aunque se lea más rápido de lo que se valida.
+    Si la importación no llega a llenar un bloque (o con un solo proceso) se
+    valida en este mismo proceso, sin el costo de arrancar el pool.
+
+    Los procesos no se crean con fork: la aplicación tiene otros hilos
+    (Streamlit, escritores de portadas) y un hijo copiado con fork puede
+    quedar con un lock tomado por un hilo que no existe en él.
+    """
+
+    def __init__(
+        self,
+        procesos: Optional[int] = PROCESOS_VALIDACION,
+        tamano_bloque: int = TAMANO_BLOQUE_VALIDACION,
+        max_errores: int = MAX_ERRORES_IMPORTACION,
+    ):
+        self.procesos = procesos
+        self.tamano_bloque = tamano_bloque
+        self.max_errores = max_errores
+        self.total = 0
+        self.total_errores = 0
+        self.errores: List[Tuple[int, str]] = []
+        self._bloque: list = []
+        self._inicio_bloque = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._procesos_pool = procesos or os.cpu_count() or 1
+        self._pendientes: deque = deque()
+
+    def agregar(self, juego):
+        self._bloque.append(juego)
+        self.total += 1
+        if len(self._bloque) >= self.tamano_bloque:
+            self._enviar_bloque()
+
+    def terminar(self) -> List[Tuple[int, str]]:
+        """Espera a todos los bloques y devuelve los errores por índice"""
+        if self._pool is None:
+            self._anotar(validar_bloque(self._inicio_bloque, self._bloque))
+        else:
+            if self._bloque:
+                self._enviar_bloque()
+            while self._pendientes:
+                self._anotar(self._pendientes.popleft().result())
+            self.cerrar()
+        self._bloque = []
+        self.errores.sort()
+        return self.errores
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._pendientes.clear()
+
+    def _enviar_bloque(self):
+        bloque, inicio = self._bloque, self._inicio_bloque
+        self._bloque = []
+        self._inicio_bloque += len(bloque)
+
+        if self._pool is None:
+            if self._procesos_pool == 1:
+                self._anotar(validar_bloque(inicio, bloque))
+                return
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._procesos_pool, mp_context=_contexto_procesos()
+            )
+
+        self._pendientes.append(self._pool.submit(validar_bloque, inicio, bloque))
+        # Dos bloques por proceso mantienen a todos ocupados sin acumular
+        while len(self._pendientes) > 2 * self._procesos_pool:
+            self._anotar(self._pendientes.popleft().result())
+
+    def _anotar(self, errores):
+        self.total_errores += len(errores)
+        espacio = max(self.max_errores - len(self.errores), 0)
+        self.errores.extend(errores[:espacio])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def _contexto_procesos():
+    """forkserver donde existe; si no (Windows), spawn"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def validar_juegos(juegos, **opciones) -> List[Tuple[int, str]]:
+    """Valida una lista de juegos; devuelve los errores (índice, mensaje)"""
+    with ValidadorImportacion(**opciones) as validador:
+        for juego in juegos:
+            validador.agregar(juego)
+        return validador.terminar()
@@ -0,0 +1,44 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src import config
+
+# Los módulos de src leen las rutas de config al importarse: se apuntan a una
+# carpeta temporal para que las pruebas nunca toquen los datos reales
+_CARPETA_DATOS = Path(tempfile.mkdtemp(prefix="inventario_pruebas_"))
+config.RUTA_INVENTARIO = _CARPETA_DATOS / "inventario.json"
+config.RUTA_TABLA_HASH = _CARPETA_DATOS / "tabla_hash.json"
+config.CARPETA_PORTADAS = _CARPETA_DATOS / "imagenes" / "portadas"
+
+
+@pytest.fixture
+def repositorio(tmp_path, monkeypatch):
+    """Módulo repositorio trabajando sobre archivos en tmp_path"""
+    from src import repositorio as modulo
+    from src.tabla_hash import crear_tabla_hash
+
+    monkeypatch.setattr(modulo, "ruta_archivo", tmp_path / "inventario.json")
+    # Las copias de seguridad de las importaciones también quedan en tmp_path
+    monkeypatch.setattr(modulo, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(
+        modulo,
+        "tabla_hash",
+        crear_tabla_hash(archivo_indice=tmp_path / "tabla_hash.json"),
+    )
+    return modulo
+
+
+def juego_de_prueba(numero, **campos):
+    juego = {
+        "id": f"id-{numero}",
+        "nombre": f"Juego {numero}",
+        "precio": 10.0 + numero,
+        "cantidad": 1 + numero,
+        "compania": "Nintendo",
+        "portada": "imagenes/portadas/x.png",
+        "fecha_publicacion": "2020-01-01",
+    }
+    juego.update(campos)
+    return juego
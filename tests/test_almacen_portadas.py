@@ -0,0 +1,123 @@
+import pytest
+
+from src import almacen_portadas
+from src.migracion_portadas import migrar_portadas
+
+NOMBRE = "ab" + "0" * 62 + ".png"
+
+
+def instalar(almacen, tmp_path, nombre, contenido):
+    temporal = tmp_path / ".subida-prueba.tmp"
+    temporal.write_bytes(contenido)
+    almacen.instalar(temporal, nombre)
+
+
+def test_particionada_guarda_en_subcarpetas_y_encuentra_las_planas(tmp_path):
+    almacen = almacen_portadas.crear_almacen(tmp_path, "particionada")
+    instalar(almacen, tmp_path, NOMBRE, b"portada")
+    (tmp_path / "suelta.png").write_bytes(b"vieja")
+
+    assert (tmp_path / "ab" / NOMBRE).read_bytes() == b"portada"
+    assert almacen.leer("suelta.png") == b"vieja"
+    assert not almacen.en_su_lugar("suelta.png")
+    assert sorted(almacen.recorrer()) == sorted([NOMBRE, "suelta.png"])
+
+
+def test_paquetes_leen_y_recuperan_el_indice(tmp_path):
+    almacen = almacen_portadas.crear_almacen(tmp_path, "paquetes")
+    instalar(almacen, tmp_path, NOMBRE, b"portada")
+    instalar(almacen, tmp_path, "otra.jpg", b"x" * 10)
+    almacen.cerrar()
+
+    reabierto = almacen_portadas.AlmacenPaquetes(tmp_path)
+    assert reabierto.leer(NOMBRE) == b"portada"
+    with reabierto.abrir("otra.jpg") as f:
+        assert f.read() == b"x" * 10
+    assert not (tmp_path / "ab").exists()
+    assert len(list((tmp_path / "paquetes").glob("paquete-*.bin"))) == 1
+    reabierto.cerrar()
+
+
+def test_paquetes_no_guardan_miniaturas_ni_archivos_grandes(tmp_path):
+    almacen = almacen_portadas.AlmacenPaquetes(tmp_path, tamano_maximo=4)
+    instalar(almacen, tmp_path, "grande.png", b"12345")
+    instalar(almacen, tmp_path, "chica.min.jpg", b"1")
+
+    assert not almacen.empaquetada("grande.png")
+    assert not almacen.empaquetada("chica.min.jpg")
+    assert (tmp_path / "gr" / "grande.png").exists()
+    assert (tmp_path / "ch" / "chica.min.jpg").exists()
+
+
+def test_compactar_libera_el_espacio_de_las_eliminadas(tmp_path):
+    almacen = almacen_portadas.AlmacenPaquetes(tmp_path, tamano_paquete=16)
+    instalar(almacen, tmp_path, "a.png", b"a" * 10)
+    instalar(almacen, tmp_path, "b.png", b"b" * 10)
+    instalar(almacen, tmp_path, "c.png", b"c" * 10)
+
+    # Los bytes empaquetados se liberan al compactar
+    assert almacen.eliminar("a.png") == 0
+    assert almacen.compactar() == 10
+    assert not almacen.existe("a.png")
+    assert almacen.leer("b.png") == b"b" * 10
+    assert almacen.leer("c.png") == b"c" * 10
+    almacen.cerrar()
+
+    reabierto = almacen_portadas.AlmacenPaquetes(tmp_path, tamano_paquete=16)
+    assert sorted(reabierto.recorrer()) == ["b.png", "c.png"]
+    reabierto.cerrar()
+
+
+def test_servicios_de_la_misma_carpeta_comparten_el_almacen(tmp_path):
+    from src.servicio_imagenes import servicio_imagenes
+
+    uno = servicio_imagenes(carpeta=tmp_path, organizacion="paquetes")
+    otro = servicio_imagenes(carpeta=tmp_path, organizacion="paquetes")
+    instalar(uno.almacen, tmp_path, "a.png", b"a" * 10)
+    instalar(uno.almacen, tmp_path, "b.png", b"b" * 10)
+    uno.almacen.eliminar("a.png")
+    uno.almacen.compactar()
+
+    # El otro servicio ve la compactación: no lee desplazamientos viejos
+    assert otro.almacen is uno.almacen
+    assert otro.leer_portada("imagenes/portadas/b.png") == b"b" * 10
+    assert not otro.almacen.existe("a.png")
+    uno.almacen.cerrar()
+
+
+def test_organizacion_desconocida(tmp_path):
+    with pytest.raises(ValueError):
+        almacen_portadas.crear_almacen(tmp_path, "nubes")
+
+
+@pytest.mark.parametrize("organizacion", ["particionada", "paquetes", "plana"])
+def test_migracion_deja_cada_portada_en_un_solo_lugar(tmp_path, organizacion):
+    (tmp_path / NOMBRE).write_bytes(b"plana")
+    instalar(
+        almacen_portadas.AlmacenParticionado(tmp_path), tmp_path, "cd.png", b"part"
+    )
+    paquetes = almacen_portadas.AlmacenPaquetes(tmp_path)
+    instalar(paquetes, tmp_path, "ef.png", b"paquete")
+    paquetes.cerrar()
+    portadas = [f"imagenes/portadas/{n}" for n in (NOMBRE, "cd.png", "ef.png")]
+
+    resultado = migrar_portadas(organizacion, tmp_path, portadas)
+
+    assert resultado["ok"] and resultado["faltantes"] == []
+    destino = almacen_portadas.crear_almacen(tmp_path, organizacion)
+    contenidos = {NOMBRE: b"plana", "cd.png": b"part", "ef.png": b"paquete"}
+    for nombre, contenido in contenidos.items():
+        assert destino.en_su_lugar(nombre)
+        assert destino.leer(nombre) == contenido
+    assert sorted(destino.recorrer()) == sorted(contenidos)
+    assert not list(tmp_path.glob(".*"))
+
+    # Una segunda pasada no tiene nada que mover
+    assert migrar_portadas(organizacion, tmp_path, portadas)["movidas"] == 0
+
+
+def test_migracion_informa_portadas_faltantes(tmp_path):
+    resultado = migrar_portadas("plana", tmp_path, ["imagenes/portadas/nada.png"])
+
+    assert not resultado["ok"]
+    assert resultado["faltantes"] == ["imagenes/portadas/nada.png"]
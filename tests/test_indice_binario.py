@@ -0,0 +1,54 @@
+import pytest
+
+from src import indice_binario
+from src.indice_binario import ErrorIndiceBinario, IndiceBinario
+from src.tabla_hash import VERSION_HASH_ACTUAL, hash_blake2b
+
+
+def escribir(ruta, pares):
+    indice_binario.escribir(
+        ruta,
+        pares,
+        tamano=100,
+        version_hash=VERSION_HASH_ACTUAL,
+        valor_hash=hash_blake2b,
+        metadatos={"redimensionamientos": [{"de": 100, "a": 200}]},
+    )
+
+
+def test_se_consulta_sobre_el_archivo(tmp_path):
+    ruta = tmp_path / "tabla_hash.idx"
+    pares = [(f"juego-{i}", i) for i in range(1000)] + [("ñandú", 1000)]
+    escribir(ruta, pares)
+
+    with IndiceBinario(ruta, hash_blake2b) as indice:
+        assert indice.version_hash == VERSION_HASH_ACTUAL
+        assert (indice.tamano, indice.total_elementos) == (100, 1001)
+        assert indice.buscar("juego-537") == 537
+        assert indice.buscar("ñandú") == 1000
+        assert indice.buscar("juego-1000") is None
+        assert sorted(indice.entradas(), key=lambda par: par[1]) == pares
+        assert indice.metadatos()["redimensionamientos"][0]["a"] == 200
+
+
+def test_huella_depende_del_orden_de_los_ids(tmp_path):
+    ruta = tmp_path / "tabla_hash.idx"
+    escribir(ruta, [("b", 1), ("a", 0)])
+
+    with IndiceBinario(ruta, hash_blake2b) as indice:
+        assert indice.huella == indice_binario.huella_ids(["a", "b"])
+        assert indice.huella != indice_binario.huella_ids(["b", "a"])
+    # Posiciones con huecos o repetidas: el índice no es de ningún inventario
+    assert indice_binario.huella_pares([("a", 0), ("b", 0)]) is None
+    assert indice_binario.huella_pares([("a", 1)]) is None
+
+
+def test_archivo_truncado_o_ajeno_se_rechaza(tmp_path):
+    ruta = tmp_path / "tabla_hash.idx"
+    escribir(ruta, [("a", 0)])
+    datos = ruta.read_bytes()
+
+    for contenido in (b"", datos[:50], datos[:-3], b"x" * len(datos)):
+        ruta.write_bytes(contenido)
+        with pytest.raises(ErrorIndiceBinario):
+            IndiceBinario(ruta, hash_blake2b)
@@ -0,0 +1,23 @@
+from src.indice_ordenado import IndiceOrdenado
+
+
+def test_prefijo_en_orden_y_se_actualiza():
+    indice = IndiceOrdenado(lambda juego: juego["compania"].lower())
+    indice.construir(
+        [
+            {"id": "a", "compania": "Nintendo"},
+            {"id": "b", "compania": "Namco"},
+            {"id": "c", "compania": "Nintendo EPD"},
+            {"id": "d", "compania": "Sega"},
+        ]
+    )
+
+    assert list(indice.prefijo("nin")) == ["a", "c"]
+    assert list(indice.prefijo("n")) == ["b", "a", "c"]
+    assert list(indice.prefijo("x")) == []
+
+    indice.eliminar("a")
+    indice.agregar({"id": "c", "compania": "Sega AM2"})
+    assert list(indice.prefijo("n")) == ["b"]
+    assert list(indice.prefijo("sega")) == ["d", "c"]
+    assert len(indice) == 3
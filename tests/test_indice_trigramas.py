@@ -0,0 +1,53 @@
+import threading
+
+from src.indice_trigramas import IndiceTrigramas
+
+
+def test_busca_subcadenas_y_se_actualiza():
+    indice = IndiceTrigramas()
+    indice.construir(
+        [
+            {"id": "a", "nombre": "Super Mario Odyssey"},
+            {"id": "b", "nombre": "Mario Kart 8"},
+            {"id": "c", "nombre": "Metroid Dread"},
+            {"id": "d", "nombre": "Go"},
+        ]
+    )
+
+    assert sorted(indice.buscar(" MARIO ")) == ["a", "b"]
+    assert sorted(indice.buscar("o")) == ["a", "b", "c", "d"]
+    assert indice.buscar("rio x") == []
+
+    indice.eliminar("a")
+    indice.agregar({"id": "e", "nombre": "Paper Mario"})
+    assert sorted(indice.buscar("mario")) == ["b", "e"]
+
+
+def test_busquedas_concurrentes_con_escrituras():
+    indice = IndiceTrigramas()
+    indice.construir({"id": str(i), "nombre": f"Mario {i}"} for i in range(200))
+    errores = []
+    terminar = threading.Event()
+
+    def buscar():
+        while not terminar.is_set():
+            try:
+                indice.buscar("mario")
+                indice.buscar("ma")
+            except RuntimeError as e:
+                errores.append(e)
+                return
+
+    lectores = [threading.Thread(target=buscar) for _ in range(2)]
+    for lector in lectores:
+        lector.start()
+    for vuelta in range(20):
+        for i in range(200):
+            indice.eliminar(str(i))
+            indice.agregar({"id": str(i), "nombre": f"Mario {i + vuelta}"})
+    terminar.set()
+    for lector in lectores:
+        lector.join()
+
+    assert errores == []
+    assert len(indice.buscar("mario")) == 200
@@ -0,0 +1,27 @@
+from src.inventario_columnar import InventarioColumnar
+from tests.conftest import juego_de_prueba
+
+
+def test_filas_como_dicts_y_cambios_por_posicion():
+    juegos = [juego_de_prueba(i) for i in range(4)]
+    irregular = dict(juego_de_prueba(9), precio="gratis", extra=True)
+    inventario = InventarioColumnar(juegos + [irregular])
+
+    assert list(inventario) == juegos + [irregular]
+    assert inventario[1]["compania"] is inventario[2]["compania"]
+    assert inventario.id_en(4) == "id-9"
+
+    # Un dict devuelto es una copia: hay que asignarlo para cambiar la fila
+    fila = inventario[0]
+    fila["cantidad"] = 99
+    assert inventario[0]["cantidad"] == 1
+    inventario[0] = fila
+    assert inventario[0]["cantidad"] == 99
+
+    inventario[1] = inventario[-1]
+    inventario.pop()
+    assert inventario.ids == ["id-0", "id-9", "id-2", "id-3"]
+    assert inventario[1] == irregular
+    del inventario[0]
+    assert inventario[0] == irregular
+    assert inventario.copy()[1:] == juegos[2:]
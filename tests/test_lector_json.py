@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from src.lector_json import (
+    ErrorLecturaJSON,
+    NoEsArregloJSON,
+    iterar_arreglo,
+    leer_bloques_arreglo,
+)
+
+
+def test_lee_elementos_partidos_entre_bloques():
+    datos = [{"id": "a", "nombre": "Zelda [BotW]"}, 12345, "x, y", [], {}]
+    texto = json.dumps(datos, indent=4)
+
+    assert list(iterar_arreglo(io.StringIO(texto), tamano_bloque=3)) == datos
+    assert list(iterar_arreglo(io.StringIO(" [ ] "))) == []
+
+
+@pytest.mark.parametrize(
+    "texto", ['[{"id": 1},]', '[{"id": 1} {"id": 2}]', '[{"id": 1}] x', '[{"id"']
+)
+def test_json_invalido(texto):
+    with pytest.raises(ErrorLecturaJSON):
+        list(iterar_arreglo(io.StringIO(texto), tamano_bloque=4))
+
+
+def test_no_arreglo_y_elemento_demasiado_grande():
+    with pytest.raises(NoEsArregloJSON):
+        list(iterar_arreglo(io.StringIO('{"id": 1}')))
+    with pytest.raises(ErrorLecturaJSON):
+        texto = '[{"nombre": "' + "x" * 100
+        list(iterar_arreglo(io.StringIO(texto), tamano_bloque=8, tamano_maximo=32))
+
+
+def test_bloques_cortados_en_cualquier_punto():
+    datos = [{"id": "a", "nombre": "Zelda {BotW}"}, {"x": {"y": [1, {}]}}, {}]
+    for texto in (json.dumps(datos, indent=4), json.dumps(datos), " [ ] "):
+        esperados = json.loads(texto)
+        for tamano in range(1, 60):
+            bloques = leer_bloques_arreglo(io.StringIO(texto), tamano_bloque=tamano)
+            assert [e for bloque in bloques for e in bloque] == esperados
+
+
+@pytest.mark.parametrize(
+    "texto",
+    ['[{"id": 1},]', '[{"id": 1} {"id": 2}]', '[{"id": 1}] x', '[{"id"', "[{}"],
+)
+def test_bloques_con_json_invalido(texto):
+    with pytest.raises(ErrorLecturaJSON):
+        list(leer_bloques_arreglo(io.StringIO(texto), tamano_bloque=4))
+    with pytest.raises(NoEsArregloJSON):
+        list(leer_bloques_arreglo(io.StringIO('{"id": 1}')))
@@ -0,0 +1,18 @@
+import pytest
+
+from src.modelos import Videojuego
+from tests.conftest import juego_de_prueba
+
+
+def test_slots_y_to_dict():
+    datos = juego_de_prueba(1)
+    juego = Videojuego(**datos)
+
+    assert not hasattr(juego, "__dict__")
+    assert juego.to_dict() == datos
+
+
+def test_fecha_invalida_se_rechaza_tambien_desde_la_cache():
+    for _ in range(2):
+        with pytest.raises(ValueError, match="YYYY-MM-DD"):
+            Videojuego(**juego_de_prueba(1, fecha_publicacion="2020-02-30"))
@@ -0,0 +1,397 @@
+import json
+
+from tests.conftest import juego_de_prueba
+
+
+def test_lecturas_repetidas_usan_la_cache(repositorio, monkeypatch):
+    repositorio.agregar_juego(juego_de_prueba(1))
+    lecturas = []
+    carga_original = json.load
+    monkeypatch.setattr(json, "load", lambda f: lecturas.append(f) or carga_original(f))
+
+    assert repositorio.buscar_por_id("id-1")["nombre"] == "Juego 1"
+    assert repositorio.juegos_existen()
+    assert len(repositorio.listar_juegos()) == 1
+    assert lecturas == []
+
+
+def test_cambio_externo_invalida_la_cache(repositorio):
+    repositorio.agregar_juego(juego_de_prueba(1))
+    assert len(repositorio.obtener_inventario()) == 1
+
+    otros = [juego_de_prueba(1), juego_de_prueba(2, nombre="Otro nombre largo")]
+    repositorio.ruta_archivo.write_text(json.dumps(otros), encoding="utf-8")
+
+    assert len(repositorio.obtener_inventario()) == 2
+
+
+def recargar(repositorio, monkeypatch):
+    """Descarta la caché para forzar la lectura desde disco"""
+    monkeypatch.setattr(repositorio, "_cache_inventario", None)
+    return repositorio.obtener_inventario()
+
+
+def test_journal_no_reescribe_el_inventario(repositorio, monkeypatch):
+    repositorio.agregar_juego(juego_de_prueba(1))
+    repositorio.checkpoint_inventario(esperar=True)
+    contenido = repositorio.ruta_archivo.read_text(encoding="utf-8")
+
+    for numero in range(2, 6):
+        repositorio.agregar_juego(juego_de_prueba(numero))
+    repositorio.eliminar_juego_por_id("id-2")
+
+    assert repositorio.ruta_archivo.read_text(encoding="utf-8") == contenido
+    ids = [juego["id"] for juego in recargar(repositorio, monkeypatch)]
+    assert ids == ["id-1", "id-5", "id-3", "id-4"]
+
+    repositorio.checkpoint_inventario(esperar=True)
+    assert not repositorio._ruta_journal().exists()
+    guardado = json.loads(repositorio.ruta_archivo.read_text(encoding="utf-8"))
+    assert [juego["id"] for juego in guardado] == ids
+
+
+def test_journal_reproducido_dos_veces_no_duplica(repositorio, monkeypatch):
+    for numero in range(1, 5):
+        repositorio.agregar_juego(juego_de_prueba(numero))
+    repositorio.eliminar_juego_por_id("id-1")
+    journal = repositorio._ruta_journal().read_text(encoding="utf-8")
+    repositorio.checkpoint_inventario(esperar=True)
+
+    # Corte tras escribir el checkpoint y antes de borrar el journal apartado
+    repositorio._ruta_journal_anterior().write_text(journal, encoding="utf-8")
+
+    ids = [juego["id"] for juego in recargar(repositorio, monkeypatch)]
+    assert ids == ["id-4", "id-2", "id-3"]
+
+
+def test_group_commit_agrupa_escrituras_concurrentes(repositorio, monkeypatch):
+    import threading
+
+    coordinador = repositorio.coordinador_commits
+    monkeypatch.setattr(coordinador, "ventana", 0.05)
+    commits_previos = coordinador.commits
+    barrera = threading.Barrier(8)
+
+    def agregar(numero):
+        barrera.wait()
+        repositorio.agregar_juego(juego_de_prueba(numero))
+
+    hilos = [threading.Thread(target=agregar, args=(n,)) for n in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert coordinador.commits - commits_previos < 8
+    assert len(repositorio._ruta_journal().read_text().splitlines()) == 8
+    assert len(repositorio.tabla_hash.archivo_log.read_text().splitlines()) == 8
+    assert len(recargar(repositorio, monkeypatch)) == 8
+    assert all(repositorio.buscar_por_id(f"id-{n}") for n in range(8))
+
+
+def test_politica_siempre_sincroniza_cada_commit(repositorio, monkeypatch):
+    import os
+
+    from src import durabilidad
+
+    sincronizados = []
+    monkeypatch.setattr(durabilidad, "politica", durabilidad.SIEMPRE)
+    monkeypatch.setattr(os, "fsync", sincronizados.append)
+
+    repositorio.agregar_juego(juego_de_prueba(1))
+
+    # journal del inventario y log de la tabla hash
+    assert len(sincronizados) == 2
+
+
+def test_politica_intervalo_sincroniza_la_ultima_escritura(tmp_path, monkeypatch):
+    import os
+    import time
+
+    from src import durabilidad
+
+    sincronizados = []
+    monkeypatch.setattr(durabilidad, "politica", durabilidad.INTERVALO)
+    monkeypatch.setattr(durabilidad, "INTERVALO_FSYNC", 0.05)
+    monkeypatch.setattr(
+        os, "fsync", lambda descriptor: sincronizados.append(os.fstat(descriptor))
+    )
+
+    ruta = tmp_path / "inventario.log"
+    ruta.touch()
+    inodo = ruta.stat().st_ino
+    for _ in range(2):
+        with open(ruta, "a") as f:
+            f.write("linea\n")
+            durabilidad.sincronizar(f)
+
+    # La segunda cae dentro de la ventana: queda pendiente hasta que vence
+    def propios():
+        return sum(estado.st_ino == inodo for estado in sincronizados)
+
+    assert propios() == 1
+    limite = time.monotonic() + 3
+    while propios() < 2 and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert propios() == 2
+
+
+def test_busqueda_por_nombre_devuelve_todas_las_coincidencias(repositorio):
+    repositorio.agregar_juegos_lote(
+        [
+            juego_de_prueba(1, nombre="Super Mario Odyssey"),
+            juego_de_prueba(2, nombre="Zelda"),
+            juego_de_prueba(3, nombre="Mario Kart 8"),
+        ]
+    )
+    assert [j["id"] for j in repositorio.buscar_todos_por_nombre("mario")] == [
+        "id-1",
+        "id-3",
+    ]
+
+    repositorio.eliminar_juego_por_id("id-1")
+    repositorio.agregar_juego(juego_de_prueba(4, nombre="Dr. Mario"))
+    assert [j["id"] for j in repositorio.buscar_todos_por_nombre("MARIO")] == [
+        "id-3",
+        "id-4",
+    ]
+    assert repositorio.buscar_por_nombre("zel")["id"] == "id-2"
+
+
+def test_busqueda_por_compania_usa_prefijo(repositorio):
+    repositorio.agregar_juegos_lote(
+        [
+            juego_de_prueba(1, compania="Nintendo"),
+            juego_de_prueba(2, compania="Sega"),
+            juego_de_prueba(3, compania="nintendo EPD"),
+        ]
+    )
+    assert [j["id"] for j in repositorio.buscar_por_compania("NIN")] == [
+        "id-1",
+        "id-3",
+    ]
+
+    repositorio.eliminar_juego_por_id("id-1")
+    assert [j["id"] for j in repositorio.buscar_por_compania("nin")] == ["id-3"]
+    assert repositorio.buscar_por_compania("capcom") == []
+
+
+def test_listado_por_nombre_se_mantiene_ordenado(repositorio):
+    repositorio.agregar_juegos_lote(
+        [
+            juego_de_prueba(1, nombre="zelda"),
+            juego_de_prueba(2, nombre="Animal Crossing"),
+            juego_de_prueba(3, nombre="Metroid"),
+        ]
+    )
+    repositorio.agregar_juego(juego_de_prueba(4, nombre="Bayonetta"))
+    repositorio.eliminar_juego_por_id("id-3")
+
+    nombres = [j["nombre"] for j in repositorio.listar_juegos_por_nombre()]
+    assert nombres == ["Animal Crossing", "Bayonetta", "zelda"]
+    pagina = repositorio.listar_juegos_por_nombre(inicio=1, limite=1)
+    assert [j["id"] for j in pagina] == ["id-4"]
+
+
+def test_rangos_de_precio_y_fecha_son_perezosos_y_paginan(repositorio):
+    repositorio.agregar_juegos_lote(
+        [
+            juego_de_prueba(1, precio=45.0, fecha_publicacion="2017-03-03"),
+            juego_de_prueba(2, precio=20, fecha_publicacion="2015-06-01"),
+            juego_de_prueba(3, precio=39.99, fecha_publicacion="2019-01-01"),
+            juego_de_prueba(4, precio=25.5, fecha_publicacion="2018-12-31"),
+        ]
+    )
+
+    en_rango = repositorio.buscar_por_rango_precio(20, 40)
+    assert next(en_rango)["id"] == "id-2"
+    assert [j["id"] for j in en_rango] == ["id-4", "id-3"]
+    pagina = repositorio.buscar_por_rango_precio(20, 40, inicio=1, limite=1)
+    assert [j["id"] for j in pagina] == ["id-4"]
+
+    repositorio.eliminar_juego_por_id("id-4")
+    fechas = repositorio.buscar_por_rango_fecha("2015-01-01", "2018-12-31")
+    assert [j["id"] for j in fechas] == ["id-2", "id-1"]
+    assert [
+        j["id"] for j in repositorio.buscar_por_rango_fecha(desde="2018-01-01")
+    ] == ["id-3"]
+
+
+def test_importacion_por_bloques_se_instala_de_una_vez(repositorio, tmp_path):
+    repositorio.agregar_juego(juego_de_prueba(1))
+    nuevos = [juego_de_prueba(i) for i in range(2, 6)]
+    archivo = tmp_path / "importar.json"
+
+    archivo.write_text(json.dumps(nuevos[:2] + [{"id": "roto"}]), encoding="utf-8")
+    resultado = repositorio.cargar_inventario_desde_archivo(str(archivo))
+    assert not resultado["ok"]
+    assert resultado["error"] == "Juego 2 falta el campo: nombre"
+    assert [j["id"] for j in repositorio.listar_juegos()] == ["id-1"]
+
+    archivo.write_text(json.dumps(nuevos), encoding="utf-8")
+    resultado = repositorio.cargar_inventario_desde_archivo(str(archivo))
+    assert resultado["ok"] and resultado["total_juegos"] == 4
+    assert repositorio.ruta_archivo.read_text(encoding="utf-8") == json.dumps(
+        nuevos, indent=4, ensure_ascii=False
+    )
+    assert repositorio.buscar_por_id("id-5")["id"] == "id-5"
+    assert repositorio.buscar_por_id("id-1") is None
+    assert not list(tmp_path.glob("*.importacion"))
+
+
+def test_importaciones_simultaneas_instalan_un_archivo_completo(repositorio):
+    import threading
+
+    lotes = [
+        [juego_de_prueba(i, nombre=f"Lote {lote}") for i in range(3000)]
+        for lote in range(2)
+    ]
+    resultados = []
+    hilos = [
+        threading.Thread(
+            target=lambda datos=json.dumps(juegos): resultados.append(
+                repositorio.cargar_inventario_desde_datos(datos)
+            )
+        )
+        for juegos in lotes
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert all(resultado["ok"] for resultado in resultados)
+    instalado = json.loads(repositorio.ruta_archivo.read_text(encoding="utf-8"))
+    assert instalado in lotes
+    assert len(repositorio.listar_juegos()) == 3000
+    assert not list(repositorio.ruta_archivo.parent.glob("*.importacion"))
+
+
+def test_tabla_hash_que_no_corresponde_se_reconstruye(repositorio):
+    juegos = [juego_de_prueba(i) for i in range(3)]
+    repositorio.ruta_archivo.write_text(json.dumps(juegos), encoding="utf-8")
+    repositorio.tabla_hash.agregar("id-0", 2)
+
+    assert repositorio.buscar_por_id("id-0")["nombre"] == "Juego 0"
+    assert repositorio.tabla_hash.buscar_posicion("id-2") == 2
+    assert repositorio.tabla_hash.huella() == repositorio.huella_ids(
+        ["id-0", "id-1", "id-2"]
+    )
+
+
+def test_referencias_de_portadas_siguen_altas_y_bajas(repositorio):
+    repositorio.agregar_juego(juego_de_prueba(1, portada="imagenes/portadas/a.png"))
+    repositorio.agregar_juego(juego_de_prueba(2, portada="imagenes/portadas/a.png"))
+    repositorio.agregar_juego(juego_de_prueba(3, portada="imagenes/portadas/b.png"))
+    assert repositorio.referencias_portada("a.png") == 2
+
+    repositorio.eliminar_juego_por_id("id-1")
+    repositorio.eliminar_juego_por_id("id-3")
+    assert repositorio.referencias_portada("a.png") == 1
+    assert not repositorio.portada_referenciada("b.png")
+
+
+def test_verificador_de_portadas_no_vuelve_a_mirar_el_disco(repositorio, monkeypatch):
+    repositorio.agregar_juego(juego_de_prueba(1, portada="imagenes/portadas/a.png"))
+    referenciada = repositorio.verificador_portadas()
+
+    def sin_disco():
+        raise AssertionError("se volvió a validar el inventario")
+
+    monkeypatch.setattr(repositorio, "_firma_archivo", sin_disco)
+    assert referenciada("a.png")
+    assert not referenciada("b.png")
+    # El atajo de guardar_imagen tampoco valida el inventario
+    assert repositorio.portada_indexada("a.png")
+    assert not repositorio.portada_indexada("b.png")
+
+
+def test_version_de_datos_cambia_solo_con_los_datos(repositorio):
+    repositorio.agregar_juego(juego_de_prueba(1))
+    version = repositorio.version_datos()
+
+    repositorio.listar_juegos()
+    repositorio.buscar_por_id("id-1")
+    repositorio.obtener_estadisticas_tabla_hash()
+    assert repositorio.version_datos() == version
+
+    repositorio.agregar_juegos_lote([juego_de_prueba(2), juego_de_prueba(3)])
+    assert repositorio.version_datos() > version
+    version = repositorio.version_datos()
+
+    repositorio.eliminar_juego_por_id("id-2")
+    assert repositorio.version_datos() > version
+    version = repositorio.version_datos()
+
+    # Un cambio hecho desde fuera se nota sin leer el archivo
+    otros = [juego_de_prueba(4)]
+    repositorio.ruta_archivo.write_text(json.dumps(otros), encoding="utf-8")
+    repositorio._ruta_journal().unlink(missing_ok=True)
+    assert repositorio.version_datos() > version
+    assert [j["id"] for j in repositorio.listar_juegos()] == ["id-4"]
+
+
+def test_escrituras_durante_el_checkpoint_no_se_pierden(repositorio, monkeypatch):
+    import threading
+
+    for numero in range(1, 4):
+        repositorio.agregar_juego(juego_de_prueba(numero))
+    escribiendo, seguir = threading.Event(), threading.Event()
+    escribir = repositorio._escribir_checkpoint
+
+    def escribir_lento(inventario):
+        escribiendo.set()
+        seguir.wait(5)
+        escribir(inventario)
+
+    monkeypatch.setattr(repositorio, "_escribir_checkpoint", escribir_lento)
+    inventario = repositorio.obtener_inventario()
+    repositorio.checkpoint_inventario()
+    assert escribiendo.wait(5)
+
+    # Lecturas y escrituras mientras se escribe el checkpoint
+    assert repositorio.obtener_inventario() is inventario
+    repositorio.agregar_juego(juego_de_prueba(4))
+    assert repositorio.buscar_por_id("id-4")["nombre"] == "Juego 4"
+    seguir.set()
+    repositorio._hilo_checkpoint.join(5)
+
+    repositorio.agregar_juego(juego_de_prueba(5))
+    assert repositorio.obtener_inventario() is inventario
+    assert repositorio.tabla_hash.buscar_posicion("id-5") == 4
+    assert repositorio.eliminar_juego_por_id("id-4")
+    ids = [juego["id"] for juego in recargar(repositorio, monkeypatch)]
+    assert ids == ["id-1", "id-2", "id-3", "id-5"]
+
+
+def test_relectura_espera_al_checkpoint_en_curso(repositorio, monkeypatch):
+    import threading
+
+    for numero in range(1, 4):
+        repositorio.agregar_juego(juego_de_prueba(numero))
+    escribiendo, seguir = threading.Event(), threading.Event()
+    escribir = repositorio._escribir_checkpoint
+
+    def escribir_lento(inventario):
+        escribiendo.set()
+        seguir.wait(5)
+        escribir(inventario)
+
+    monkeypatch.setattr(repositorio, "_escribir_checkpoint", escribir_lento)
+    repositorio.checkpoint_inventario()
+    assert escribiendo.wait(5)
+
+    # Sin caché hay que releer: no mientras el journal apartado se borra
+    monkeypatch.setattr(repositorio, "_cache_inventario", None)
+    leidos = []
+    lector = threading.Thread(
+        target=lambda: leidos.append(repositorio.obtener_inventario().ids)
+    )
+    lector.start()
+    lector.join(0.2)
+    assert lector.is_alive()
+
+    seguir.set()
+    lector.join(5)
+    assert leidos == [["id-1", "id-2", "id-3"]]
+    assert not repositorio._ruta_journal_anterior().exists()
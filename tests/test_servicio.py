@@ -0,0 +1,104 @@
+import threading
+from io import BytesIO
+
+from tests.conftest import juego_de_prueba
+
+
+def portada_falsa(contenido=b"portada"):
+    archivo = BytesIO(contenido)
+    archivo.name = "portada.png"
+    return archivo
+
+
+def test_lote_informa_cada_elemento(repositorio):
+    from src import servicio
+
+    juegos = [
+        {
+            "nombre": f"Juego {i}",
+            "precio": 19.99,
+            "cantidad": 3,
+            "compania": "Sega",
+            "portada": portada_falsa(),
+            "fecha_publicacion": "2019-05-01",
+        }
+        for i in range(3)
+    ]
+    juegos[1]["fecha_publicacion"] = "01/05/2019"
+
+    resultado = servicio.agregar_videojuegos_lote(juegos)
+
+    assert (resultado["agregados"], resultado["errores"]) == (2, 1)
+    assert resultado["resultados"][1] == {
+        "indice": 1,
+        "ok": False,
+        "error": "La fecha debe tener el formato YYYY-MM-DD",
+    }
+    for item in (resultado["resultados"][0], resultado["resultados"][2]):
+        assert repositorio.buscar_por_id(item["id"])["compania"] == "Sega"
+    assert len(repositorio._ruta_journal().read_text().splitlines()) == 2
+
+
+def test_lote_informa_elementos_que_no_son_juegos(repositorio):
+    from src import servicio
+
+    valido = {
+        "nombre": "Juego",
+        "precio": 19.99,
+        "cantidad": 3,
+        "compania": "Sega",
+        "portada": portada_falsa(),
+        "fecha_publicacion": "2019-05-01",
+    }
+    juegos = ["no es un juego", dict(valido, portada="portadas/x.png"), valido]
+
+    resultado = servicio.agregar_videojuegos_lote(juegos)
+
+    assert (resultado["agregados"], resultado["errores"]) == (1, 2)
+    assert [item["ok"] for item in resultado["resultados"]] == [False, False, True]
+    assert resultado["resultados"][0]["error"] == "Elemento 0 no es un objeto válido"
+    assert servicio.esperar_portadas(timeout=5)["ok"]
+
+
+def test_listar_pagina_devuelve_solo_la_pagina_pedida(repositorio):
+    from src import servicio
+
+    repositorio.agregar_juegos_lote(
+        [juego_de_prueba(i, nombre=f"Juego {chr(ord('z') - i)}") for i in range(5)]
+    )
+
+    resultado = servicio.listar_pagina(2, tamano_pagina=2)
+    assert resultado["ok"]
+    assert [j["id"] for j in resultado["resultado"]] == ["id-2", "id-3"]
+    assert (resultado["pagina"], resultado["total_paginas"]) == (2, 3)
+    assert resultado["total"] == 5
+
+    ordenada = servicio.listar_pagina(9, tamano_pagina=2, ordenar_por_nombre=True)
+    assert ordenada["pagina"] == 3
+    assert [j["id"] for j in ordenada["resultado"]] == ["id-0"]
+
+
+def test_portada_que_no_se_escribe_quita_el_juego(repositorio, monkeypatch):
+    from src import servicio
+
+    liberar = threading.Event()
+
+    def instalar_roto(temporal, destino):
+        liberar.wait(5)
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(servicio.servicio_img.almacen, "instalar", instalar_roto)
+    resultado = servicio.agregar_videojuego(
+        "Juego", 19.99, 3, "Sega", portada_falsa(b"rota"), "2019-05-01"
+    )
+    assert resultado["ok"]
+    assert repositorio.buscar_por_id(resultado["id"]) is not None
+
+    liberar.set()
+    assert servicio.esperar_portadas(timeout=5)["ok"]
+    assert repositorio.buscar_por_id(resultado["id"]) is None
+    fallidas = servicio.obtener_portadas_fallidas()["resultado"]
+    assert fallidas == [
+        {"id": resultado["id"], "nombre": "Juego", "error": "disco lleno"}
+    ]
+    assert servicio.obtener_portadas_fallidas()["resultado"] == []
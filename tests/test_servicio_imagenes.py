@@ -0,0 +1,262 @@
+import hashlib
+import io
+import threading
+
+import pytest
+
+from src import servicio_imagenes as modulo
+from src.config import RUTA_RELATIVA_PORTADAS
+
+
+@pytest.fixture
+def servicio(tmp_path):
+    return modulo.servicio_imagenes(carpeta=tmp_path)
+
+
+class ArchivoPorBloques(io.BytesIO):
+    """Archivo que anota el tamaño de cada lectura"""
+
+    def __init__(self, contenido):
+        super().__init__(contenido)
+        self.lecturas = []
+
+    def read(self, tamano=-1):
+        self.lecturas.append(tamano)
+        return super().read(tamano)
+
+
+def test_guarda_por_bloques_con_el_hash_como_nombre(servicio, tmp_path, monkeypatch):
+    monkeypatch.setattr(modulo, "TAMANO_BLOQUE_IMAGEN", 1000)
+    contenido = bytes(range(256)) * 20
+    archivo = ArchivoPorBloques(contenido)
+    archivo.read(10)
+
+    ruta = servicio.guardar_imagen(archivo, "Portada.PNG")
+
+    nombre = hashlib.sha256(contenido).hexdigest() + ".png"
+    assert ruta == f"{RUTA_RELATIVA_PORTADAS}/{nombre}"
+    assert (tmp_path / nombre).read_bytes() == contenido
+    assert set(archivo.lecturas[1:]) == {1000}
+    assert [p.name for p in tmp_path.iterdir()] == [nombre]
+
+
+def test_subidas_simultaneas_de_la_misma_portada(servicio, tmp_path):
+    contenido = b"imagen" * 50_000
+    rutas = []
+    hilos = [
+        threading.Thread(
+            target=lambda: rutas.append(
+                servicio.guardar_imagen(io.BytesIO(contenido), "x.jpg")
+            )
+        )
+        for _ in range(8)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(set(rutas)) == 1
+    archivos = list(tmp_path.iterdir())
+    assert len(archivos) == 1 and archivos[0].read_bytes() == contenido
+
+
+def test_error_al_leer_no_deja_temporales(servicio, tmp_path):
+    class ArchivoRoto(io.BytesIO):
+        def read(self, tamano=-1):
+            raise OSError("lectura interrumpida")
+
+    with pytest.raises(OSError):
+        servicio.guardar_imagen(ArchivoRoto(b"x"), "x.png")
+    assert list(tmp_path.iterdir()) == []
+
+
+def imagen_png(ancho, alto, modo="RGBA"):
+    from PIL import Image
+
+    salida = io.BytesIO()
+    Image.new(modo, (ancho, alto), (200, 30, 30, 128)[: len(modo)]).save(
+        salida, format="PNG"
+    )
+    return salida.getvalue()
+
+
+def test_guardar_crea_la_miniatura_junto_a_la_original(servicio, tmp_path):
+    from PIL import Image
+
+    ruta = servicio.guardar_imagen(io.BytesIO(imagen_png(600, 900)), "x.png")
+
+    nombre = ruta.rsplit("/", 1)[1]
+    miniatura = servicio.ruta_miniatura(ruta)
+    assert miniatura.name == nombre.split(".")[0] + modulo.SUFIJO_MINIATURA
+    with Image.open(miniatura) as imagen:
+        assert imagen.format == "JPEG"
+        assert imagen.size == (80, 120)
+
+
+def test_segundo_plano_sin_miniatura_la_deja_para_cuando_se_muestra(servicio, tmp_path):
+    ruta, escritura = servicio.guardar_imagen_en_segundo_plano(
+        io.BytesIO(imagen_png(600, 900)), "x.png", miniatura=False
+    )
+    escritura.result(timeout=5)
+    assert not list(tmp_path.glob("*" + modulo.SUFIJO_MINIATURA))
+
+    assert servicio.ruta_miniatura(ruta).exists()
+    servicio.cerrar()
+
+
+def test_miniatura_de_portadas_anteriores_se_genera_al_pedirla(servicio, tmp_path):
+    original = tmp_path / "abc.png"
+    original.write_bytes(imagen_png(300, 300, "RGB"))
+
+    miniatura = servicio.ruta_miniatura("imagenes/portadas/abc.png")
+    assert miniatura == tmp_path / "abc.min.jpg" and miniatura.exists()
+    assert servicio.ruta_miniatura("imagenes/portadas/otra.png") is None
+    assert servicio.ruta_miniatura("") is None
+
+    # Si no es una imagen legible se muestra la original
+    (tmp_path / "rota.png").write_bytes(b"no es una imagen")
+    assert servicio.ruta_miniatura("imagenes/portadas/rota.png").name == "rota.png"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "abc.min.jpg",
+        "abc.png",
+        "rota.png",
+    ]
+
+
+def test_portada_conocida_no_se_consulta_en_disco(tmp_path, monkeypatch):
+    servicio = modulo.servicio_imagenes(
+        referenciada=lambda nombre: True, carpeta=tmp_path
+    )
+    consultas = []
+    monkeypatch.setattr(
+        modulo.Path, "exists", lambda ruta: consultas.append(ruta) or True
+    )
+
+    servicio.guardar_imagen(io.BytesIO(b"portada"), "x.png")
+
+    assert consultas == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_recolector_borra_huerfanas_pasada_la_gracia(tmp_path):
+    usadas = {"usada.png"}
+    servicio = modulo.servicio_imagenes(
+        referenciada=usadas.__contains__, carpeta=tmp_path
+    )
+    for nombre in ("usada.png", "huerfana.png", "huerfana.min.jpg"):
+        (tmp_path / nombre).write_bytes(b"x" * 100)
+    (tmp_path / ".subida-1.tmp").write_bytes(b"x" * 10)
+
+    # Recién modificadas: la gracia las protege
+    resultado = servicio.recolectar_huerfanas(limite=None)
+    assert resultado["eliminadas"] == 0 and resultado["completa"]
+
+    resultado = servicio.recolectar_huerfanas(limite=None, gracia=-1)
+    assert resultado == {
+        "revisadas": 4,
+        "eliminadas": 2,
+        "bytes_liberados": 210,
+        "completa": True,
+    }
+    assert [p.name for p in tmp_path.iterdir()] == ["usada.png"]
+
+
+def test_recolector_avanza_por_pasos(tmp_path):
+    validaciones = []
+
+    def referencias():
+        # Una validación del inventario por paso, no una por archivo
+        validaciones.append(1)
+        return lambda nombre: False
+
+    servicio = modulo.servicio_imagenes(referencias=referencias, carpeta=tmp_path)
+    for i in range(5):
+        (tmp_path / f"{i}.png").write_bytes(b"x")
+
+    pasos = []
+    while not pasos or not pasos[-1]["completa"]:
+        pasos.append(servicio.recolectar_huerfanas(limite=2, gracia=-1))
+
+    assert [paso["revisadas"] for paso in pasos] == [2, 2, 1]
+    assert len(validaciones) == len(pasos)
+    assert sum(paso["eliminadas"] for paso in pasos) == 5
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_escritura_en_segundo_plano_devuelve_la_ruta_antes(servicio, tmp_path):
+    contenido = b"portada lenta"
+    nombre = hashlib.sha256(contenido).hexdigest() + ".png"
+    liberar = threading.Event()
+    instalar = servicio.almacen.instalar
+
+    def instalar_lento(temporal, destino):
+        liberar.wait(5)
+        instalar(temporal, destino)
+
+    servicio.almacen.instalar = instalar_lento
+    ruta, escritura = servicio.guardar_imagen_en_segundo_plano(
+        io.BytesIO(contenido), "a.png"
+    )
+    _, repetida = servicio.guardar_imagen_en_segundo_plano(
+        io.BytesIO(contenido), "b.png"
+    )
+
+    assert ruta == f"{RUTA_RELATIVA_PORTADAS}/{nombre}"
+    assert repetida is escritura
+    assert not (tmp_path / nombre).exists()
+    assert not servicio.esperar_escrituras(timeout=0.01)
+
+    liberar.set()
+    assert servicio.esperar_escrituras(timeout=5)
+    assert escritura.result() == ruta
+    assert (tmp_path / nombre).read_bytes() == contenido
+    assert not list(tmp_path.glob(".subida-*"))
+    servicio.cerrar()
+
+
+def test_escritura_en_segundo_plano_lee_solo_con_lugar_libre(servicio, tmp_path):
+    liberar = threading.Event()
+    instalar = servicio.almacen.instalar
+    servicio._cupos = threading.BoundedSemaphore(1)
+
+    def instalar_lento(temporal, destino):
+        liberar.wait(5)
+        instalar(temporal, destino)
+
+    class Subida(io.BytesIO):
+        leida = threading.Event()
+
+        def read(self, *args):
+            self.leida.set()
+            return super().read(*args)
+
+    servicio.almacen.instalar = instalar_lento
+    servicio.guardar_imagen_en_segundo_plano(io.BytesIO(b"primera"), "a.png")
+    segunda = Subida(b"segunda")
+    hilo = threading.Thread(
+        target=servicio.guardar_imagen_en_segundo_plano, args=(segunda, "b.png")
+    )
+    hilo.start()
+
+    # Con el único lugar ocupado la segunda subida no se lee todavía
+    assert not segunda.leida.wait(0.1)
+    liberar.set()
+    hilo.join(5)
+    assert segunda.leida.is_set()
+    assert servicio.esperar_escrituras(timeout=5)
+    assert len(list(tmp_path.glob("*.png"))) == 2
+    servicio.cerrar()
+
+
+def test_escritura_en_segundo_plano_informa_el_error(servicio, tmp_path):
+    def instalar_roto(temporal, destino):
+        raise OSError("disco lleno")
+
+    servicio.almacen.instalar = instalar_roto
+    _, escritura = servicio.guardar_imagen_en_segundo_plano(io.BytesIO(b"x"), "a.png")
+
+    with pytest.raises(OSError, match="disco lleno"):
+        escritura.result(timeout=5)
+    assert not list(tmp_path.iterdir())
+    servicio.cerrar()
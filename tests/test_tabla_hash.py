@@ -0,0 +1,256 @@
+import json
+import os
+
+import pytest
+
+from src.tabla_hash import (
+    MOTOR_ABIERTO,
+    MOTOR_ENCADENADO,
+    VERSION_HASH_ACTUAL,
+    _largo,
+    crear_tabla_hash,
+    hash_digitos,
+)
+
+
+@pytest.fixture(params=[MOTOR_ENCADENADO, MOTOR_ABIERTO])
+def motor(request):
+    return request.param
+
+
+def crear_tabla(tmp_path, motor, **kwargs):
+    return crear_tabla_hash(
+        archivo_indice=tmp_path / "tabla_hash.json", motor=motor, **kwargs
+    )
+
+
+def test_cambios_se_registran_sin_reescribir_el_indice(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.agregar("juego-1", 0)
+    tabla.agregar("juego-2", 1)
+    tabla.actualizar_posicion("juego-2", 0)
+    tabla.eliminar("juego-1")
+
+    assert not tabla.archivo_indice.exists()
+    assert len(tabla.archivo_log.read_text(encoding="utf-8").splitlines()) == 4
+
+    recargada = crear_tabla(tmp_path, motor)
+    assert recargada.buscar_posicion("juego-2") == 0
+    assert not recargada.existe("juego-1")
+
+
+def test_compactacion_vacia_el_log(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.umbral_compactacion = 200
+    for i in range(20):
+        tabla.agregar(f"juego-{i}", i)
+    tabla.compactar(esperar=True)
+
+    assert tabla.archivo_indice.exists()
+    assert not tabla.archivo_log_anterior.exists()
+
+    recargada = crear_tabla(tmp_path, motor)
+    assert all(recargada.buscar_posicion(f"juego-{i}") == i for i in range(20))
+
+
+def test_instantanea_binaria_se_consulta_sin_cargar(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.agregar_lote((f"juego-{i}", i) for i in range(200))
+    tabla.compactar(esperar=True)
+
+    recargada = crear_tabla(tmp_path, motor)
+    assert recargada._base is not None
+    assert recargada.buscar_posicion("juego-150") == 150
+    assert recargada.buscar_posicion("otro") is None
+    assert recargada.huella() == tabla.huella()
+    assert recargada.estadisticas() == tabla.estadisticas()
+    assert recargada._base is not None
+
+    # La primera escritura pasa el índice a memoria sin perder entradas
+    recargada.eliminar("juego-0")
+    assert recargada._base is None
+    assert recargada.buscar_posicion("juego-199") == 199
+    assert crear_tabla(tmp_path, motor).total_elementos == 199
+
+
+def test_binario_anterior_al_json_no_se_usa(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.agregar("juego-1", 0)
+    tabla.compactar(esperar=True)
+    binario = tabla.archivo_binario.read_bytes()
+    tabla.agregar("juego-2", 1)
+    tabla.compactar(esperar=True)
+    tabla.archivo_binario.write_bytes(binario)
+    estado = tabla.archivo_indice.stat()
+    os.utime(tabla.archivo_binario, ns=(estado.st_atime_ns, estado.st_mtime_ns - 1))
+
+    recargada = crear_tabla(tmp_path, motor)
+    assert recargada._base is None
+    assert recargada.buscar_posicion("juego-2") == 1
+
+
+def test_compactacion_interrumpida_se_reproduce(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.agregar("juego-1", 0)
+    tabla.guardar_tabla()
+    tabla.agregar("juego-2", 1)
+    # Simula un corte tras apartar el log y antes de escribir la instantánea
+    tabla.archivo_log.rename(tabla.archivo_log_anterior)
+    tabla.eliminar("juego-1")
+
+    recargada = crear_tabla(tmp_path, motor)
+    assert recargada.buscar_posicion("juego-2") == 1
+    assert not recargada.existe("juego-1")
+
+
+def test_crece_y_se_reduce_con_rehash_incremental(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor, tamano=8)
+    for i in range(200):
+        tabla.agregar(f"juego-{i}", i)
+        assert tabla.buscar_posicion(f"juego-{i // 2}") == i // 2
+
+    stats = tabla.estadisticas()
+    assert stats["tamano"] > 8
+    assert stats["factor_carga"] <= 0.75
+    assert stats["redimensionamientos"][0]["de"] == 8
+
+    for i in range(195):
+        tabla.eliminar(f"juego-{i}")
+    assert tabla.estadisticas()["tamano"] < stats["tamano"]
+    assert [tabla.buscar_posicion(f"juego-{i}") for i in range(195, 200)] == list(
+        range(195, 200)
+    )
+
+
+def test_reconstruir_redimensiona_una_sola_vez(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.reconstruir((f"juego-{i}", i) for i in range(5000))
+
+    historial = tabla.estadisticas()["redimensionamientos"]
+    assert [(r["de"], r["a"]) for r in historial] == [(100, 12800)]
+    log = tmp_path / "tabla_hash.log"
+    assert not log.exists() or "redimensionar" not in log.read_text()
+    assert tabla.buscar_posicion("juego-4999") == 4999
+
+
+def test_tamano_persiste_en_el_indice(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor, tamano=8)
+    for i in range(50):
+        tabla.agregar(f"juego-{i}", i)
+    tamano = tabla.estadisticas()["tamano"]
+
+    # Desde el log de cambios y desde la instantánea compactada
+    assert crear_tabla(tmp_path, motor, tamano=8).tamano == tamano
+    tabla.guardar_tabla()
+    recargada = crear_tabla(tmp_path, motor, tamano=8)
+    assert recargada.tamano == tabla.tamano
+    assert recargada.buscar_posicion("juego-49") == 49
+
+
+def test_indice_con_hash_original_se_migra(tmp_path, motor):
+    ids = [f"juego-{i}" for i in range(10)]
+    cubetas = {}
+    for posicion, id_juego in enumerate(ids):
+        cubetas.setdefault(hash_digitos(id_juego) % 100, []).append(
+            {"id_juego": id_juego, "posicion_inventario": posicion}
+        )
+    datos = [{"indice": i, "elementos": e} for i, e in cubetas.items()]
+    archivo = tmp_path / "tabla_hash.json"
+    archivo.write_text(json.dumps({"tamano": 100, "datos": datos}), encoding="utf-8")
+
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.compactar(esperar=True)
+
+    assert [tabla.buscar_posicion(id_juego) for id_juego in ids] == list(range(10))
+    guardado = json.loads(archivo.read_text(encoding="utf-8"))
+    assert guardado["version_hash"] == VERSION_HASH_ACTUAL
+
+
+def test_cambio_de_motor_reinserta_la_instantanea(tmp_path):
+    tabla = crear_tabla(tmp_path, MOTOR_ENCADENADO, tamano=8)
+    for i in range(40):
+        tabla.agregar(f"juego-{i}", i)
+    tabla.guardar_tabla()
+
+    abierta = crear_tabla(tmp_path, MOTOR_ABIERTO, tamano=8)
+    assert [abierta.buscar_posicion(f"juego-{i}") for i in range(40)] == list(range(40))
+    assert abierta.estadisticas()["total_elementos"] == 40
+
+
+def test_borrado_sin_lapidas_mantiene_las_busquedas(tmp_path):
+    tabla = crear_tabla(tmp_path, MOTOR_ABIERTO, tamano=16)
+    vivos = {}
+    for i in range(300):
+        tabla.agregar(f"juego-{i}", i)
+        vivos[f"juego-{i}"] = i
+        if i % 3 == 0:
+            eliminado = f"juego-{i // 2}"
+            tabla.eliminar(eliminado)
+            vivos.pop(eliminado, None)
+        # Cada tanto durante un rehash incremental
+        assert all(tabla.buscar_posicion(id_) == pos for id_, pos in vivos.items())
+
+    assert not tabla.existe("juego-0")
+    assert tabla.estadisticas()["total_elementos"] == len(vivos)
+
+
+def largos_recorriendo(tabla):
+    """Largos calculados recorriendo la tabla con el rehash terminado"""
+    tabla.obtener_tabla_visual()
+    if tabla.MOTOR == MOTOR_ABIERTO:
+        return [tabla.tabla.largo(i) for i, _ in tabla._cubetas()]
+    return [len(entradas) for _, entradas in tabla._cubetas()]
+
+
+def largos_en_curso(tabla):
+    """Largos de las dos tablas, sin terminar el rehash"""
+    if tabla.MOTOR == MOTOR_ABIERTO:
+        return [
+            t.largo(i) for t in tabla._tablas() for i, id_ in enumerate(t.ids) if id_
+        ]
+    return [largo for t in tabla._tablas() for largo in map(_largo, t) if largo]
+
+
+def test_estadisticas_se_mantienen_sin_recorrer(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor, tamano=8)
+    for i in range(400):
+        tabla.agregar(f"juego-{i}", i)
+        if i % 3 == 0:
+            tabla.eliminar(f"juego-{i // 2}")
+        if i % 5 == 0:
+            tabla.actualizar_posicion(f"juego-{i}", i + 1000)
+        if i % 7 == 0:
+            stats = tabla.estadisticas()
+            largos = largos_en_curso(tabla)
+            assert stats["posiciones_ocupadas"] == len(largos)
+            assert stats["colisiones"] == sum(1 for largo in largos if largo > 1)
+            assert stats["longitud_maxima"] == max(largos, default=0)
+    for i in range(350):
+        tabla.eliminar(f"juego-{i}")
+
+    largos = largos_recorriendo(tabla)
+    stats = tabla.estadisticas()
+    assert stats["total_elementos"] == tabla.total_elementos
+    assert stats["posiciones_ocupadas"] == len(largos)
+    assert stats["colisiones"] == sum(1 for largo in largos if largo > 1)
+    assert stats["longitud_maxima"] == max(largos)
+    assert stats["longitud_promedio"] == pytest.approx(sum(largos) / len(largos))
+    assert "tabla_visual" not in stats
+
+
+def test_tabla_visual_por_paginas(tmp_path, motor):
+    tabla = crear_tabla(tmp_path, motor)
+    tabla.agregar_lote((f"juego-{i}", i) for i in range(30))
+    completa = tabla.obtener_tabla_visual()
+
+    paginas = {}
+    inicio = 0
+    while True:
+        pagina = tabla.obtener_tabla_visual(inicio, limite=4)
+        assert len(pagina) <= 4
+        if not pagina:
+            break
+        paginas.update(pagina)
+        inicio = max(pagina) + 1
+    assert paginas == completa
+    assert sum(len(elementos) for elementos in completa.values()) == 30
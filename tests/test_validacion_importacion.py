@@ -0,0 +1,56 @@
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.validacion_importacion import _contexto_procesos, validar_juegos
+from tests.conftest import juego_de_prueba
+
+
+def juegos_con_errores():
+    juegos = [juego_de_prueba(i) for i in range(10)]
+    juegos[3]["fecha_publicacion"] = "2020-13-45"
+    juegos[6] = "no es un juego"
+    juegos[8]["cantidad"] = 2.5
+    return juegos
+
+
+ESPERADOS = [
+    (3, "Juego 3: La fecha debe tener el formato YYYY-MM-DD"),
+    (6, "Elemento 6 no es un objeto válido"),
+    (8, "Juego 8: La cantidad no puede ser decimal"),
+]
+
+
+def test_valida_en_un_solo_proceso_si_cabe_en_un_bloque():
+    assert validar_juegos(juegos_con_errores()) == ESPERADOS
+
+
+def test_valida_por_bloques_en_varios_procesos():
+    errores = validar_juegos(juegos_con_errores(), procesos=2, tamano_bloque=3)
+    assert errores == ESPERADOS
+
+    errores = validar_juegos(juegos_con_errores(), tamano_bloque=3, max_errores=2)
+    assert errores == ESPERADOS[:2]
+
+
+def test_los_procesos_no_se_crean_con_fork():
+    assert _contexto_procesos().get_start_method() in ("forkserver", "spawn")
+
+
+def modulos_de_la_aplicacion():
+    """Se ejecuta en un proceso de validación"""
+    return sorted(m for m in ("streamlit", "src.repositorio") if m in sys.modules)
+
+
+def test_los_procesos_no_ejecutan_el_script_de_streamlit(monkeypatch):
+    # Streamlit instala el script de la aplicación como __main__ con __file__
+    principal = types.ModuleType("__main__")
+    principal.__file__ = str(Path(__file__).parent.parent / "main.py")
+    monkeypatch.setitem(sys.modules, "__main__", principal)
+
+    assert validar_juegos(juegos_con_errores(), procesos=2, tamano_bloque=3) == (
+        ESPERADOS
+    )
+    with ProcessPoolExecutor(1, mp_context=_contexto_procesos()) as pool:
+        assert pool.submit(modulos_de_la_aplicacion).result() == []